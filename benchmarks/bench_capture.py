@@ -0,0 +1,99 @@
+"""
+Benchmark - screencap x stream H.264 (screenrecord + ffmpeg).
+
+Mede fps efetivo e latencia fim a fim: tempo entre um toque e o primeiro
+frame em que a tela mudou. O ponto tocado deve mudar a tela (ex: abrir e
+fechar um menu); o toque e repetido algumas vezes, com BACK entre eles.
+
+Uso:
+    poetry run python benchmarks/bench_capture.py [segundos] [x y]
+"""
+
+import os
+import statistics
+import sys
+import time
+
+import cv2
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.device import Device  # noqa: E402
+
+KEYCODE_BACK = 4
+
+
+def changed(a, b, tolerance: float = 4.0) -> bool:
+    return float(cv2.absdiff(a.gray, b.gray).mean()) > tolerance
+
+
+def measure_fps(grab, seconds: float) -> float:
+    start = time.perf_counter()
+    count = 0
+    while time.perf_counter() - start < seconds:
+        if grab() is not None:
+            count += 1
+    return count / (time.perf_counter() - start)
+
+
+def measure_latency(device: Device, grab, point, samples: int = 5) -> list:
+    latencies = []
+    for _ in range(samples):
+        before = grab()
+        start = time.perf_counter()
+        device.tap(*point)
+        while time.perf_counter() - start < 5:
+            frame = grab()
+            if frame is not None and changed(before, frame):
+                latencies.append(time.perf_counter() - start)
+                break
+        device.keyevent(KEYCODE_BACK)
+        time.sleep(1)
+    return latencies
+
+
+def report(name: str, fps: float, latencies: list):
+    print(f"{name}: {fps:5.1f} fps", end="")
+    if latencies:
+        print(
+            f" | latencia mediana {statistics.median(latencies) * 1000:.0f} ms"
+            f" (min {min(latencies) * 1000:.0f}, max {max(latencies) * 1000:.0f})"
+        )
+    else:
+        print(" | latencia: tela nao mudou")
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 10
+    point = (int(sys.argv[2]), int(sys.argv[3])) if len(sys.argv) > 3 else (60, 670)
+
+    device = Device()
+    report(
+        "screencap",
+        measure_fps(device.capture, seconds),
+        measure_latency(device, device.capture, point),
+    )
+
+    thread = device.start_capture(stream=True)
+    if device._stream is None:
+        print("stream: ffmpeg nao encontrado")
+        device.stop_capture()
+        return
+    try:
+        stream = device._stream
+        # fps do decodificador: o screenrecord so envia frames quando a tela muda
+        frames = stream.frames
+        time.sleep(seconds)
+        print(f"stream (decodificados): {(stream.frames - frames) / seconds:5.1f} fps")
+        report(
+            "stream",
+            measure_fps(stream.read, seconds),
+            measure_latency(device, lambda: thread.latest_frame(device._last_action), point),
+        )
+        print(f"reinicios do screenrecord: {stream.restarts}")
+    finally:
+        device.stop_capture()
+
+
+if __name__ == "__main__":
+    main()
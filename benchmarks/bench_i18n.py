@@ -0,0 +1,68 @@
+"""
+Benchmark - Custo de I18n.t().
+
+Compara a busca antiga (split da chave + caminhada nos dicts aninhados, com
+segunda caminhada no fallback) com a tabela achatada atual.
+
+Uso:
+    poetry run python benchmarks/bench_i18n.py [repeticoes]
+"""
+
+import os
+import sys
+import timeit
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bot.i18n import I18n  # noqa: E402
+
+
+def legacy_get_nested(dictionary: dict, key: str):
+    """Implementacao anterior de I18n._get_nested."""
+    value = dictionary
+    for k in key.split("."):
+        if isinstance(value, dict):
+            value = value.get(k)
+            if value is None:
+                return None
+        else:
+            return None
+    return value
+
+
+def legacy_t(nested: dict, lang: str, fallback: str, key: str):
+    translation = legacy_get_nested(nested.get(lang, {}), key)
+    if translation is None:
+        translation = legacy_get_nested(nested.get(fallback, {}), key)
+    return key if translation is None else translation
+
+
+def main():
+    repeat = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+
+    lang = I18n.get_language()
+    fallback = I18n._fallback_language
+    nested = {code: I18n._read(code) for code in (lang, fallback)}
+    keys = list(I18n.load(lang).keys())
+    # Inclui chaves ausentes (caminho do fallback + chave devolvida)
+    keys += [f"gui.buttons.missing_{i}" for i in range(len(keys) // 10 or 1)]
+
+    def run_legacy():
+        for key in keys:
+            legacy_t(nested, lang, fallback, key)
+
+    def run_flat():
+        for key in keys:
+            I18n.t(key)
+
+    calls = repeat * len(keys)
+    legacy = min(timeit.repeat(run_legacy, number=repeat, repeat=5)) / calls
+    flat = min(timeit.repeat(run_flat, number=repeat, repeat=5)) / calls
+
+    print(f"idioma={lang} chaves={len(keys)} chamadas={calls}")
+    print(f"antigo:   {legacy * 1e9:8.0f} ns/chamada")
+    print(f"achatado: {flat * 1e9:8.0f} ns/chamada  ({legacy / flat:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
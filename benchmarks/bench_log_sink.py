@@ -0,0 +1,127 @@
+"""
+Benchmark - Latencia da UI com logs em alta frequencia.
+
+Compara o handler antigo (um after(0) + tag_config por registro) com o TextSink
+(fila drenada em lotes). Um "heartbeat" agendado a cada 10 ms mede o atraso do
+loop do Tk enquanto uma thread gera ~1000 registros/s.
+
+Uso:
+    poetry run python benchmarks/bench_log_sink.py [segundos] [registros_por_segundo]
+"""
+
+import logging
+import os
+import statistics
+import sys
+import threading
+import time
+import tkinter as tk
+from tkinter import scrolledtext
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ui.log_sink import TextHandler, TextSink  # noqa: E402
+
+HEARTBEAT_MS = 10
+
+
+class LegacyTextHandler(logging.Handler):
+    """Implementacao anterior: um callback do Tk por registro."""
+
+    def __init__(self, text_widget):
+        super().__init__()
+        self.text_widget = text_widget
+
+    def emit(self, record):
+        msg = self.format(record)
+        self.text_widget.after(0, self._append, msg, record.levelno)
+
+    def _append(self, msg, level):
+        self.text_widget.configure(state="normal")
+        self.text_widget.insert(tk.END, msg + "\n")
+        if level >= logging.ERROR:
+            color = "red"
+        elif level >= logging.WARNING:
+            color = "orange"
+        else:
+            color = "gray"
+        self.text_widget.tag_add(color, "end-2l", "end-1l")
+        self.text_widget.tag_config(color, foreground=color)
+        self.text_widget.see(tk.END)
+        self.text_widget.configure(state="disabled")
+
+
+def run(name: str, make_handler, seconds: float, rate: int) -> dict:
+    root = tk.Tk()
+    text = scrolledtext.ScrolledText(root, height=30)
+    text.pack()
+    text.configure(state="disabled")
+
+    logger = logging.getLogger(f"bench.{name}")
+    logger.propagate = False
+    logger.setLevel(logging.DEBUG)
+    logger.handlers = [make_handler(text)]
+
+    lags = []
+    expected = [time.perf_counter() + HEARTBEAT_MS / 1000]
+    done = threading.Event()
+
+    def heartbeat():
+        now = time.perf_counter()
+        lags.append((now - expected[0]) * 1000)
+        expected[0] = now + HEARTBEAT_MS / 1000
+        if done.is_set():
+            root.quit()
+        else:
+            root.after(HEARTBEAT_MS, heartbeat)
+
+    def producer():
+        interval = 1 / rate
+        end = time.perf_counter() + seconds
+        i = 0
+        while time.perf_counter() < end:
+            logger.debug("vision loop tick %d score=%.3f", i, 0.5)
+            i += 1
+            time.sleep(interval)
+        done.set()
+
+    root.after(HEARTBEAT_MS, heartbeat)
+    threading.Thread(target=producer, daemon=True).start()
+    root.mainloop()
+
+    lines = int(text.index("end-1c").split(".")[0])
+    root.destroy()
+    lags.sort()
+    return {
+        "p50_ms": statistics.median(lags),
+        "p95_ms": lags[int(len(lags) * 0.95) - 1],
+        "max_ms": lags[-1],
+        "widget_lines": lines,
+    }
+
+
+def main():
+    seconds = float(sys.argv[1]) if len(sys.argv) > 1 else 5
+    rate = int(sys.argv[2]) if len(sys.argv) > 2 else 1000
+
+    results = {
+        "legacy": run("legacy", LegacyTextHandler, seconds, rate),
+        "sink": run(
+            "sink",
+            lambda text: TextHandler(TextSink(text, max_lines=5000, readonly=True)),
+            seconds,
+            rate,
+        ),
+    }
+
+    print(f"{rate} records/s for {seconds:.0f}s, heartbeat every {HEARTBEAT_MS} ms")
+    print(f"{'handler':<8} {'p50 lag':>10} {'p95 lag':>10} {'max lag':>10} {'lines':>8}")
+    for name, r in results.items():
+        print(
+            f"{name:<8} {r['p50_ms']:>8.1f}ms {r['p95_ms']:>8.1f}ms "
+            f"{r['max_ms']:>8.1f}ms {r['widget_lines']:>8}"
+        )
+
+
+if __name__ == "__main__":
+    main()
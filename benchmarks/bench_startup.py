@@ -0,0 +1,62 @@
+"""
+Benchmark - Tempo de importacao ate a janela poder aparecer.
+
+Roda `python -X importtime` em processos novos e resume o custo de importar
+o modulo da GUI (o que main.py faz antes de criar a janela), listando os
+modulos mais caros e se OpenCV/NumPy entraram no caminho de inicializacao.
+
+Uso:
+    poetry run python benchmarks/bench_startup.py [modulo] [repeticoes]
+"""
+
+import os
+import statistics
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+HEAVY = ("cv2", "numpy", "asyncio", "bot.device", "functions.config")
+
+
+def importtime(module: str):
+    """Retorna {modulo: (self_us, cumulativo_us)} de uma importacao a frio."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip().splitlines()[-1])
+
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative, name = line[len("import time:") :].split("|")
+        times[name.strip()] = (int(self_us), int(cumulative))
+    return times
+
+
+def main():
+    module = sys.argv[1] if len(sys.argv) > 1 else "ui.gui"
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    runs = [importtime(module) for _ in range(repeat)]
+    totals = [run[module][1] / 1000 for run in runs]
+    last = runs[-1]
+
+    print(f"import {module}: mediana {statistics.median(totals):.1f} ms ({repeat} execucoes)")
+    print("\nmodulos mais caros (cumulativo):")
+    top = sorted(last.items(), key=lambda item: item[1][1], reverse=True)[1:11]
+    for name, (_, cumulative) in top:
+        print(f"  {cumulative / 1000:8.1f} ms  {name}")
+
+    print("\nmodulos pesados no caminho de inicializacao:")
+    for name in HEAVY:
+        status = f"{last[name][1] / 1000:.1f} ms" if name in last else "adiado"
+        print(f"  {name:18s} {status}")
+
+
+if __name__ == "__main__":
+    main()
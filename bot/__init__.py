@@ -1,6 +1,36 @@
 # Bot COC - Simplified Structure
-from bot.bluestacks import BlueStacks
-from bot.device import Device
-from bot.settings import Settings
+# Importacoes sob demanda: `import bot.settings` nao carrega OpenCV/NumPy/asyncio
+import importlib
+from typing import TYPE_CHECKING
 
-__all__ = ["Device", "BlueStacks", "Settings"]
+if TYPE_CHECKING:  # tambem mantem os modulos visiveis para o PyInstaller
+    from bot.async_device import AsyncDevice
+    from bot.bluestacks import BlueStacks
+    from bot.device import Device
+    from bot.frame import Frame
+    from bot.settings import Settings
+    from bot.vision_pool import VisionPool
+
+_EXPORTS = {
+    "Device": "bot.device",
+    "AsyncDevice": "bot.async_device",
+    "BlueStacks": "bot.bluestacks",
+    "Frame": "bot.frame",
+    "Settings": "bot.settings",
+    "VisionPool": "bot.vision_pool",
+}
+
+__all__ = ["Device", "AsyncDevice", "BlueStacks", "Frame", "Settings", "VisionPool"]
+
+
+def __getattr__(name):
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module 'bot' has no attribute {name!r}")
+    value = getattr(importlib.import_module(module), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,408 @@
+"""
+AsyncDevice - Versao asyncio do Device.
+Permite controlar varios emuladores em um unico processo, sem uma thread por device.
+"""
+
+import asyncio
+import os
+import re
+import subprocess
+import sys
+import tempfile
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Iterable, List, Optional, Tuple
+
+from bot.frame import Frame
+from bot.minitouch import (
+    MINITOUCH_REMOTE,
+    parse_touch_info,
+    swipe_script,
+    taps_script,
+    zoom_out_script,
+)
+from bot.settings import Settings
+from bot.vision import match_template, template_region
+
+# Esconde janelas CMD no Windows
+if sys.platform == "win32":
+    _subprocess_flags = {"creationflags": subprocess.CREATE_NO_WINDOW}
+else:
+    _subprocess_flags = {}
+
+
+class AsyncDevice:
+    """
+    Gerencia comunicacao com dispositivo Android usando asyncio.
+    Matching e decodificacao rodam em um executor para nao bloquear o loop.
+    """
+
+    def __init__(
+        self, host: str = None, port: int = None, executor: Executor = None, vision_pool=None
+    ):
+        self.host = host or Settings.BLUESTACK_HOST
+        self.port = port or Settings.BLUESTACK_PORT
+        self.serial = f"{self.host}:{self.port}"
+        self.executor = executor
+        # VisionPool opcional: matching em processos separados
+        self.vision_pool = vision_pool
+        self._screen_size = None
+        self._touch_info = None
+        self.last_frame: Optional[Frame] = None
+
+    @classmethod
+    async def create(
+        cls, host: str = None, port: int = None, executor: Executor = None, vision_pool=None
+    ) -> "AsyncDevice":
+        """Cria, conecta e instala minitouch."""
+        device = cls(host, port, executor, vision_pool)
+        await device._connect()
+        await device._setup_minitouch()
+        return device
+
+    # ==================== ADB ====================
+
+    async def _exec(self, args: list, stdin: bytes = None) -> Tuple[int, bytes]:
+        """Executa o ADB e retorna (returncode, stdout) em bytes."""
+        env = os.environ.copy()
+        env["MSYS_NO_PATHCONV"] = "1"
+        proc = await asyncio.create_subprocess_exec(
+            str(Settings.get_adb_path()),
+            *args,
+            stdin=asyncio.subprocess.PIPE if stdin is not None else asyncio.subprocess.DEVNULL,
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.DEVNULL,
+            env=env,
+            **_subprocess_flags,
+        )
+        stdout, _ = await proc.communicate(stdin)
+        return proc.returncode, stdout
+
+    async def _run(self, cmd: list) -> str:
+        """Executa comando ADB no device e retorna stdout como texto."""
+        _, stdout = await self._exec(["-s", self.serial] + cmd)
+        return stdout.decode("utf-8", errors="ignore")
+
+    async def _connect(self):
+        """Conecta ao dispositivo."""
+        await self._exec(["connect", self.serial])
+
+    async def open_app(self, package: str):
+        """Abre aplicativo pelo package name."""
+        await self._run(
+            ["shell", "monkey", "-p", package, "-c", "android.intent.category.LAUNCHER", "1"]
+        )
+
+    async def tap(self, x: int, y: int):
+        """Toca nas coordenadas."""
+        await self._run(["shell", "input", "tap", str(x), str(y)])
+
+    async def swipe(self, x1: int, y1: int, x2: int, y2: int, duration: int = 300):
+        """Faz gesto de swipe."""
+        await self._run(
+            ["shell", "input", "swipe", str(x1), str(y1), str(x2), str(y2), str(duration)]
+        )
+
+    async def keyevent(self, keycode: int):
+        """Envia evento de tecla via ADB."""
+        await self._run(["shell", "input", "keyevent", str(keycode)])
+
+    async def capture(self) -> Frame:
+        """
+        Captura a tela direto pelo stdout (exec-out), sem arquivo intermediario.
+
+        Returns:
+            Frame com a versao em cinza ja decodificada (no executor)
+        """
+        _, data = await self._exec(["-s", self.serial, "exec-out", "screencap", "-p"])
+        frame = Frame(raw=data)
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(self.executor, lambda: frame.gray)
+        self.last_frame = frame
+        return frame
+
+    async def screenshot(self, local: str = None) -> str:
+        """Captura screenshot e salva em disco."""
+        local = local or Settings.SCREENSHOT_FILE
+        return (await self.capture()).save(local)
+
+    async def _get_screen_size(self) -> Tuple[int, int]:
+        """Retorna tamanho da tela (cacheado)."""
+        if self._screen_size is None:
+            output = await self._run(["shell", "wm", "size"])
+            match = re.search(r"(\d+)x(\d+)", output)
+            self._screen_size = (
+                (int(match.group(1)), int(match.group(2))) if match else (860, 732)
+            )
+        return self._screen_size
+
+    async def set_screen_size(self, width: int = 860, height: int = 732):
+        """Define tamanho da tela via ADB."""
+        await self._run(["shell", "wm", "size", f"{width}x{height}"])
+        self._screen_size = None
+
+    async def set_density(self, dpi: int = 160):
+        """Define densidade da tela via ADB."""
+        await self._run(["shell", "wm", "density", str(dpi)])
+
+    # ==================== VISION ====================
+
+    async def offload(self, func: Callable[..., Any], *args) -> Any:
+        """Executa uma funcao pura (matching, planejamento) no executor do device."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+
+    async def find_template(
+        self,
+        template: str,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        frame: Frame = None,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Encontra template na tela.
+
+        Args:
+            template: Caminho do template (relativo a templates/)
+            threshold: Limiar de correspondencia
+            region: Regiao para buscar (x1, y1, x2, y2)
+            frame: Frame ja capturado. Se None, captura um novo
+
+        Returns:
+            (x, y) do centro ou None
+        """
+        if frame is None:
+            frame = await self.capture()
+        img = frame.gray
+        if img is None:
+            return None
+        if self.vision_pool is not None:
+            return await asyncio.wrap_future(
+                self.vision_pool.submit(img, template, threshold, region, key=self.serial)
+            )
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, match_template, img, template, threshold, region
+        )
+
+    async def image_exists(
+        self,
+        template: str,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        frame: Frame = None,
+    ) -> bool:
+        """Verifica se uma imagem existe na tela sem clicar."""
+        return await self.find_template(template, threshold, region, frame) is not None
+
+    async def wait_for(
+        self,
+        template: str,
+        timeout: float = 10,
+        interval: float = 0.5,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+    ) -> Optional[Tuple[int, int]]:
+        """
+        Aguarda template aparecer na tela.
+
+        Args:
+            template: Caminho do template (relativo a templates/)
+            timeout: Tempo maximo de espera (em segundos)
+            interval: Intervalo entre tentativas (em segundos)
+            threshold: Limiar de correspondencia
+            region: Regiao para buscar (x1, y1, x2, y2)
+
+        Returns:
+            (x, y) do centro ou None se estourou o timeout
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while True:
+            pos = await self.find_template(template, threshold, region)
+            if pos or loop.time() >= deadline:
+                return pos
+            await asyncio.sleep(interval)
+
+    async def tap_image(
+        self, template: str, threshold: float = 0.8, retries: int = 5, delay: float = 1
+    ) -> bool:
+        """
+        Encontra e clica na imagem.
+
+        Returns:
+            True se encontrou e clicou
+        """
+        region = template_region(template)
+
+        for _ in range(retries):
+            pos = await self.find_template(template, threshold, region)
+            if pos:
+                await self.tap(pos[0], pos[1])
+                return True
+            await asyncio.sleep(delay)
+
+        return False
+
+    async def find_and_tap_with_scroll(
+        self,
+        template: str,
+        scroll_pixels: int = 150,
+        scroll_pos: Tuple[int, int] = None,
+        max_scrolls: int = 5,
+        threshold: float = 0.75,
+        sleep: float = 0.5,
+    ) -> bool:
+        """Encontra imagem, se nao achar faz scroll e tenta novamente."""
+        for attempt in range(max_scrolls + 1):
+            pos = await self.find_template(template, threshold)
+            if pos:
+                await self.tap(pos[0], pos[1])
+                return True
+
+            if attempt < max_scrolls:
+                await self.scroll_horizontal(scroll_pixels, scroll_pos)
+                await asyncio.sleep(sleep)
+
+        return False
+
+    async def drag_from_image(
+        self,
+        template: str,
+        target_x: int,
+        target_y: int,
+        threshold: float = 0.8,
+        hold_ms: int = 200,
+        retries: int = 5,
+        delay: float = 1,
+        region: Tuple[int, int, int, int] = None,
+    ) -> bool:
+        """Encontra uma imagem, segura nela e arrasta para uma posicao de destino."""
+        search_region = region or template_region(template)
+
+        for _ in range(retries):
+            pos = await self.find_template(template, threshold, search_region)
+            if pos:
+                await self._minitouch_swipe(pos[0], pos[1], target_x, target_y, hold_ms=hold_ms)
+                return True
+            await asyncio.sleep(delay)
+
+        return False
+
+    # ==================== MINITOUCH ====================
+
+    async def _setup_minitouch(self):
+        """Instala minitouch no dispositivo."""
+        check = await self._run(["shell", f"test -x {MINITOUCH_REMOTE} && echo OK"])
+        if "OK" in check:
+            return
+
+        minitouch_path = Settings.get_minitouch_path()
+        if not minitouch_path.exists():
+            return
+
+        await self._run(["push", str(minitouch_path), MINITOUCH_REMOTE])
+        await self._run(["shell", "chmod", "755", MINITOUCH_REMOTE])
+
+    async def _get_touch_info(self) -> Tuple[int, int]:
+        """Retorna info do touch (max_x, max_y), cacheado."""
+        if self._touch_info is None:
+            try:
+                output = await asyncio.wait_for(
+                    self._run(["shell", f"echo '' | {MINITOUCH_REMOTE} -i"]), timeout=5
+                )
+            except asyncio.TimeoutError:
+                output = ""
+            self._touch_info = parse_touch_info(output)
+        return self._touch_info
+
+    async def _geometry(self) -> Tuple[Tuple[int, int], Tuple[int, int]]:
+        """Retorna (tamanho da tela, tamanho do touch)."""
+        return await self._get_screen_size(), await self._get_touch_info()
+
+    async def _run_minitouch(self, script: str, name: str):
+        """Envia e executa um script minitouch."""
+        # Nome por serial: varios devices no mesmo processo nao disputam o arquivo
+        safe_serial = re.sub(r"[^0-9A-Za-z]", "_", self.serial)
+        fd, local = tempfile.mkstemp(prefix=f"{name}_{safe_serial}_", suffix=".txt")
+        remote = f"/data/local/tmp/{name}.script"
+        try:
+            with os.fdopen(fd, "w") as f:
+                f.write(script)
+            await self._run(["push", local, remote])
+        finally:
+            os.remove(local)
+        await self._run(["shell", MINITOUCH_REMOTE, "-f", remote])
+
+    async def _minitouch_swipe(self, x1: int, y1: int, x2: int, y2: int, hold_ms: int = 1):
+        """Swipe usando minitouch."""
+        screen, touch = await self._geometry()
+        await self._run_minitouch(swipe_script(x1, y1, x2, y2, screen, touch, hold_ms), "swipe")
+
+    async def tap_batch(self, points: List[Tuple[int, int]], interval_ms: int = 50):
+        """
+        Toca varios pontos com um unico script minitouch.
+
+        Args:
+            points: Lista de (x, y)
+            interval_ms: Intervalo entre toques (em milissegundos)
+        """
+        if not points:
+            return
+        screen, touch = await self._geometry()
+        script = taps_script(points, screen, touch, interval_ms=interval_ms)
+        await self._run_minitouch(script, "taps")
+
+    async def scroll_horizontal(self, pixels: int, start_pos: Tuple[int, int] = None):
+        """Scroll horizontal."""
+        screen_w, screen_h = await self._get_screen_size()
+        x, y = start_pos if start_pos else (screen_w // 2, screen_h // 2)
+        await self._minitouch_swipe(x, y, x - pixels, y, hold_ms=50)
+
+    async def scroll_vertical(self, pixels: int, start_pos: Tuple[int, int] = None):
+        """Scroll vertical (positivo = para baixo, negativo = para cima)."""
+        screen_w, screen_h = await self._get_screen_size()
+        x, y = start_pos if start_pos else (screen_w // 2, screen_h // 2)
+        await self._minitouch_swipe(x, y, x, y - pixels, hold_ms=50)
+
+    async def center_view(self, move_right: int = 200, move_down: int = 0):
+        """Centraliza camera do jogo."""
+        screen_w, screen_h = await self._get_screen_size()
+        center_x, center_y = screen_w // 2, screen_h // 2
+
+        await self._minitouch_swipe(100, center_y, screen_w - 100, center_y, hold_ms=200)
+        await asyncio.sleep(0.2)
+
+        await self._minitouch_swipe(center_x, 100, center_x, screen_h - 100, hold_ms=200)
+        await asyncio.sleep(0.2)
+
+        if move_right > 0:
+            await self._minitouch_swipe(
+                center_x, center_y, center_x - move_right, center_y, hold_ms=200
+            )
+            await asyncio.sleep(0.1)
+
+        if move_down > 0:
+            await self._minitouch_swipe(
+                center_x, center_y, center_x, center_y + move_down, hold_ms=200
+            )
+
+    async def zoom_out(self, steps: int = 10, duration_ms: int = 300):
+        """Zoom out usando minitouch (pinch in)."""
+        screen, touch = await self._geometry()
+        await self._run_minitouch(zoom_out_script(screen, touch, steps, duration_ms), "zoom")
+
+
+async def run_on_devices(
+    devices: Iterable[AsyncDevice], flow: Callable[[AsyncDevice], Awaitable]
+) -> List:
+    """
+    Executa o mesmo fluxo em varios devices concorrentemente.
+
+    Args:
+        devices: Devices ja criados
+        flow: Funcao async que recebe um device (ex: train_army_async)
+
+    Returns:
+        Lista de resultados (ou excecoes) na ordem dos devices
+    """
+    return await asyncio.gather(*(flow(device) for device in devices), return_exceptions=True)
@@ -6,8 +6,10 @@ import os
 import re
 import subprocess
 import sys
-import time
+import tempfile
+from typing import Dict, List, Optional
 
+from bot.readiness import ReadinessReport, port_open, wait_ready
 from bot.settings import Settings
 
 # Esconde janelas CMD no Windows
@@ -17,6 +19,144 @@ else:
     _subprocess_flags = {}
 
 
+_LINE_RE = re.compile(r'^\s*([^=#\s]+)\s*=\s*"?(.*?)"?\s*$')
+_INSTANCE_RE = re.compile(r"^bst\.instance\.([^.]+)\.(.+)$")
+
+# Configuracoes de tela aplicadas em cada instancia
+DISPLAY_KEYS = ("fb_width", "fb_height", "dpi", "gl_win_height", "show_sidebar")
+
+
+class BlueStacksConf:
+    """
+    Modelo do bluestacks.conf.
+
+    O arquivo e lido uma vez e indexado (chave -> linha). As alteracoes ficam
+    pendentes ate save(), que grava tudo de uma vez (atomico) e so se algo mudou.
+    """
+
+    def __init__(self, path: str, lines: List[str]):
+        self.path = path
+        self.lines = lines
+        self.newline = "\r\n" if lines and lines[0].endswith("\r\n") else "\n"
+        self._index: Dict[str, int] = {}
+        self._values: Dict[str, str] = {}
+        self._changed: Dict[str, str] = {}
+
+        for i, line in enumerate(lines):
+            match = _LINE_RE.match(line)
+            if match:
+                key, value = match.groups()
+                self._index[key] = i
+                self._values[key] = value
+
+    @classmethod
+    def load(cls, path: str = None) -> "BlueStacksConf":
+        """Le e indexa o arquivo (padrao: Settings.BLUESTACKS_CONF)."""
+        path = path or Settings.BLUESTACKS_CONF
+        if not os.path.exists(path):
+            raise RuntimeError("bluestacks.conf not found")
+        with open(path, "r", encoding="utf-8", errors="ignore", newline="") as f:
+            return cls(path, f.readlines())
+
+    def get(self, key: str, default: str = None) -> Optional[str]:
+        """Valor (sem aspas) de uma chave."""
+        return self._values.get(key, default)
+
+    def set(self, key: str, value) -> bool:
+        """
+        Altera uma chave (em memoria).
+
+        Returns:
+            True se o valor mudou
+        """
+        value = str(value)
+        if self._values.get(key) == value:
+            return False
+        self._values[key] = value
+        self._changed[key] = value
+        return True
+
+    @property
+    def dirty(self) -> bool:
+        """True se ha alteracoes ainda nao gravadas."""
+        return bool(self._changed)
+
+    def instances(self) -> Dict[str, Dict[str, str]]:
+        """
+        Instancias configuradas com a porta ADB e as configuracoes de tela.
+
+        Returns:
+            {nome: {"adb_port": ..., "fb_width": ..., ...}}
+        """
+        result: Dict[str, Dict[str, str]] = {}
+        for key, value in self._values.items():
+            match = _INSTANCE_RE.match(key)
+            if not match:
+                continue
+            name, field = match.groups()
+            if field == "adb_port" or field in DISPLAY_KEYS:
+                result.setdefault(name, {})[field] = value
+        return {name: info for name, info in result.items() if "adb_port" in info}
+
+    def find_instance(self, adb_port: int = None) -> Optional[str]:
+        """Instancia que usa a porta ADB informada (ou a primeira, se nenhuma usar)."""
+        instances = self.instances()
+        if not instances:
+            return None
+        if adb_port is not None:
+            for name, info in instances.items():
+                if info.get("adb_port") == str(adb_port):
+                    return name
+        return next(iter(instances))
+
+    def set_instance(self, instance: str, **settings) -> bool:
+        """
+        Altera varias chaves de uma instancia.
+
+        Returns:
+            True se alguma mudou
+        """
+        changed = False
+        for field, value in settings.items():
+            changed |= self.set(f"bst.instance.{instance}.{field}", value)
+        return changed
+
+    def save(self) -> bool:
+        """
+        Grava as alteracoes pendentes em uma unica escrita atomica.
+
+        Returns:
+            True se o arquivo foi alterado
+        """
+        if not self._changed:
+            return False
+
+        for key, value in self._changed.items():
+            line = f'{key}="{value}"{self.newline}'
+            index = self._index.get(key)
+            if index is None:
+                if self.lines and not self.lines[-1].endswith("\n"):
+                    self.lines[-1] += self.newline
+                self._index[key] = len(self.lines)
+                self.lines.append(line)
+            else:
+                self.lines[index] = line
+
+        directory = os.path.dirname(os.path.abspath(self.path))
+        fd, tmp_path = tempfile.mkstemp(prefix=".bluestacks.", dir=directory)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8", newline="") as f:
+                f.writelines(self.lines)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+
+        self._changed.clear()
+        return True
+
+
 class BlueStacks:
     """Controle do BlueStacks."""
 
@@ -32,34 +172,26 @@ class BlueStacks:
             )
 
     @staticmethod
-    def start():
-        """Inicia o BlueStacks."""
-        if os.path.exists(Settings.BLUESTACKS_EXE):
-            subprocess.Popen([Settings.BLUESTACKS_EXE])
-            time.sleep(15)
+    def start(timeout: float = 180, callback=None) -> Optional[ReadinessReport]:
+        """
+        Inicia o BlueStacks e espera o Android ficar pronto.
+
+        Args:
+            timeout: Tempo maximo de espera (porta ADB, connect, boot e launcher)
+            callback: Recebe o progresso de cada fase (opcional)
+
+        Returns:
+            ReadinessReport com o tempo de cada fase, ou None se o executavel nao existe
+        """
+        if not os.path.exists(Settings.BLUESTACKS_EXE):
+            return None
+        subprocess.Popen([Settings.BLUESTACKS_EXE])
+        return wait_ready(timeout=timeout, callback=callback)
 
     @staticmethod
-    def configure():
-        """Configura resolucao do BlueStacks."""
-        conf_path = Settings.BLUESTACKS_CONF
-
-        if not os.path.exists(conf_path):
-            raise RuntimeError("bluestacks.conf not found")
-
-        with open(conf_path, "r", encoding="utf-8", errors="ignore") as f:
-            lines = f.readlines()
-
-        text = "".join(lines)
-
-        # Detecta instancia
-        match = re.search(r"bst\.instance\.([^.]+)\.adb_port", text)
-        if not match:
-            raise RuntimeError("Could not detect BlueStacks instance")
-
-        instance = match.group(1)
-
-        # Configuracoes
-        settings = {
+    def display_settings() -> Dict[str, str]:
+        """Configuracoes de tela esperadas para o bot."""
+        return {
             "fb_width": Settings.TARGET_WIDTH,
             "fb_height": Settings.TARGET_HEIGHT,
             "dpi": Settings.TARGET_DPI,
@@ -67,36 +199,47 @@ class BlueStacks:
             "show_sidebar": "0",
         }
 
-        # Aplica configuracoes
-        for key, value in settings.items():
-            pattern = re.compile(
-                rf'(bst\.instance\.{re.escape(instance)}\.{re.escape(key)}=)"[^"]*"'
-            )
+    @staticmethod
+    def configure(instance: str = None, dry_run: bool = False) -> bool:
+        """
+        Configura resolucao do BlueStacks.
 
-            replaced = False
-            new_lines = []
-            for line in lines:
-                if pattern.search(line):
-                    new_lines.append(f'bst.instance.{instance}.{key}="{value}"\n')
-                    replaced = True
-                else:
-                    new_lines.append(line)
+        Args:
+            instance: Instancia a configurar. Padrao: a que usa Settings.BLUESTACK_PORT
+            dry_run: Se True, so verifica se algo precisaria mudar
 
-            if not replaced:
-                new_lines.append(f'bst.instance.{instance}.{key}="{value}"\n')
+        Returns:
+            True se o arquivo mudou (ou mudaria, com dry_run)
+        """
+        conf = BlueStacksConf.load()
 
-            lines = new_lines
+        instance = instance or conf.find_instance(Settings.BLUESTACK_PORT)
+        if not instance:
+            raise RuntimeError("Could not detect BlueStacks instance")
 
-        with open(conf_path, "w", encoding="utf-8") as f:
-            f.writelines(lines)
+        changed = conf.set_instance(instance, **BlueStacks.display_settings())
+        if dry_run:
+            return changed
+        return conf.save()
 
     @staticmethod
-    def validate_adb():
-        """Valida conexao ADB."""
+    def validate_adb(timeout: float = 5) -> str:
+        """
+        Valida conexao ADB.
+
+        Args:
+            timeout: Tempo maximo tentando conectar (retorna logo se a porta esta fechada)
+
+        Returns:
+            Saida de `wm size` ou "" se o device nao respondeu
+        """
         adb = str(Settings.get_adb_path())
         device = f"{Settings.BLUESTACK_HOST}:{Settings.BLUESTACK_PORT}"
 
-        subprocess.run([adb, "connect", device], **_subprocess_flags)
+        if not port_open(Settings.BLUESTACK_HOST, Settings.BLUESTACK_PORT):
+            return ""
+        if not wait_ready(timeout=timeout, until="adb").ready:
+            return ""
         result = subprocess.run(
             [adb, "-s", device, "shell", "wm", "size"],
             capture_output=True,
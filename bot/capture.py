@@ -0,0 +1,136 @@
+"""
+Captura continua - Thread que mantem os frames mais recentes de um device.
+
+Quem precisa decidir logo apos uma acao so espera o primeiro frame posterior
+a ela, em vez de pagar uma captura inteira na hora. Sem leitores, a thread
+reduz a frequencia de captura ate `max_interval`.
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Callable, List, Optional
+
+from bot.frame import Frame
+
+
+class CaptureThread:
+    """
+    Captura em segundo plano com buffer circular.
+
+    Args:
+        capture: Funcao que captura um Frame (ex: Device.capture)
+        size: Quantidade de frames mantidos no buffer
+        idle_after: Segundos sem leitura ate considerar a thread ociosa
+        max_interval: Intervalo maximo entre capturas quando ociosa
+        name: Nome da thread
+    """
+
+    def __init__(
+        self,
+        capture: Callable[[], Frame],
+        size: int = 4,
+        idle_after: float = 2.0,
+        max_interval: float = 2.0,
+        name: str = "capture",
+    ):
+        self._capture = capture
+        self.idle_after = idle_after
+        self.max_interval = max_interval
+        self.name = name
+        self._buffer: "deque[Frame]" = deque(maxlen=size)
+        self._cond = threading.Condition()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._last_read = time.monotonic()
+        self.interval = 0.0
+        self.captures = 0
+        self.errors = 0
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    @property
+    def idle(self) -> bool:
+        """True se ninguem pediu frames nos ultimos `idle_after` segundos."""
+        return time.monotonic() - self._last_read > self.idle_after
+
+    def start(self) -> "CaptureThread":
+        if not self.running:
+            self._stop.clear()
+            self._last_read = time.monotonic()
+            self._thread = threading.Thread(target=self._loop, name=self.name, daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout)
+            self._thread = None
+
+    def frames(self) -> List[Frame]:
+        """Copia do buffer (mais antigo primeiro)."""
+        with self._cond:
+            return list(self._buffer)
+
+    def latest_frame(self, min_timestamp: float = None, timeout: float = 5) -> Optional[Frame]:
+        """
+        Frame mais recente cuja captura comecou depois de `min_timestamp`.
+
+        Se a thread estava ociosa (capturas espacadas), o buffer pode ter ate
+        `max_interval` segundos: nesse caso espera um frame iniciado depois
+        deste pedido.
+
+        Args:
+            min_timestamp: Instante (time.time()) que o frame deve suceder. None = qualquer
+            timeout: Espera maxima (em segundos)
+
+        Returns:
+            Frame ou None se nenhum frame novo chegou a tempo
+        """
+        if self.idle or self.interval > 0:
+            min_timestamp = max(min_timestamp or 0.0, time.time())
+        self._last_read = time.monotonic()
+        # Acorda a thread se estava espacando as capturas
+        self._wake.set()
+
+        def ready():
+            return self._buffer and (
+                min_timestamp is None or self._buffer[-1].timestamp > min_timestamp
+            )
+
+        with self._cond:
+            if not self._cond.wait_for(ready, timeout):
+                return None
+            return self._buffer[-1]
+
+    def _loop(self):
+        while not self._stop.is_set():
+            if self.idle:
+                # Ninguem lendo: dobra o intervalo ate o maximo
+                self.interval = min(max(self.interval * 2, 0.1), self.max_interval)
+                self._wake.clear()
+                self._wake.wait(self.interval)
+                if self._stop.is_set():
+                    break
+            else:
+                self.interval = 0.0
+
+            try:
+                frame = self._capture()
+            except Exception:
+                self.errors += 1
+                self._stop.wait(0.5)
+                continue
+            if frame is None or not frame.raw and frame.gray is None:
+                self.errors += 1
+                continue
+
+            self.captures += 1
+            with self._cond:
+                self._buffer.append(frame)
+                self._cond.notify_all()
@@ -3,17 +3,35 @@ Device - Comunicacao com dispositivo Android via ADB.
 Consolida DeviceManager + VisionEngine.
 """
 
-import json
 import os
 import re
 import subprocess
 import sys
 import time
-from typing import Optional, Tuple
-
-import cv2
-
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional, Tuple
+
+from bot import tasks
+from bot.capture import CaptureThread
+from bot.frame import Frame
+from bot.gestures import GestureLibrary
+from bot.health import HealthMonitor
+from bot.minitouch import (
+    MINITOUCH_REMOTE,
+    center_view_script,
+    deploy_script,
+    drag_script,
+    parse_touch_contacts,
+    parse_touch_info,
+    swipe_script,
+    taps_script,
+    zoom_out_script,
+)
+from bot.scroll import ScrollTracker
 from bot.settings import Settings
+from bot.stream import ScreenStream
+from bot.timing import TimingProfile, frames_settled
+from bot.vision import best_match, load_regions, load_template, match_all
 
 # Esconde janelas CMD no Windows
 if sys.platform == "win32":
@@ -28,10 +46,33 @@ class Device:
     Combina ADB + reconhecimento de imagem.
     """
 
-    def __init__(self, host: str = None, port: int = None):
+    def __init__(self, host: str = None, port: int = None, vision_pool=None):
         self.host = host or Settings.BLUESTACK_HOST
         self.port = port or Settings.BLUESTACK_PORT
         self.serial = f"{self.host}:{self.port}"
+        # VisionPool opcional: matching em processos separados
+        self.vision_pool = vision_pool
+        self.last_frame: Optional[Frame] = None
+        # Geometria cacheada (invalidada por set_screen_size/reset_screen)
+        self._screen_size: Optional[Tuple[int, int]] = None
+        self._touch_info: Optional[Tuple[int, int]] = None
+        self._touch_contacts = 1
+        self._gestures: Optional[GestureLibrary] = None
+        # Observadores de frames (ex: preview da GUI) e ultimos resultados de matching
+        self._frame_listeners: List[Callable[[Frame], None]] = []
+        self.last_matches: Deque[dict] = deque(maxlen=20)
+        # Detecta queda do ADB e reconecta em segundo plano
+        self.health = HealthMonitor(self)
+        # Rastreadores de barras rolaveis (por regiao), mantidos entre chamadas
+        self._scroll_trackers: Dict[Tuple[int, int, int, int], ScrollTracker] = {}
+        # (largura, altura, eixo) -> (px de conteudo por px de dedo, folga do toque)
+        self._scroll_calibration: Dict[Tuple[int, int, str], Tuple[float, float]] = {}
+        # Captura continua opcional (start_capture) e instante da ultima acao de input
+        self._capture_thread: Optional[CaptureThread] = None
+        self._stream: Optional[ScreenStream] = None
+        # Tempos de transicao da UI aprendidos para este device (criado sob demanda)
+        self._timing: Optional[TimingProfile] = None
+        self._last_action = 0.0
         self._connect()
         self._setup_minitouch()
 
@@ -39,15 +80,65 @@ class Device:
 
     def _run(self, cmd: list) -> subprocess.CompletedProcess:
         """Executa comando ADB."""
+        return self._run_checked(cmd, text=True)
+
+    def _run_checked(self, cmd: list, text: bool) -> subprocess.CompletedProcess:
+        """Executa comando ADB; se o transporte caiu, espera reconectar e repete uma vez."""
         adb = str(Settings.get_adb_path())
         full_cmd = [adb, "-s", self.serial] + cmd
-        return subprocess.run(full_cmd, capture_output=True, text=True, **_subprocess_flags)
+        for _attempt in range(2):
+            tasks.check_cancelled()
+            self.health.wait_online()
+            result = subprocess.run(full_cmd, capture_output=True, text=text, **_subprocess_flags)
+            if self.health.observe(result):
+                break
+        return result
+
+    def _run_raw(self, cmd: list) -> subprocess.CompletedProcess:
+        """Executa comando ADB retornando stdout em bytes."""
+        return self._run_checked(cmd, text=False)
 
     def _connect(self):
         """Conecta ao dispositivo."""
         adb = str(Settings.get_adb_path())
         subprocess.run([adb, "connect", self.serial], **_subprocess_flags)
 
+    def is_online(self) -> bool:
+        """True se o ADB responde para este device (sem esperar reconexao)."""
+        adb = str(Settings.get_adb_path())
+        cmd = [adb, "-s", self.serial, "get-state"]
+        result = subprocess.run(cmd, capture_output=True, text=True, **_subprocess_flags)
+        return result.returncode == 0 and result.stdout.strip() == "device"
+
+    def getprop(self, name: str) -> str:
+        """Le uma propriedade do sistema Android."""
+        return self._run(["shell", "getprop", name]).stdout.strip()
+
+    def wait_boot_completed(self, timeout: float = 120, interval: float = 1) -> bool:
+        """
+        Espera o Android terminar o boot (sys.boot_completed == 1).
+
+        Args:
+            timeout: Tempo maximo de espera em segundos
+            interval: Intervalo entre verificacoes
+
+        Returns:
+            True se o boot terminou dentro do tempo
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            if self.getprop("sys.boot_completed") == "1":
+                return True
+            if time.monotonic() >= deadline:
+                return False
+            tasks.sleep(interval)
+
+    def foreground_package(self) -> Optional[str]:
+        """Package do app em primeiro plano (ou None)."""
+        result = self._run(["shell", "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'"])
+        match = re.search(r"([\w.]+)/[\w.$]+", result.stdout)
+        return match.group(1) if match else None
+
     def open_app(self, package: str):
         """Abre aplicativo pelo package name."""
         self._run(["shell", "monkey", "-p", package, "-c", "android.intent.category.LAUNCHER", "1"])
@@ -55,10 +146,12 @@ class Device:
     def tap(self, x: int, y: int):
         """Toca nas coordenadas."""
         self._run(["shell", "input", "tap", str(x), str(y)])
+        self._last_action = time.time()
 
     def swipe(self, x1: int, y1: int, x2: int, y2: int, duration: int = 300):
         """Faz gesto de swipe."""
         self._run(["shell", "input", "swipe", str(x1), str(y1), str(x2), str(y2), str(duration)])
+        self._last_action = time.time()
 
     def keyevent(self, keycode: int):
         """Envia evento de tecla via ADB.
@@ -67,25 +160,144 @@ class Device:
             keycode: Codigo da tecla (ex: 4 = BACK/ESC, 3 = HOME)
         """
         self._run(["shell", "input", "keyevent", str(keycode)])
+        self._last_action = time.time()
+
+    def capture(self) -> Frame:
+        """
+        Captura a tela direto pelo stdout (exec-out), sem arquivo intermediario.
+
+        Returns:
+            Frame com o PNG bruto; cinza/BGR sao decodificados sob demanda.
+            O timestamp e o inicio da captura (o conteudo e posterior a ele)
+        """
+        started = time.time()
+        result = self._run_raw(["exec-out", "screencap", "-p"])
+        if not self.health.observe_capture(result.stdout):
+            # Captura vazia: espera a reconexao (se houver) e tenta de novo
+            self.health.wait_online()
+            result = self._run_raw(["exec-out", "screencap", "-p"])
+            self.health.observe_capture(result.stdout)
+        return self._publish(Frame(raw=result.stdout, timestamp=started))
+
+    def _publish(self, frame: Frame) -> Frame:
+        """Guarda o frame como ultimo e avisa os observadores."""
+        self.last_frame = frame
+        for listener in list(self._frame_listeners):
+            listener(frame)
+        return frame
+
+    def _stream_capture(self) -> Optional[Frame]:
+        """Proximo frame do stream H.264 (usado pela captura continua)."""
+        frame = self._stream.read()
+        return self._publish(frame) if frame is not None else None
+
+    def start_capture(
+        self,
+        size: int = 4,
+        idle_after: float = 2.0,
+        max_interval: float = 2.0,
+        stream: bool = False,
+    ):
+        """
+        Liga a captura continua em segundo plano.
+        Com ela, latest_frame() so espera o proximo frame posterior a ultima acao.
+
+        Args:
+            size: Frames mantidos no buffer
+            idle_after: Segundos sem leitura ate reduzir a frequencia
+            max_interval: Intervalo maximo entre capturas sem leitores
+            stream: Usa screenrecord + ffmpeg (frames em cinza) em vez de screencap.
+                Se o ffmpeg nao estiver disponivel, continua com screencap
+        """
+        if self._capture_thread is not None and self._capture_thread.running:
+            return self._capture_thread
+
+        capture = self.capture
+        if stream:
+            try:
+                self._stream = ScreenStream(self.serial, self._get_screen_size()).start()
+                capture = self._stream_capture
+            except OSError:
+                self._stream = None
+        self._capture_thread = CaptureThread(
+            capture, size, idle_after, max_interval, name=f"capture-{self.serial}"
+        ).start()
+        return self._capture_thread
+
+    def stop_capture(self):
+        """Desliga a captura continua (e o stream, se houver)."""
+        # Para o stream antes para liberar a thread presa em read()
+        if self._stream is not None:
+            self._stream.stop()
+            self._stream = None
+        if self._capture_thread is not None:
+            self._capture_thread.stop()
+            self._capture_thread = None
+
+    def latest_frame(self, min_timestamp: float = None, timeout: float = 5) -> Frame:
+        """
+        Frame posterior a `min_timestamp` (padrao: ultima acao de input).
+
+        Com a captura continua ligada, pega o frame do buffer (esperando o
+        primeiro mais novo que a acao); senao, captura agora.
+
+        Args:
+            min_timestamp: Instante (time.time()) que o frame deve suceder
+            timeout: Espera maxima pelo frame da thread antes de capturar direto
+        """
+        thread = self._capture_thread
+        if thread is not None and thread.running:
+            if min_timestamp is None:
+                min_timestamp = self._last_action
+            frame = thread.latest_frame(min_timestamp, timeout)
+            if frame is not None:
+                return frame
+        return self.capture()
+
+    def add_frame_listener(self, listener: Callable[[Frame], None]):
+        """
+        Registra funcao chamada a cada captura.
+        Deve ser rapida (so guardar a referencia); nao gera capturas extras.
+        """
+        if listener not in self._frame_listeners:
+            self._frame_listeners.append(listener)
+
+    def remove_frame_listener(self, listener: Callable[[Frame], None]):
+        """Remove funcao registrada com add_frame_listener."""
+        if listener in self._frame_listeners:
+            self._frame_listeners.remove(listener)
 
     def screenshot(self, local: str = None) -> str:
-        """Captura screenshot."""
+        """Captura screenshot e salva em disco."""
         local = local or Settings.SCREENSHOT_FILE
-        self._run(["shell", "screencap", "-p", "/sdcard/screen.png"])
-        self._run(["pull", "/sdcard/screen.png", local])
-        return local
+        return self.capture().save(local)
+
+    @staticmethod
+    def _parse_wm(output: str) -> Optional[str]:
+        """Valor efetivo de `wm size`/`wm density` (o Override tem prioridade)."""
+        values = dict(re.findall(r"(Physical|Override) (?:size|density): (\S+)", output))
+        return values.get("Override") or values.get("Physical")
 
     def _get_screen_size(self) -> Tuple[int, int]:
-        """Retorna tamanho da tela."""
-        result = self._run(["shell", "wm", "size"])
-        match = re.search(r"(\d+)x(\d+)", result.stdout)
-        if match:
-            return int(match.group(1)), int(match.group(2))
-        return 860, 732
+        """Retorna tamanho da tela (cacheado)."""
+        if self._screen_size is None:
+            result = self._run(["shell", "wm", "size"])
+            match = re.search(r"(\d+)x(\d+)", self._parse_wm(result.stdout) or "")
+            if match:
+                self._screen_size = int(match.group(1)), int(match.group(2))
+            else:
+                self._screen_size = 860, 732
+        return self._screen_size
+
+    def get_density(self) -> Optional[int]:
+        """Retorna a densidade atual (dpi) ou None se nao foi possivel ler."""
+        value = self._parse_wm(self._run(["shell", "wm", "density"]).stdout)
+        return int(value) if value and value.isdigit() else None
 
     def set_screen_size(self, width: int = 860, height: int = 732):
         """Define tamanho da tela via ADB."""
         self._run(["shell", "wm", "size", f"{width}x{height}"])
+        self._screen_size = None
 
     def set_density(self, dpi: int = 160):
         """Define densidade da tela via ADB."""
@@ -95,11 +307,16 @@ class Device:
         """Reseta configuracoes de tela para padrao."""
         self._run(["shell", "wm", "size", "reset"])
         self._run(["shell", "wm", "density", "reset"])
+        self._screen_size = None
 
     # ==================== VISION ====================
 
     def find_template(
-        self, template: str, threshold: float = 0.8, region: Tuple[int, int, int, int] = None
+        self,
+        template: str,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        frame: Frame = None,
     ) -> Optional[Tuple[int, int]]:
         """
         Encontra template na tela.
@@ -108,42 +325,74 @@ class Device:
             template: Caminho do template (relativo a templates/)
             threshold: Limiar de correspondencia
             region: Regiao para buscar (x1, y1, x2, y2)
+            frame: Frame ja capturado. Se None, captura um novo
 
         Returns:
             (x, y) do centro ou None
         """
-        self.screenshot()
-
-        img = cv2.imread(Settings.SCREENSHOT_FILE, cv2.IMREAD_GRAYSCALE)
-        if img is None:
+        if frame is None:
+            frame = self.latest_frame()
+
+        img = frame.gray
+        if img is not None and self.vision_pool is not None:
+            pos = self.vision_pool.match(img, template, threshold, region, key=self.serial)
+            self.health.note_match(pos is not None, frame)
+            return pos
+
+        match = best_match(img, template, region)
+        if match is None:
+            self.health.note_match(False, frame)
             return None
 
-        template_path = str(Settings.get_template_path(template))
-        tmp = cv2.imread(template_path, cv2.IMREAD_GRAYSCALE)
-        if tmp is None:
-            return None
-
-        search_img = img
-        offset_x, offset_y = 0, 0
-
-        if region:
-            x1, y1, x2, y2 = region
-            search_img = img[y1:y2, x1:x2]
-            offset_x, offset_y = x1, y1
+        x, y, score = match
+        found = score >= threshold
+        self._record_match(template, x, y, score, found, frame)
+        self.health.note_match(found, frame)
+        return (x, y) if found else None
+
+    def _record_match(self, template: str, x: int, y: int, score: float, found: bool, frame):
+        """Guarda o resultado do matching (usado pelo preview da GUI)."""
+        tmp = load_template(template)
+        h, w = tmp.shape if tmp is not None else (0, 0)
+        self.last_matches.append(
+            {
+                "template": template,
+                "box": (x - w // 2, y - h // 2, x + w // 2, y + h // 2),
+                "score": score,
+                "found": found,
+                "timestamp": frame.timestamp,
+            }
+        )
 
-        res = cv2.matchTemplate(search_img, tmp, cv2.TM_CCOEFF_NORMED)
-        _, max_val, _, max_loc = cv2.minMaxLoc(res)
+    def find_all(
+        self,
+        template: str,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        frame: Frame = None,
+    ) -> List[Tuple[int, int]]:
+        """
+        Encontra todas as ocorrencias do template na tela.
 
-        if max_val < threshold:
-            return None
+        Args:
+            template: Caminho do template (relativo a templates/)
+            threshold: Limiar de correspondencia
+            region: Regiao para buscar (x1, y1, x2, y2)
+            frame: Frame ja capturado. Se None, captura um novo
 
-        h, w = tmp.shape
-        x = max_loc[0] + w // 2 + offset_x
-        y = max_loc[1] + h // 2 + offset_y
-        return (x, y)
+        Returns:
+            Lista de (x, y) dos centros
+        """
+        if frame is None:
+            frame = self.latest_frame()
+        return [(x, y) for x, y, _ in match_all(frame.gray, template, threshold, region)]
 
     def image_exists(
-        self, template: str, threshold: float = 0.8, region: Tuple[int, int, int, int] = None
+        self,
+        template: str,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        frame: Frame = None,
     ) -> bool:
         """
         Verifica se uma imagem existe na tela sem clicar.
@@ -152,18 +401,23 @@ class Device:
             template: Caminho do template (relativo a templates/)
             threshold: Limiar de correspondencia
             region: Regiao para buscar (x1, y1, x2, y2)
+            frame: Frame ja capturado. Se None, captura um novo
 
         Returns:
             True se encontrou, False caso contrario
         """
-        return self.find_template(template, threshold, region) is not None
+        return self.find_template(template, threshold, region, frame) is not None
 
     def tap_image(
-        self, template: str, threshold: float = 0.8, retries: int = 5, delay: float = 1
+        self, template: str, threshold: float = 0.8, retries: int = 5, delay: float = None
     ) -> bool:
         """
         Encontra e clica na imagem.
 
+        Args:
+            delay: Delay entre tentativas. Padrao: p95 do tempo que o template
+                costuma levar para aparecer neste device (1 s ate aprender)
+
         Returns:
             True se encontrou e clicou
         """
@@ -174,15 +428,53 @@ class Device:
         if meta and meta.get("use_region"):
             region = meta.get("region")
 
-        for _ in range(retries):
-            pos = self.find_template(template, threshold, region)
+        for attempt in range(retries):
+            frame = self.latest_frame()
+            pos = self.find_template(template, threshold, region, frame)
             if pos:
+                if attempt:
+                    self._record_appear(template, frame)
                 self.tap(pos[0], pos[1])
                 return True
-            time.sleep(delay)
+            tasks.sleep(self._retry_delay(template, delay))
 
         return False
 
+    def scroll_tracker(self, region: Tuple[int, int, int, int]) -> ScrollTracker:
+        """Rastreador da barra rolavel na regiao (criado na primeira chamada)."""
+        region = tuple(region)
+        tracker = self._scroll_trackers.get(region)
+        if tracker is None:
+            tracker = ScrollTracker(region)
+            self._scroll_trackers[region] = tracker
+        return tracker
+
+    def wait_scroll_settled(
+        self, tracker: ScrollTracker, requested: float, timeout: float = 2, interval: float = 0.1
+    ) -> Frame:
+        """
+        Captura ate a barra parar de andar (inercia) em vez de esperar um tempo fixo.
+        Com o arrasto sem inercia, a primeira captura ja basta quando a barra
+        andou exatamente o pedido (ou bateu no fim da lista).
+
+        Returns:
+            Frame com a barra parada
+        """
+        deadline = time.monotonic() + timeout
+        frame = self.latest_frame()
+        moved = tracker.after_scroll(frame, requested)
+        if moved is not None and (
+            abs(moved - requested) <= 2 * tracker.still_px or tracker.at_end or tracker.at_start
+        ):
+            return frame
+        while moved is not None and abs(moved) >= tracker.still_px:
+            if time.monotonic() >= deadline:
+                break
+            tasks.sleep(interval)
+            frame = self.latest_frame(frame.timestamp)
+            moved = tracker.update(frame)
+        return frame
+
     def find_and_tap_with_scroll(
         self,
         template: str,
@@ -190,20 +482,74 @@ class Device:
         scroll_pos: Tuple[int, int] = None,
         max_scrolls: int = 5,
         threshold: float = 0.75,
-        sleep: float = 0.5
+        sleep: float = 0.5,
+        bar_region: Tuple[int, int, int, int] = None,
     ) -> bool:
         """
         Encontra imagem, se nao achar faz scroll e tenta novamente.
+
+        O deslocamento real da barra e medido por correlacao de fase: o scroll
+        para no fim da lista, continua no sentido contrario se preciso, e um
+        template ja visto e alcancado com um unico scroll calculado.
+
+        Args:
+            template: Caminho do template (relativo a templates/)
+            scroll_pixels: Pixels por scroll de busca
+            scroll_pos: Ponto onde o scroll comeca. Padrao: centro da tela
+            max_scrolls: Maximo de scrolls de busca (em cada sentido)
+            threshold: Limiar de correspondencia
+            sleep: Tempo maximo esperando a barra parar apos cada scroll
+            bar_region: ROI da barra. Padrao: faixa de 180 px em volta de scroll_pos
+
+        Returns:
+            True se encontrou e clicou
         """
-        for attempt in range(max_scrolls + 1):
-            pos = self.find_template(template, threshold)
-            if pos:
-                self.tap(pos[0], pos[1])
+        screen_w, screen_h = self._get_screen_size()
+        x, y = scroll_pos or (screen_w // 2, screen_h // 2)
+        if bar_region is None:
+            bar_region = (0, max(y - 90, 0), screen_w, min(y + 90, screen_h))
+        tracker = self.scroll_tracker(bar_region)
+
+        # Mesma tela de antes: mantem o offset; senao o rastreador recomeca
+        frame = self.latest_frame()
+        tracker.update(frame)
+
+        def search(frame: Frame) -> bool:
+            pos = self.find_template(template, threshold, frame=frame)
+            if not pos:
+                return False
+            tracker.remember(template, pos)
+            self.tap(pos[0], pos[1])
+            return True
+
+        if search(frame):
+            return True
+
+        # So calibra quando vai precisar rolar (uma vez por geometria)
+        if not self.scroll_calibrated("x"):
+            self.calibrate_scroll(bar_region, (x, y), "x")
+            tracker.update(self.latest_frame())
+
+        # Ja visto antes: um scroll direto ate ele
+        distance = tracker.distance_to(template)
+        if distance:
+            self.scroll_horizontal(distance, (x, y))
+            frame = self.wait_scroll_settled(tracker, distance, timeout=sleep)
+            if search(frame):
                 return True
 
-            if attempt < max_scrolls:
-                self.scroll_horizontal(scroll_pixels, scroll_pos)
-                time.sleep(sleep)
+        for direction in (1, -1):
+            # So volta se a lista acabou no sentido de avanco
+            if direction < 0 and not tracker.at_end:
+                break
+            for _ in range(max_scrolls):
+                if (tracker.at_end if direction > 0 else tracker.at_start):
+                    break
+                step = scroll_pixels * direction
+                self.scroll_horizontal(step, (x, y))
+                frame = self.wait_scroll_settled(tracker, step, timeout=sleep)
+                if search(frame):
+                    return True
 
         return False
 
@@ -215,7 +561,7 @@ class Device:
         threshold: float = 0.8,
         hold_ms: int = 200,
         retries: int = 5,
-        delay: float = 1,
+        delay: float = None,
         region: Tuple[int, int, int, int] = None
     ) -> bool:
         """
@@ -228,7 +574,7 @@ class Device:
             threshold: Limiar de correspondencia
             hold_ms: Tempo de segurar antes de mover (em milissegundos)
             retries: Numero de tentativas para encontrar a imagem
-            delay: Delay entre tentativas (em segundos)
+            delay: Delay entre tentativas (em segundos). Padrao: aprendido (ver tap_image)
             region: Regiao para buscar (x1, y1, x2, y2)
         
         Returns:
@@ -244,26 +590,107 @@ class Device:
         if region:
             search_region = region
 
-        for _ in range(retries):
-            pos = self.find_template(template, threshold, search_region)
+        for attempt in range(retries):
+            frame = self.latest_frame()
+            pos = self.find_template(template, threshold, search_region, frame)
             if pos:
+                if attempt:
+                    self._record_appear(template, frame)
                 # Encontrou a imagem, faz o drag usando minitouch
                 self._minitouch_swipe(pos[0], pos[1], target_x, target_y, hold_ms=hold_ms)
                 return True
-            time.sleep(delay)
+            tasks.sleep(self._retry_delay(template, delay))
 
         return False
 
+    # ==================== TEMPOS ====================
+
+    @property
+    def timing(self) -> TimingProfile:
+        """Perfil de tempos das transicoes da UI deste device."""
+        if self._timing is None:
+            self._timing = TimingProfile.for_device(self.serial)
+        return self._timing
+
+    def _retry_delay(self, template: str, delay: Optional[float]) -> float:
+        """Delay entre tentativas de achar um template (fixo ou aprendido)."""
+        if delay is not None:
+            return delay
+        return self.timing.delay(f"appear:{template}", 1.0)
+
+    def _record_appear(self, template: str, frame: Frame):
+        """Registra quanto o template levou para aparecer apos a ultima acao."""
+        elapsed = frame.timestamp - self._last_action
+        if self._last_action and 0 <= elapsed < 60:
+            self.timing.record(f"appear:{template}", elapsed)
+
+    def settle(
+        self,
+        name: str,
+        default: float,
+        template: str = None,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        timeout: float = None,
+        interval: float = 0.05,
+    ) -> Optional[Frame]:
+        """
+        Espera uma transicao da UI (ex: menu abrindo apos um toque).
+
+        Enquanto a transicao tem poucas amostras (e depois 1 a cada N vezes),
+        mede o tempo real ate a tela ficar pronta (template aparecer ou a tela
+        parar de mudar) e grava no perfil. Nas demais, so dorme o p95 observado.
+        Sem template, se a tela nao muda em `default` segundos (ex: fim da lista,
+        janela ja fechada), grava esse tempo e segue, sem esperar o timeout.
+
+        Args:
+            name: Nome da transicao (ex: "army.open")
+            default: Atraso fixo usado ate haver amostras
+            template: Template que indica a tela pronta. Se None, espera a tela parar
+            threshold: Limiar de correspondencia do template
+            region: Regiao para buscar o template
+            timeout: Espera maxima ao medir. Padrao: max(3 * default, 2)
+            interval: Intervalo entre capturas ao medir
+
+        Returns:
+            Frame pronto quando mediu; None quando so dormiu
+        """
+        profile = self.timing
+        if not profile.should_measure(name):
+            tasks.sleep(profile.delay(name, default))
+            return None
+
+        since = self._last_action or time.time()
+        deadline = time.monotonic() + (timeout if timeout is not None else max(3 * default, 2))
+        # Frame de antes da acao: sem mudanca em relacao a ele, a transicao nem comecou
+        before = self.last_frame if self.last_frame and self.last_frame.timestamp < since else None
+        changed = before is None or template is not None
+        prev, frame = None, self.latest_frame(since)
+        while True:
+            ready_at = None
+            if template is not None:
+                if self.image_exists(template, threshold, region, frame):
+                    ready_at = frame.timestamp
+            else:
+                changed = changed or not frames_settled(before, frame)
+                if changed and frames_settled(prev, frame):
+                    ready_at = prev.timestamp
+                elif not changed and frame.timestamp - since >= default:
+                    # Nada mudou: a transicao nao leva a tela a lugar nenhum
+                    ready_at = frame.timestamp
+
+            if ready_at is not None:
+                profile.record(name, ready_at - since)
+                return frame
+            if time.monotonic() >= deadline:
+                # Nao ficou pronta: nao registra amostra
+                return frame
+            tasks.sleep(interval)
+            prev, frame = frame, self.latest_frame(frame.timestamp)
+
     def _load_regions(self) -> dict:
         """Carrega regioes dos templates."""
-        path = Settings.get_template_path("templates.json")
-        if path.exists():
-            try:
-                with open(path, "r", encoding="utf-8") as f:
-                    return json.load(f)
-            except Exception:
-                pass
-        return {}
+        return load_regions()
 
     # ==================== MINITOUCH ====================
 
@@ -290,7 +717,10 @@ class Device:
         self._run(["shell", "chmod", "755", "/data/local/tmp/minitouch"])
 
     def _get_touch_info(self) -> Tuple[int, int]:
-        """Retorna info do touch (max_x, max_y)."""
+        """Retorna info do touch (max_x, max_y), cacheado."""
+        if self._touch_info is not None:
+            return self._touch_info
+
         env = os.environ.copy()
         env["MSYS_NO_PATHCONV"] = "1"
         adb = str(Settings.get_adb_path())
@@ -304,175 +734,240 @@ class Device:
             **_subprocess_flags,
         )
 
-        for line in result.stdout.split("\n"):
-            if line.startswith("^"):
-                parts = line.split()
-                return int(parts[2]), int(parts[3])
-        return 32767, 32767
-
-    def _minitouch_swipe(self, x1: int, y1: int, x2: int, y2: int, hold_ms: int = 1):
-        """Swipe usando minitouch."""
-        screen_w, screen_h = self._get_screen_size()
-        max_x, max_y = self._get_touch_info()
+        self._touch_info = parse_touch_info(result.stdout)
+        self._touch_contacts = parse_touch_contacts(result.stdout)
+        return self._touch_info
 
-        def to_touch(sx, sy):
-            tx = int((sx / screen_w) * max_x)
-            ty = int((sy / screen_h) * max_y)
-            return tx, ty
+    @property
+    def touch_contacts(self) -> int:
+        """Dedos simultaneos suportados pelo minitouch."""
+        self._get_touch_info()
+        return self._touch_contacts
 
-        commands = ["r"]
-        tx1, ty1 = to_touch(x1, y1)
-        commands.append(f"d 0 {tx1} {ty1} 50")
-        commands.append("c")
-        commands.append(f"w {hold_ms}")
+    def deploy(
+        self,
+        waves: List[Tuple[Tuple[int, int], List[Tuple[int, int]]]],
+        contacts: int = None,
+        press_ms: int = 20,
+        interval_ms: int = 30,
+    ) -> float:
+        """
+        Executa varias ondas de deploy (slot + pontos) em um unico script minitouch.
 
-        tx2, ty2 = to_touch(x2, y2)
-        commands.append(f"m 0 {tx2} {ty2} 50")
-        commands.append("c")
-        commands.append(f"w {hold_ms}")
+        Args:
+            waves: Lista de (posicao do slot, pontos de deploy)
+            contacts: Dedos simultaneos (padrao: o maximo do dispositivo, ate 5)
+            press_ms: Tempo com os dedos no chao
+            interval_ms: Pausa entre rajadas
 
-        commands.append("u 0")
-        commands.append("c")
+        Returns:
+            Segundos gastos executando o script
+        """
+        screen_w, screen_h = self._get_screen_size()
+        touch = self._get_touch_info()
+        contacts = contacts or min(self.touch_contacts, 5)
 
-        script = "\n".join(commands)
-        script_path = Settings.PROJECT_ROOT / "swipe_script.txt"
+        script = deploy_script(
+            waves, (screen_w, screen_h), touch, contacts, press_ms, interval_ms
+        )
+        start = time.perf_counter()
+        self._run_minitouch(script, "deploy")
+        return time.perf_counter() - start
+
+    def _run_minitouch(self, script: str, name: str):
+        """Grava, envia e executa um script minitouch."""
+        tasks.check_cancelled()
+        script_path = Settings.PROJECT_ROOT / f"{name}_script.txt"
         with open(script_path, "w") as f:
             f.write(script)
 
         env = os.environ.copy()
         env["MSYS_NO_PATHCONV"] = "1"
         adb = str(Settings.get_adb_path())
+        remote = f"/data/local/tmp/{name}.script"
 
         subprocess.run(
-            [adb, "-s", self.serial, "push", str(script_path), "/data/local/tmp/swipe.script"],
+            [adb, "-s", self.serial, "push", str(script_path), remote],
             env=env,
             capture_output=True,
             **_subprocess_flags,
         )
         subprocess.run(
-            [
-                adb,
-                "-s",
-                self.serial,
-                "shell",
-                "/data/local/tmp/minitouch",
-                "-f",
-                "/data/local/tmp/swipe.script",
-            ],
+            [adb, "-s", self.serial, "shell", MINITOUCH_REMOTE, "-f", remote],
             env=env,
             capture_output=True,
             **_subprocess_flags,
         )
+        self._last_action = time.time()
 
-    def scroll_horizontal(self, pixels: int, start_pos: Tuple[int, int] = None):
-        """Scroll horizontal."""
+    def _minitouch_swipe(self, x1: int, y1: int, x2: int, y2: int, hold_ms: int = 1):
+        """Swipe usando minitouch."""
+        screen_w, screen_h = self._get_screen_size()
+        max_x, max_y = self._get_touch_info()
+
+        script = swipe_script(x1, y1, x2, y2, (screen_w, screen_h), (max_x, max_y), hold_ms)
+        self._run_minitouch(script, "swipe")
+
+    def tap_batch(self, points: List[Tuple[int, int]], interval_ms: int = 50):
+        """
+        Toca varios pontos com um unico script minitouch.
+
+        Args:
+            points: Lista de (x, y)
+            interval_ms: Intervalo entre toques (em milissegundos)
+        """
+        if not points:
+            return
         screen_w, screen_h = self._get_screen_size()
-        if start_pos:
-            x, y = start_pos
+        max_x, max_y = self._get_touch_info()
+
+        script = taps_script(points, (screen_w, screen_h), (max_x, max_y), interval_ms=interval_ms)
+        self._run_minitouch(script, "taps")
+
+    def drag(
+        self, x1: int, y1: int, x2: int, y2: int, velocity: float = 600, hold_ms: int = 150
+    ):
+        """
+        Arrasto com velocidade constante que para antes de soltar (sem inercia).
+
+        Args:
+            velocity: Velocidade do dedo em pixels por segundo
+            hold_ms: Tempo parado no ponto final antes de soltar
+        """
+        screen_w, screen_h = self._get_screen_size()
+        max_x, max_y = self._get_touch_info()
+
+        script = drag_script(
+            x1, y1, x2, y2, (screen_w, screen_h), (max_x, max_y), velocity, hold_ms=hold_ms
+        )
+        self._run_minitouch(script, "drag")
+
+    def _finger_pixels(self, pixels: float, axis: str) -> int:
+        """Converte o deslocamento desejado do conteudo em deslocamento do dedo."""
+        if not pixels:
+            return 0
+        screen_w, screen_h = self._get_screen_size()
+        ratio, slop = self._scroll_calibration.get((screen_w, screen_h, axis), (1.0, 0.0))
+        finger = abs(pixels) / ratio + slop
+        return int(round(finger if pixels > 0 else -finger))
+
+    def _scroll(self, pixels: int, start_pos: Tuple[int, int], axis: str, exact: bool):
+        screen_w, screen_h = self._get_screen_size()
+        x, y = start_pos or (screen_w // 2, screen_h // 2)
+        finger = self._finger_pixels(pixels, axis) if exact else pixels
+        if axis == "x":
+            self.drag(x, y, x - finger, y)
         else:
-            x, y = screen_w // 2, screen_h // 2
+            self.drag(x, y, x, y - finger)
 
-        self._minitouch_swipe(x, y, x - pixels, y, hold_ms=50)
+    def scroll_horizontal(
+        self, pixels: int, start_pos: Tuple[int, int] = None, exact: bool = True
+    ):
+        """
+        Scroll horizontal.
 
-    def scroll_vertical(self, pixels: int, start_pos: Tuple[int, int] = None):
+        Args:
+            pixels: Pixels de conteudo (positivo = avanca para a direita)
+            start_pos: Posicao inicial (x, y). Se None, usa o centro da tela.
+            exact: Se True, aplica a calibracao (calibrate_scroll) do dispositivo
+        """
+        self._scroll(pixels, start_pos, "x", exact)
+
+    def scroll_vertical(self, pixels: int, start_pos: Tuple[int, int] = None, exact: bool = True):
         """Scroll vertical.
-        
+
         Args:
             pixels: Pixels para scroll (positivo = para baixo, negativo = para cima)
             start_pos: Posicao inicial (x, y). Se None, usa o centro da tela.
+            exact: Se True, aplica a calibracao (calibrate_scroll) do dispositivo
         """
-        screen_w, screen_h = self._get_screen_size()
-        if start_pos:
-            x, y = start_pos
-        else:
-            x, y = screen_w // 2, screen_h // 2
+        self._scroll(pixels, start_pos, "y", exact)
 
-        self._minitouch_swipe(x, y, x, y - pixels, hold_ms=50)
-
-    def center_view(self, move_right: int = 200, move_down: int = 0):
-        """Centraliza camera do jogo."""
+    def scroll_calibrated(self, axis: str = "x") -> bool:
+        """True se ja existe calibracao para a geometria atual."""
         screen_w, screen_h = self._get_screen_size()
-        center_x, center_y = screen_w // 2, screen_h // 2
+        return (screen_w, screen_h, axis) in self._scroll_calibration
 
-        # Move tudo para canto esquerdo
-        self._minitouch_swipe(100, center_y, screen_w - 100, center_y, hold_ms=200)
-        time.sleep(0.2)
-
-        # Move tudo para cima
-        self._minitouch_swipe(center_x, 100, center_x, screen_h - 100, hold_ms=200)
-        time.sleep(0.2)
+    def calibrate_scroll(
+        self,
+        region: Tuple[int, int, int, int],
+        start_pos: Tuple[int, int] = None,
+        axis: str = "x",
+        distances: Tuple[int, int] = (80, 160),
+    ) -> Optional[Tuple[float, float]]:
+        """
+        Mede quanto o conteudo anda por pixel de dedo (uma vez por geometria).
 
-        # Ajuste fino
-        if move_right > 0:
-            self._minitouch_swipe(center_x, center_y, center_x - move_right, center_y, hold_ms=200)
-            time.sleep(0.1)
+        Faz dois arrastos de ida e volta e ajusta `conteudo = ratio * (dedo - folga)`,
+        onde a folga e o trecho inicial que o Android consome antes de rolar.
 
-        if move_down > 0:
-            self._minitouch_swipe(center_x, center_y, center_x, center_y + move_down, hold_ms=200)
+        Args:
+            region: ROI da barra usada para medir
+            start_pos: Ponto onde os arrastos comecam
+            axis: "x" ou "y"
+            distances: Dois deslocamentos de dedo diferentes
 
-    def zoom_out(self, steps: int = 10, duration_ms: int = 300):
-        """Zoom out usando minitouch (pinch in)."""
+        Returns:
+            (ratio, folga) ou None se a barra nao andou (ex: ja estava no fim).
+            Na falha, guarda (1.0, 0.0) para nao repetir os arrastos de teste
+        """
         screen_w, screen_h = self._get_screen_size()
-        max_x, max_y = self._get_touch_info()
+        key = (screen_w, screen_h, axis)
+        tracker = ScrollTracker(region, axis)
+        tracker.reset(self.latest_frame())
+
+        samples = []
+        for distance in distances:
+            self._scroll(distance, start_pos, axis, exact=False)
+            moved = tracker.update(self.latest_frame())
+            self._scroll(-distance, start_pos, axis, exact=False)
+            tracker.update(self.latest_frame())
+            if moved is None or moved < tracker.still_px:
+                self._scroll_calibration[key] = (1.0, 0.0)
+                return None
+            samples.append((distance, moved))
+
+        (d1, m1), (d2, m2) = samples
+        ratio = (m2 - m1) / (d2 - d1) if m2 > m1 else m2 / d2
+        slop = max(d1 - m1 / ratio, 0.0) if m2 > m1 else 0.0
+
+        self._scroll_calibration[key] = (ratio, slop)
+        return ratio, slop
+
+    @property
+    def gestures(self) -> GestureLibrary:
+        """Biblioteca de gestos residente no device (criada sob demanda)."""
+        if self._gestures is None:
+            self._gestures = GestureLibrary(self)
+        return self._gestures
+
+    def play_gesture(self, name: str):
+        """Executa um gesto da biblioteca pelo nome."""
+        self.gestures.play(name)
+        self._last_action = time.time()
 
-        center_x, center_y = screen_w // 2, screen_h // 2
-        start_offset = min(screen_w, screen_h) // 3
-        left_x = center_x - start_offset
-        right_x = center_x + start_offset
-
-        def to_touch(sx, sy):
-            return int((sx / screen_w) * max_x), int((sy / screen_h) * max_y)
-
-        wait_per_step = duration_ms // steps
-        commands = ["r"]
-
-        lx, ly = to_touch(left_x, center_y)
-        rx, ry = to_touch(right_x, center_y)
-        commands.append(f"d 0 {lx} {ly} 50")
-        commands.append(f"d 1 {rx} {ry} 50")
-        commands.append("c")
-        commands.append(f"w {wait_per_step}")
-
-        for i in range(1, steps + 1):
-            progress = i / steps
-            curr_left_x = left_x + int((center_x - left_x) * progress)
-            curr_right_x = right_x - int((right_x - center_x) * progress)
-
-            lx, ly = to_touch(curr_left_x, center_y)
-            rx, ry = to_touch(curr_right_x, center_y)
-            commands.append(f"m 0 {lx} {ly} 50")
-            commands.append(f"m 1 {rx} {ry} 50")
-            commands.append("c")
-            commands.append(f"w {wait_per_step}")
-
-        commands.append("u 0")
-        commands.append("u 1")
-        commands.append("c")
-
-        script = "\n".join(commands)
-        script_path = Settings.PROJECT_ROOT / "zoom_script.txt"
-        with open(script_path, "w") as f:
-            f.write(script)
+    def center_view(self, move_right: int = 200, move_down: int = 0):
+        """Centraliza camera do jogo (todos os swipes em uma unica execucao)."""
+        screen = self._get_screen_size()
+        touch = self._get_touch_info()
 
-        env = os.environ.copy()
-        env["MSYS_NO_PATHCONV"] = "1"
-        adb = str(Settings.get_adb_path())
+        script = center_view_script(screen, touch, move_right, move_down)
+        name = f"center_view_{screen[0]}x{screen[1]}_{move_right}_{move_down}"
+        self.play_gesture(self.gestures.register(name, script))
 
-        subprocess.run(
-            [adb, "-s", self.serial, "push", str(script_path), "/data/local/tmp/zoom.script"],
-            env=env,
-            **_subprocess_flags,
-        )
-        subprocess.run(
-            [
-                adb,
-                "-s",
-                self.serial,
-                "shell",
-                "/data/local/tmp/minitouch",
-                "-f",
-                "/data/local/tmp/zoom.script",
-            ],
-            env=env,
-            **_subprocess_flags,
-        )
+    def zoom_out(self, steps: int = 10, duration_ms: int = 300, repeat: int = 1):
+        """
+        Zoom out usando minitouch (pinch in).
+
+        Args:
+            steps: Passos de cada pinch
+            duration_ms: Duracao de cada pinch (em milissegundos)
+            repeat: Quantos pinches executar em sequencia (uma unica execucao)
+        """
+        screen = self._get_screen_size()
+        touch = self._get_touch_info()
+
+        pinch = zoom_out_script(screen, touch, steps, duration_ms)
+        script = "\nw 300\n".join([pinch] * repeat)
+        name = f"zoom_out_{screen[0]}x{screen[1]}_{steps}_{duration_ms}_x{repeat}"
+        self.play_gesture(self.gestures.register(name, script))
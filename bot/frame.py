@@ -0,0 +1,136 @@
+"""
+Frame - Captura de tela com representacoes derivadas cacheadas.
+Cada representacao (BGR, cinza, piramide, ROI) e calculada no maximo uma vez por captura.
+"""
+
+import hashlib
+import threading
+import time
+from typing import Optional, Tuple
+
+import cv2
+import numpy as np
+
+
+class Frame:
+    """
+    Frame capturado do dispositivo.
+
+    Guarda o buffer bruto (PNG) e calcula sob demanda as versoes usadas pelos
+    matchers. Todos os consumidores de um mesmo tick devem compartilhar o frame.
+    """
+
+    def __init__(self, raw: bytes = None, gray=None, bgr=None, timestamp: float = None):
+        self.raw = raw
+        self.timestamp = timestamp if timestamp is not None else time.time()
+        self._bgr = bgr
+        self._gray = gray
+        self._pyramid = {}
+        self._rois = {}
+        self._hash = None
+        self._lock = threading.RLock()
+
+    @classmethod
+    def from_file(cls, path: str) -> Optional["Frame"]:
+        """Cria frame a partir de uma imagem em disco."""
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+        except OSError:
+            return None
+        return cls(raw=raw) if raw else None
+
+    @property
+    def valid(self) -> bool:
+        """True se o frame tem conteudo decodificavel."""
+        return self.gray is not None
+
+    @property
+    def bgr(self):
+        """Imagem colorida (BGR)."""
+        if self._bgr is None and self.raw:
+            with self._lock:
+                if self._bgr is None:
+                    self._bgr = cv2.imdecode(np.frombuffer(self.raw, np.uint8), cv2.IMREAD_COLOR)
+        return self._bgr
+
+    @property
+    def gray(self):
+        """Imagem em escala de cinza."""
+        if self._gray is None:
+            with self._lock:
+                if self._gray is None:
+                    if self._bgr is not None:
+                        self._gray = cv2.cvtColor(self._bgr, cv2.COLOR_BGR2GRAY)
+                    elif self.raw:
+                        # Decodifica direto em cinza, sem passar pelo BGR
+                        self._gray = cv2.imdecode(
+                            np.frombuffer(self.raw, np.uint8), cv2.IMREAD_GRAYSCALE
+                        )
+        return self._gray
+
+    @property
+    def size(self) -> Tuple[int, int]:
+        """(largura, altura) do frame."""
+        img = self.gray
+        if img is None:
+            return 0, 0
+        return img.shape[1], img.shape[0]
+
+    def pyramid(self, level: int = 1):
+        """
+        Versao em cinza reduzida por 2**level (cv2.pyrDown).
+
+        Args:
+            level: Nivel da piramide (0 = tamanho original)
+        """
+        if level <= 0:
+            return self.gray
+        with self._lock:
+            img = self._pyramid.get(level)
+            if img is None:
+                base = self.pyramid(level - 1)
+                if base is None:
+                    return None
+                img = cv2.pyrDown(base)
+                self._pyramid[level] = img
+            return img
+
+    def roi(self, region: Tuple[int, int, int, int], color: bool = False):
+        """
+        Recorte (x1, y1, x2, y2) do frame. Retorna uma view, sem copia.
+
+        Args:
+            region: Regiao (x1, y1, x2, y2)
+            color: Se True, recorta da imagem BGR
+        """
+        key = (tuple(region), color)
+        with self._lock:
+            img = self._rois.get(key)
+            if img is None:
+                base = self.bgr if color else self.gray
+                if base is None:
+                    return None
+                x1, y1, x2, y2 = region
+                img = base[y1:y2, x1:x2]
+                self._rois[key] = img
+            return img
+
+    @property
+    def hash(self) -> str:
+        """Hash do conteudo (para caches por frame)."""
+        if self._hash is None:
+            with self._lock:
+                if self._hash is None:
+                    data = self.raw if self.raw else self.gray.tobytes()
+                    self._hash = hashlib.blake2b(data, digest_size=8).hexdigest()
+        return self._hash
+
+    def save(self, path: str) -> str:
+        """Salva o frame em disco (PNG)."""
+        if self.raw:
+            with open(path, "wb") as f:
+                f.write(self.raw)
+        else:
+            cv2.imwrite(path, self.bgr if self._bgr is not None else self.gray)
+        return path
@@ -0,0 +1,152 @@
+"""
+Gestures - Biblioteca de scripts minitouch residente no dispositivo.
+Os scripts sao enviados uma vez por sessao (verificados por md5) e executados pelo nome.
+"""
+
+import hashlib
+import re
+from pathlib import Path
+from typing import Dict, List, Set
+
+from bot.minitouch import MINITOUCH_REMOTE
+from bot.settings import Settings
+
+REMOTE_DIR = "/data/local/tmp/gestures"
+TOYBOX_REMOTE = f"{REMOTE_DIR}/toybox"
+
+
+def _md5(data: bytes) -> str:
+    return hashlib.md5(data).hexdigest()
+
+
+class GestureLibrary:
+    """
+    Gerencia os gestos de um device.
+
+    Inclui os scripts de pinch em resources/adb_scripts (Normal0-6, Small0-2 e
+    variantes .BlueStacks5), o binario toybox e scripts gerados para a geometria
+    atual (registrados com register()).
+
+    So vao para o device o toybox, os scripts gerados e os scripts distribuidos
+    que ja foram executados: os pinches distribuidos nao sao usados pelo zoom_out
+    (gerado para a geometria atual) e ficam no PC ate alguem pedir por nome.
+    """
+
+    def __init__(self, device):
+        self.device = device
+        # Scripts gerados ficam em config/gestures/<device>/ (reaproveitados entre sessoes)
+        serial = re.sub(r"[^\w.-]", "_", device.serial)
+        self._local_dir = Settings.get_config_path(f"gestures/{serial}")
+        self._files: Dict[str, Path] = {}
+        self._checksums: Dict[str, str] = {}
+        self._remote: Dict[str, str] = {}
+        # Arquivos que devem estar no device
+        self._used: Set[str] = set()
+        self._checked_remote = False
+        self._load_shipped()
+
+    def _load_shipped(self):
+        """Registra os scripts e binarios distribuidos com o projeto."""
+        scripts_dir = Settings.PROJECT_ROOT / "resources" / "adb_scripts"
+        if not scripts_dir.exists():
+            return
+        paths = sorted(scripts_dir.glob("*.minitouch"))
+        toybox = scripts_dir / "toybox"
+        if toybox.exists():
+            paths.append(toybox)
+        for path in paths:
+            self._files[path.name] = path
+            self._checksums[path.name] = _md5(path.read_bytes())
+        if toybox.exists():
+            self._used.add(toybox.name)
+
+    @property
+    def names(self) -> List[str]:
+        """Nomes dos gestos disponiveis."""
+        return sorted(f[: -len(".minitouch")] for f in self._files if f.endswith(".minitouch"))
+
+    def has(self, name: str) -> bool:
+        return f"{name}.minitouch" in self._files
+
+    def register(self, name: str, script: str) -> str:
+        """
+        Registra (ou atualiza) um script gerado.
+
+        Args:
+            name: Nome do gesto
+            script: Conteudo do script minitouch
+
+        Returns:
+            Nome do gesto
+        """
+        filename = f"{name}.minitouch"
+        data = script.encode()
+        checksum = _md5(data)
+        if self._checksums.get(filename) != checksum:
+            self._local_dir.mkdir(parents=True, exist_ok=True)
+            path = self._local_dir / filename
+            path.write_bytes(data)
+            self._files[filename] = path
+            self._checksums[filename] = checksum
+        self._used.add(filename)
+        return name
+
+    def _remote_checksums(self) -> Dict[str, str]:
+        """Le os md5 dos arquivos ja presentes no device (um unico comando)."""
+        result = self.device._run(
+            [
+                "shell",
+                f"cd {REMOTE_DIR} 2>/dev/null && "
+                f"(md5sum * 2>/dev/null || {TOYBOX_REMOTE} md5sum * 2>/dev/null)",
+            ]
+        )
+        checksums = {}
+        for line in result.stdout.splitlines():
+            parts = line.split()
+            if len(parts) == 2:
+                checksums[parts[1]] = parts[0]
+        return checksums
+
+    def pending(self) -> List[str]:
+        """Arquivos em uso que ainda nao estao no device (ou estao desatualizados)."""
+        if not self._checked_remote:
+            self._remote = self._remote_checksums()
+            self._checked_remote = True
+        return [
+            f for f in self._files if f in self._used and self._remote.get(f) != self._checksums[f]
+        ]
+
+    def sync(self) -> List[str]:
+        """
+        Envia os arquivos pendentes em um unico push e confere os checksums.
+
+        Returns:
+            Arquivos enviados
+
+        Raises:
+            RuntimeError: Se algum arquivo nao conferir apos o envio
+        """
+        pending = self.pending()
+        if not pending:
+            return []
+
+        self.device._run(["shell", "mkdir", "-p", REMOTE_DIR])
+        self.device._run(["push"] + [str(self._files[f]) for f in pending] + [f"{REMOTE_DIR}/"])
+        if "toybox" in pending:
+            self.device._run(["shell", "chmod", "755", TOYBOX_REMOTE])
+
+        self._remote = self._remote_checksums()
+        failed = [f for f in pending if self._remote.get(f) != self._checksums[f]]
+        if failed:
+            raise RuntimeError(f"Gesture upload failed: {', '.join(failed)}")
+        return pending
+
+    def play(self, name: str):
+        """Executa um gesto pelo nome (envia antes se necessario)."""
+        filename = f"{name}.minitouch"
+        if filename not in self._files:
+            raise KeyError(f"Unknown gesture: {name}")
+        self._used.add(filename)
+        if not self._checked_remote or self._remote.get(filename) != self._checksums[filename]:
+            self.sync()
+        self.device._run(["shell", MINITOUCH_REMOTE, "-f", f"{REMOTE_DIR}/{filename}"])
@@ -0,0 +1,210 @@
+"""
+Health - Monitor de conexao de um Device.
+
+Detecta queda do transporte ADB (codigo de retorno, stderr, capturas vazias),
+reconecta em segundo plano e segura os comandos ate o device voltar, em vez de
+deixar os fluxos girando com capturas vazias. Tambem reconhece as telas do jogo
+de conexao perdida (templates/device/) e toca no botao de recarregar.
+"""
+
+import re
+import threading
+import time
+from typing import Optional
+
+from bot import tasks
+from bot.readiness import adb_connect
+from bot.vision import best_match
+
+# Mensagens do adb que indicam perda do transporte (nao erro do comando em si)
+TRANSPORT_ERRORS = re.compile(
+    r"device offline|device '[^']*' not found|no devices/emulators found|"
+    r"device not found|cannot connect|connection reset|protocol fault|closed",
+    re.IGNORECASE,
+)
+
+# Telas de "conexao perdida" do jogo, em ordem de prioridade
+RECOVERY_TEMPLATES = ["device/reload_device.png", "device/device_connect.png"]
+
+PNG_SIGNATURE = b"\x89PNG"
+
+
+class DeviceDisconnected(RuntimeError):
+    """O device nao voltou dentro do tempo limite."""
+
+
+class HealthMonitor:
+    """
+    Estado de conexao de um Device.
+
+    Args:
+        device: Device monitorado
+        offline_timeout: Tempo maximo que um comando espera a reconexao
+        capture_failures: Capturas vazias seguidas para considerar a conexao perdida
+        miss_streak: Buscas sem resultado seguidas antes de procurar as telas de recuperacao
+    """
+
+    def __init__(
+        self,
+        device,
+        offline_timeout: float = 60,
+        capture_failures: int = 2,
+        miss_streak: int = 5,
+        recovery_threshold: float = 0.85,
+    ):
+        self.device = device
+        self.offline_timeout = offline_timeout
+        self.capture_failures = capture_failures
+        self.miss_streak = miss_streak
+        self.recovery_threshold = recovery_threshold
+
+        self._online = threading.Event()
+        self._online.set()
+        self._lock = threading.Lock()
+        self._reconnecting = False
+        self._failed_captures = 0
+        self._misses = 0
+
+        self.disconnects = 0
+        self.recoveries = 0
+        self.last_error = ""
+        self.last_outage: Optional[float] = None
+
+    @property
+    def online(self) -> bool:
+        return self._online.is_set()
+
+    # ==================== TRANSPORTE ====================
+
+    def is_transport_error(self, result) -> bool:
+        """True se o resultado de um comando adb indica perda do device."""
+        if result.returncode == 0:
+            return False
+        stderr = result.stderr
+        if isinstance(stderr, bytes):
+            stderr = stderr.decode("utf-8", errors="ignore")
+        return bool(TRANSPORT_ERRORS.search(stderr or ""))
+
+    def observe(self, result) -> bool:
+        """
+        Registra o resultado de um comando.
+
+        Returns:
+            True se o comando chegou ao device; False se o transporte caiu
+        """
+        if self.is_transport_error(result):
+            stderr = result.stderr
+            if isinstance(stderr, bytes):
+                stderr = stderr.decode("utf-8", errors="ignore")
+            self.mark_lost(stderr.strip())
+            return False
+        return True
+
+    def observe_capture(self, raw: bytes) -> bool:
+        """
+        Registra uma captura de tela.
+
+        Returns:
+            True se a captura parece valida (PNG nao vazio)
+        """
+        if raw and raw.startswith(PNG_SIGNATURE):
+            self._failed_captures = 0
+            return True
+        self._failed_captures += 1
+        if self._failed_captures >= self.capture_failures:
+            self._failed_captures = 0
+            self.mark_lost("empty capture")
+        return False
+
+    def mark_lost(self, reason: str = ""):
+        """Marca o device como offline e inicia a reconexao em segundo plano."""
+        with self._lock:
+            self.last_error = reason
+            if self._reconnecting:
+                return
+            self._reconnecting = True
+            if self._online.is_set():
+                self.disconnects += 1
+            self._online.clear()
+        threading.Thread(
+            target=self._reconnect, name=f"reconnect-{self.device.serial}", daemon=True
+        ).start()
+
+    def _reconnect(self, initial_delay: float = 0.25, max_delay: float = 2):
+        """
+        Tenta reconectar ate `offline_timeout` (mesmo limite de wait_online).
+        Se desistir, o proximo wait_online (ou seja, o proximo comando) tenta de novo.
+        """
+        start = time.monotonic()
+        deadline = start + self.offline_timeout
+        delay = initial_delay
+        connected = False
+        try:
+            while time.monotonic() < deadline:
+                try:
+                    connected = adb_connect(self.device.serial)
+                except OSError as e:
+                    # adb ausente ou reiniciando: conta como tentativa falha
+                    self.last_error = str(e)
+                if connected:
+                    break
+                time.sleep(min(delay, max(deadline - time.monotonic(), 0)))
+                delay = min(delay * 2, max_delay)
+        finally:
+            with self._lock:
+                self._reconnecting = False
+                if connected:
+                    self.last_outage = time.monotonic() - start
+                    self._online.set()
+
+    def wait_online(self, timeout: float = None):
+        """
+        Bloqueia ate o device estar online (respeitando cancelamento da tarefa).
+
+        Raises:
+            DeviceDisconnected: Se nao reconectar dentro do tempo limite
+        """
+        if self._online.is_set():
+            return
+        deadline = time.monotonic() + (self.offline_timeout if timeout is None else timeout)
+        while not self._online.wait(0.1):
+            tasks.check_cancelled()
+            if not self._reconnecting and not self._online.is_set():
+                # A reconexao anterior desistiu: sem isso o device ficaria morto
+                self.mark_lost(self.last_error)
+            if time.monotonic() >= deadline:
+                raise DeviceDisconnected(
+                    f"{self.device.serial} offline ({self.last_error or 'no response'})"
+                )
+
+    # ==================== TELAS DE RECUPERACAO ====================
+
+    def note_match(self, found: bool, frame) -> bool:
+        """
+        Registra o resultado de uma busca; apos varias falhas seguidas, procura as
+        telas de conexao perdida do jogo no mesmo frame e toca em "recarregar".
+
+        Returns:
+            True se uma tela de recuperacao foi tratada
+        """
+        if found:
+            self._misses = 0
+            return False
+        self._misses += 1
+        if self._misses < self.miss_streak:
+            return False
+        self._misses = 0
+        return self.recover_screen(frame)
+
+    def recover_screen(self, frame) -> bool:
+        """Toca no botao de uma tela de recuperacao, se houver uma no frame."""
+        img = frame.gray if frame is not None else None
+        if img is None:
+            return False
+        for template in RECOVERY_TEMPLATES:
+            match = best_match(img, template)
+            if match is not None and match[2] >= self.recovery_threshold:
+                self.device.tap(match[0], match[1])
+                self.recoveries += 1
+                return True
+        return False
@@ -1,8 +1,13 @@
 """
 i18n - Sistema de traducao simplificado.
+
+Cada idioma e carregado sob demanda, achatado em um dict de um nivel
+('gui.buttons.create_army' -> texto) e ja mesclado com o fallback, entao
+t() e uma unica consulta de dict.
 """
 
 import json
+from typing import Dict, List, Optional
 
 from bot.settings import Settings
 
@@ -10,30 +15,65 @@ from bot.settings import Settings
 class I18n:
     """Gerenciador de traducoes."""
 
-    _translations = {}
+    _translations: Dict[str, Dict[str, str]] = {}
+    _available: Optional[List[str]] = None
     _current_language = "pt-BR"
     _fallback_language = "en-US"
 
     @classmethod
-    def load(cls):
-        """Carrega traducoes dos arquivos JSON."""
-        locales_dir = Settings.PROJECT_ROOT / Settings.LOCALES_DIR
+    def load(cls, lang: str = None) -> Dict[str, str]:
+        """
+        Carrega (uma vez) a tabela achatada de um idioma.
 
-        if not locales_dir.exists():
-            return
+        Args:
+            lang: Codigo do idioma. Padrao: idioma atual
 
-        for lang_file in locales_dir.glob("*.json"):
-            lang_code = lang_file.stem
-            try:
-                with open(lang_file, "r", encoding="utf-8") as f:
-                    cls._translations[lang_code] = json.load(f)
-            except Exception:
-                pass
+        Returns:
+            Dict chave -> traducao, ja mesclado com o idioma de fallback
+        """
+        lang = lang or cls._current_language
+        table = cls._translations.get(lang)
+        if table is not None:
+            return table
+
+        table = {}
+        if lang != cls._fallback_language:
+            table.update(cls.load(cls._fallback_language))
+        cls._flatten(cls._read(lang), "", table)
+        cls._translations[lang] = table
+        return table
+
+    @classmethod
+    def _read(cls, lang: str) -> dict:
+        """Le o JSON de um idioma (dict vazio se nao existir ou for invalido)."""
+        lang_file = Settings.PROJECT_ROOT / Settings.LOCALES_DIR / f"{lang}.json"
+        try:
+            with open(lang_file, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except Exception:
+            return {}
+        return data if isinstance(data, dict) else {}
+
+    @classmethod
+    def _flatten(cls, data: dict, prefix: str, out: Dict[str, str]):
+        """Achata dicts aninhados usando notacao de ponto."""
+        for k, value in data.items():
+            key = f"{prefix}{k}"
+            if isinstance(value, dict):
+                cls._flatten(value, f"{key}.", out)
+            elif value is not None:
+                out[key] = value
+
+    @classmethod
+    def reload(cls):
+        """Descarta as tabelas carregadas (ex: apos editar os JSON)."""
+        cls._translations = {}
+        cls._available = None
 
     @classmethod
     def set_language(cls, lang: str):
         """Define idioma atual."""
-        if lang in cls._translations:
+        if lang in cls.get_available_languages():
             cls._current_language = lang
         else:
             cls._current_language = cls._fallback_language
@@ -45,10 +85,14 @@ class I18n:
 
     @classmethod
     def get_available_languages(cls) -> list:
-        """Retorna idiomas disponiveis."""
-        if not cls._translations:
-            cls.load()
-        return list(cls._translations.keys())
+        """Retorna idiomas disponiveis (pelos nomes dos arquivos, sem ler o conteudo)."""
+        if cls._available is None:
+            locales_dir = Settings.PROJECT_ROOT / Settings.LOCALES_DIR
+            if locales_dir.exists():
+                cls._available = sorted(f.stem for f in locales_dir.glob("*.json"))
+            else:
+                cls._available = []
+        return list(cls._available)
 
     @classmethod
     def t(cls, key: str, *args, **kwargs) -> str:
@@ -62,20 +106,18 @@ class I18n:
         Returns:
             String traduzida ou a chave se nao encontrar
         """
-        if not cls._translations:
-            cls.load()
-
-        # Tenta idioma atual
-        translation = cls._get_nested(cls._translations.get(cls._current_language, {}), key)
-
-        # Fallback
-        if translation is None:
-            translation = cls._get_nested(cls._translations.get(cls._fallback_language, {}), key)
+        table = cls._translations.get(cls._current_language)
+        if table is None:
+            table = cls.load(cls._current_language)
 
+        translation = table.get(key)
         if translation is None:
             return key
 
         if args or kwargs:
+            # Sem campos nao ha o que formatar
+            if not isinstance(translation, str) or "{" not in translation:
+                return translation
             try:
                 return translation.format(*args, **kwargs)
             except Exception:
@@ -83,22 +125,6 @@ class I18n:
 
         return translation
 
-    @classmethod
-    def _get_nested(cls, dictionary: dict, key: str):
-        """Obtem valor aninhado usando notacao de ponto."""
-        keys = key.split(".")
-        value = dictionary
-
-        for k in keys:
-            if isinstance(value, dict):
-                value = value.get(k)
-                if value is None:
-                    return None
-            else:
-                return None
-
-        return value
-
 
 # Funcoes de conveniencia
 def t(key: str, *args, **kwargs) -> str:
@@ -0,0 +1,227 @@
+"""
+Minitouch - Geracao de scripts de gestos.
+Funcoes puras usadas por Device e AsyncDevice.
+"""
+
+from typing import List, Tuple
+
+# Caminho do binario no dispositivo
+MINITOUCH_REMOTE = "/data/local/tmp/minitouch"
+
+
+def to_touch(
+    sx: int, sy: int, screen: Tuple[int, int], touch: Tuple[int, int]
+) -> Tuple[int, int]:
+    """Converte coordenadas de tela para coordenadas do touch."""
+    screen_w, screen_h = screen
+    max_x, max_y = touch
+    return int((sx / screen_w) * max_x), int((sy / screen_h) * max_y)
+
+
+def parse_touch_info(output: str) -> Tuple[int, int]:
+    """Extrai (max_x, max_y) da saida de `minitouch -i`."""
+    for line in output.split("\n"):
+        if line.startswith("^"):
+            parts = line.split()
+            return int(parts[2]), int(parts[3])
+    return 32767, 32767
+
+
+def parse_touch_contacts(output: str) -> int:
+    """Extrai o numero maximo de contatos simultaneos da saida de `minitouch -i`."""
+    for line in output.split("\n"):
+        if line.startswith("^"):
+            return int(line.split()[1])
+    return 1
+
+
+def swipe_script(
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+    screen: Tuple[int, int],
+    touch: Tuple[int, int],
+    hold_ms: int = 1,
+) -> str:
+    """Script de swipe com um dedo."""
+    commands = ["r"]
+    tx1, ty1 = to_touch(x1, y1, screen, touch)
+    commands.append(f"d 0 {tx1} {ty1} 50")
+    commands.append("c")
+    commands.append(f"w {hold_ms}")
+
+    tx2, ty2 = to_touch(x2, y2, screen, touch)
+    commands.append(f"m 0 {tx2} {ty2} 50")
+    commands.append("c")
+    commands.append(f"w {hold_ms}")
+
+    commands.append("u 0")
+    commands.append("c")
+    return "\n".join(commands)
+
+
+def drag_script(
+    x1: int,
+    y1: int,
+    x2: int,
+    y2: int,
+    screen: Tuple[int, int],
+    touch: Tuple[int, int],
+    velocity: float = 600,
+    step_ms: int = 10,
+    hold_ms: int = 150,
+) -> str:
+    """
+    Arrasto com velocidade constante e parada no fim (sem "fling").
+
+    O dedo anda em passos iguais a cada `step_ms` e fica parado `hold_ms` no
+    ponto final antes de soltar, entao a inercia do jogo nao soma deslocamento.
+
+    Args:
+        velocity: Velocidade do dedo em pixels de tela por segundo
+        step_ms: Intervalo entre pontos intermediarios
+        hold_ms: Tempo parado no ponto final antes de soltar
+    """
+    distance = ((x2 - x1) ** 2 + (y2 - y1) ** 2) ** 0.5
+    steps = max(1, int(round(distance / (velocity * step_ms / 1000))))
+
+    commands = ["r"]
+    tx, ty = to_touch(x1, y1, screen, touch)
+    commands.append(f"d 0 {tx} {ty} 50")
+    commands.append("c")
+    for i in range(1, steps + 1):
+        t = i / steps
+        tx, ty = to_touch(
+            int(round(x1 + (x2 - x1) * t)), int(round(y1 + (y2 - y1) * t)), screen, touch
+        )
+        commands.append(f"w {step_ms}")
+        commands.append(f"m 0 {tx} {ty} 50")
+        commands.append("c")
+
+    commands.append(f"w {hold_ms}")
+    commands.append("u 0")
+    commands.append("c")
+    return "\n".join(commands)
+
+
+def zoom_out_script(
+    screen: Tuple[int, int], touch: Tuple[int, int], steps: int = 10, duration_ms: int = 300
+) -> str:
+    """Script de zoom out (pinch in) com dois dedos."""
+    screen_w, screen_h = screen
+    center_x, center_y = screen_w // 2, screen_h // 2
+    start_offset = min(screen_w, screen_h) // 3
+    left_x = center_x - start_offset
+    right_x = center_x + start_offset
+
+    wait_per_step = duration_ms // steps
+    commands: List[str] = ["r"]
+
+    lx, ly = to_touch(left_x, center_y, screen, touch)
+    rx, ry = to_touch(right_x, center_y, screen, touch)
+    commands.append(f"d 0 {lx} {ly} 50")
+    commands.append(f"d 1 {rx} {ry} 50")
+    commands.append("c")
+    commands.append(f"w {wait_per_step}")
+
+    for i in range(1, steps + 1):
+        progress = i / steps
+        curr_left_x = left_x + int((center_x - left_x) * progress)
+        curr_right_x = right_x - int((right_x - center_x) * progress)
+
+        lx, ly = to_touch(curr_left_x, center_y, screen, touch)
+        rx, ry = to_touch(curr_right_x, center_y, screen, touch)
+        commands.append(f"m 0 {lx} {ly} 50")
+        commands.append(f"m 1 {rx} {ry} 50")
+        commands.append("c")
+        commands.append(f"w {wait_per_step}")
+
+    commands.append("u 0")
+    commands.append("u 1")
+    commands.append("c")
+    return "\n".join(commands)
+
+
+def taps_script(
+    points: List[Tuple[int, int]],
+    screen: Tuple[int, int],
+    touch: Tuple[int, int],
+    press_ms: int = 30,
+    interval_ms: int = 50,
+) -> str:
+    """Script com varios toques em sequencia (um unico envio ao dispositivo)."""
+    commands = ["r"]
+    for x, y in points:
+        tx, ty = to_touch(x, y, screen, touch)
+        commands.append(f"d 0 {tx} {ty} 50")
+        commands.append("c")
+        commands.append(f"w {press_ms}")
+        commands.append("u 0")
+        commands.append("c")
+        commands.append(f"w {interval_ms}")
+    return "\n".join(commands)
+
+
+def deploy_script(
+    waves: List[Tuple[Tuple[int, int], List[Tuple[int, int]]]],
+    screen: Tuple[int, int],
+    touch: Tuple[int, int],
+    contacts: int = 4,
+    press_ms: int = 20,
+    interval_ms: int = 30,
+    select_ms: int = 60,
+) -> str:
+    """
+    Script unico para varias ondas de deploy.
+
+    Cada onda toca no slot da tropa e solta as unidades usando ate `contacts`
+    dedos ao mesmo tempo (um toque por dedo = uma unidade).
+
+    Args:
+        waves: Lista de (posicao do slot, pontos de deploy)
+        contacts: Dedos simultaneos por rajada
+        press_ms: Tempo com os dedos no chao
+        interval_ms: Pausa entre rajadas
+        select_ms: Pausa apos selecionar o slot
+    """
+    contacts = max(1, contacts)
+    commands = ["r"]
+    for slot, points in waves:
+        sx, sy = to_touch(slot[0], slot[1], screen, touch)
+        commands += [f"d 0 {sx} {sy} 50", "c", f"w {press_ms}", "u 0", "c", f"w {select_ms}"]
+
+        for start in range(0, len(points), contacts):
+            burst = points[start : start + contacts]
+            for contact, (x, y) in enumerate(burst):
+                tx, ty = to_touch(x, y, screen, touch)
+                commands.append(f"d {contact} {tx} {ty} 50")
+            commands += ["c", f"w {press_ms}"]
+            commands += [f"u {contact}" for contact in range(len(burst))]
+            commands += ["c", f"w {interval_ms}"]
+    return "\n".join(commands)
+
+
+def center_view_script(
+    screen: Tuple[int, int], touch: Tuple[int, int], move_right: int = 200, move_down: int = 0
+) -> str:
+    """Script unico com todos os swipes do center_view (com as pausas entre eles)."""
+    screen_w, screen_h = screen
+    center_x, center_y = screen_w // 2, screen_h // 2
+
+    # Move tudo para canto esquerdo, depois para cima, depois ajuste fino
+    swipes = [
+        (100, center_y, screen_w - 100, center_y, 200),
+        (center_x, 100, center_x, screen_h - 100, 200),
+    ]
+    if move_right > 0:
+        swipes.append((center_x, center_y, center_x - move_right, center_y, 100))
+    if move_down > 0:
+        swipes.append((center_x, center_y, center_x, center_y + move_down, 0))
+
+    parts = []
+    for x1, y1, x2, y2, pause_ms in swipes:
+        parts.append(swipe_script(x1, y1, x2, y2, screen, touch, hold_ms=200))
+        if pause_ms:
+            parts.append(f"w {pause_ms}")
+    return "\n".join(parts)
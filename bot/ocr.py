@@ -0,0 +1,190 @@
+"""
+OCR - Leitura de recursos e timers em regioes fixas da tela.
+Usa pytesseract quando disponivel; senao, usa templates de digitos em templates/digits/.
+"""
+
+import os
+import re
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from bot.frame import Frame
+from bot.settings import Settings
+from bot.vision import load_template
+
+try:
+    import pytesseract
+except ImportError:  # pragma: no cover - dependencia opcional
+    pytesseract = None
+
+# Regioes (x1, y1, x2, y2) para tela 860x732
+ROIS = {
+    "gold": (650, 18, 790, 40),
+    "elixir": (650, 62, 790, 84),
+    "dark": (680, 104, 790, 126),
+    "army_timer": (360, 92, 500, 116),
+}
+
+DIGITS_CONFIG = "--psm 7 -c tessedit_char_whitelist=0123456789"
+TIMER_CONFIG = "--psm 7 -c tessedit_char_whitelist=0123456789dhms"
+
+_cache: "OrderedDict[tuple, Optional[str]]" = OrderedDict()
+_CACHE_SIZE = 128
+
+
+@lru_cache(maxsize=1)
+def ocr_available() -> bool:
+    """True se o tesseract esta instalado e acessivel (verificado uma vez)."""
+    if pytesseract is None:
+        return False
+    if os.path.exists(Settings.TESSERACT_CMD):
+        pytesseract.pytesseract.tesseract_cmd = Settings.TESSERACT_CMD
+    try:
+        pytesseract.get_tesseract_version()
+        return True
+    except Exception:
+        return False
+
+
+def preprocess(roi, scale: int = 2):
+    """
+    Prepara o recorte para OCR: amplia e binariza.
+    O texto do jogo e claro com contorno escuro; o resultado e texto preto em fundo branco.
+    """
+    if scale > 1:
+        roi = cv2.resize(roi, None, fx=scale, fy=scale, interpolation=cv2.INTER_CUBIC)
+    _, binary = cv2.threshold(roi, 200, 255, cv2.THRESH_BINARY_INV)
+    return binary
+
+
+def parse_number(text: Optional[str]) -> Optional[int]:
+    """Extrai um inteiro de um texto (ignora separadores)."""
+    if not text:
+        return None
+    digits = re.sub(r"\D", "", text)
+    return int(digits) if digits else None
+
+
+def parse_duration(text: Optional[str]) -> Optional[int]:
+    """
+    Converte um timer do jogo em segundos.
+
+    Exemplos: "1h 23m" -> 4980, "12m5s" -> 725, "45s" -> 45
+    """
+    if not text:
+        return None
+    parts = re.findall(r"(\d+)\s*([dhms])", text.lower())
+    if not parts:
+        return None
+    units = {"d": 86400, "h": 3600, "m": 60, "s": 1}
+    return sum(int(value) * units[unit] for value, unit in parts)
+
+
+@lru_cache(maxsize=1)
+def _digit_templates() -> List[Tuple[str, np.ndarray]]:
+    """Templates de caracteres (templates/digits/0.png ... 9.png, d/h/m/s.png) binarizados."""
+    digits = []
+    for char in "0123456789dhms":
+        tmp = load_template(f"digits/{char}.png")
+        if tmp is not None:
+            digits.append((char, preprocess(tmp, scale=2)))
+    return digits
+
+
+def match_digits(binary, threshold: float = 0.8) -> Optional[str]:
+    """
+    Leitura rapida por template: encontra cada caractere e ordena por x.
+
+    Args:
+        binary: Recorte ja preprocessado
+        threshold: Limiar de correspondencia
+
+    Returns:
+        Digitos lidos ou None se nao ha templates/correspondencias
+    """
+    hits = []
+    for char, tmp in _digit_templates():
+        if tmp.shape[0] > binary.shape[0] or tmp.shape[1] > binary.shape[1]:
+            continue
+        res = cv2.matchTemplate(binary, tmp, cv2.TM_CCOEFF_NORMED)
+        ys, xs = np.where(res >= threshold)
+        for x, y in zip(xs, ys):
+            hits.append((int(x), float(res[y, x]), char, tmp.shape[1]))
+
+    if not hits:
+        return None
+    return _suppress_overlaps(hits)
+
+
+def _suppress_overlaps(hits: List[Tuple[int, float, str, int]]) -> str:
+    """
+    Supressao por x: mantem o melhor caractere em cada posicao.
+
+    Args:
+        hits: Lista de (x, score, caractere, largura do template)
+    """
+    hits = sorted(hits, key=lambda h: (h[0], -h[1]))
+    chars = []
+    last_end = -1
+    for x, score, char, width in hits:
+        if x < last_end:
+            if score > chars[-1][1]:
+                chars[-1] = (x, score, char)
+                last_end = x + width // 2
+            continue
+        chars.append((x, score, char))
+        last_end = x + width // 2
+    return "".join(c for _, _, c in chars)
+
+
+def read_text(
+    frame: Frame, region: Tuple[int, int, int, int], config: str = DIGITS_CONFIG
+) -> Optional[str]:
+    """
+    Le o texto de uma regiao do frame (cacheado por hash do frame).
+
+    Args:
+        frame: Frame capturado
+        region: Regiao (x1, y1, x2, y2)
+        config: Configuracao do tesseract
+
+    Returns:
+        Texto lido ou None
+    """
+    key = (frame.hash, tuple(region), config)
+    if key in _cache:
+        _cache.move_to_end(key)
+        return _cache[key]
+
+    roi = frame.roi(region)
+    text = None
+    if roi is not None and roi.size:
+        binary = preprocess(roi)
+        if ocr_available():
+            text = pytesseract.image_to_string(binary, config=config).strip() or None
+        if text is None:
+            text = match_digits(binary)
+
+    _cache[key] = text
+    if len(_cache) > _CACHE_SIZE:
+        _cache.popitem(last=False)
+    return text
+
+
+def read_number(frame: Frame, roi: str) -> Optional[int]:
+    """Le um numero de uma ROI conhecida (ex: 'gold')."""
+    return parse_number(read_text(frame, ROIS[roi], DIGITS_CONFIG))
+
+
+def read_resources(frame: Frame) -> Dict[str, Optional[int]]:
+    """Le ouro, elixir e elixir negro da barra de recursos."""
+    return {name: read_number(frame, name) for name in ("gold", "elixir", "dark")}
+
+
+def read_training_time(frame: Frame) -> Optional[int]:
+    """Le o timer de treino do exercito (em segundos) no menu do exercito."""
+    return parse_duration(read_text(frame, ROIS["army_timer"], TIMER_CONFIG))
@@ -0,0 +1,140 @@
+"""
+Readiness - Espera o emulador ficar pronto sem sleeps fixos.
+
+Fases, em ordem: porta TCP do ADB aberta -> `adb connect` -> sys.boot_completed
+-> launcher (alguma janela com foco). Cada fase e verificada com backoff
+exponencial e o tempo gasto em cada uma fica registrado.
+"""
+
+import re
+import socket
+import subprocess
+import sys
+import time
+from typing import Callable, Dict, Optional
+
+from bot import tasks
+from bot.settings import Settings
+
+if sys.platform == "win32":
+    _subprocess_flags = {"creationflags": subprocess.CREATE_NO_WINDOW}
+else:
+    _subprocess_flags = {}
+
+PHASES = ("tcp", "adb", "boot", "launcher")
+
+
+class ReadinessReport:
+    """Resultado da espera: fases concluidas e quanto cada uma levou."""
+
+    def __init__(self, serial: str):
+        self.serial = serial
+        self.phases: Dict[str, float] = {}
+        self.failed_phase: Optional[str] = None
+
+    @property
+    def ready(self) -> bool:
+        return self.failed_phase is None
+
+    @property
+    def total(self) -> float:
+        return sum(self.phases.values())
+
+    def __str__(self):
+        parts = [f"{name}={seconds:.1f}s" for name, seconds in self.phases.items()]
+        status = "ready" if self.ready else f"timeout in {self.failed_phase}"
+        return f"{self.serial} {status} ({', '.join(parts)}; total={self.total:.1f}s)"
+
+
+def _adb(serial: str, *args: str, timeout: float = 10) -> subprocess.CompletedProcess:
+    adb = str(Settings.get_adb_path())
+    cmd = [adb, "-s", serial, *args] if serial else [adb, *args]
+    try:
+        return subprocess.run(
+            cmd, capture_output=True, text=True, timeout=timeout, **_subprocess_flags
+        )
+    except subprocess.TimeoutExpired:
+        return subprocess.CompletedProcess(cmd, -1, "", "timeout")
+
+
+def port_open(host: str, port: int, timeout: float = 1) -> bool:
+    """True se a porta TCP aceita conexao."""
+    try:
+        with socket.create_connection((host, port), timeout=timeout):
+            return True
+    except OSError:
+        return False
+
+
+def adb_connect(serial: str) -> bool:
+    """`adb connect` + confirma que o device esta no estado 'device'."""
+    result = _adb(None, "connect", serial)
+    if "connected to" not in result.stdout:
+        return False
+    return _adb(serial, "get-state").stdout.strip() == "device"
+
+
+def boot_completed(serial: str) -> bool:
+    """True se o Android terminou o boot."""
+    return _adb(serial, "shell", "getprop", "sys.boot_completed").stdout.strip() == "1"
+
+
+def launcher_ready(serial: str) -> bool:
+    """True se alguma janela de app (launcher ou jogo) ja tem foco."""
+    result = _adb(serial, "shell", "dumpsys window | grep -E 'mCurrentFocus|mFocusedApp'")
+    return re.search(r"[\w.]+/[\w.$]+", result.stdout) is not None
+
+
+def wait_ready(
+    host: str = None,
+    port: int = None,
+    timeout: float = 180,
+    until: str = "launcher",
+    initial_delay: float = 0.25,
+    max_delay: float = 4,
+    callback: Callable[[str], None] = None,
+) -> ReadinessReport:
+    """
+    Espera o emulador passar por cada fase ate `until`.
+
+    Args:
+        host: Host do ADB (padrao: Settings.BLUESTACK_HOST)
+        port: Porta do ADB (padrao: Settings.BLUESTACK_PORT)
+        timeout: Tempo maximo total em segundos
+        until: Ultima fase exigida ("tcp", "adb", "boot" ou "launcher")
+        initial_delay: Primeiro intervalo entre verificacoes (dobra a cada falha)
+        max_delay: Intervalo maximo entre verificacoes
+        callback: Recebe uma mensagem ao fim de cada fase (opcional)
+
+    Returns:
+        ReadinessReport com a duracao de cada fase
+    """
+    host = host or Settings.BLUESTACK_HOST
+    port = port or Settings.BLUESTACK_PORT
+    serial = f"{host}:{port}"
+    checks = {
+        "tcp": lambda: port_open(host, port),
+        "adb": lambda: adb_connect(serial),
+        "boot": lambda: boot_completed(serial),
+        "launcher": lambda: launcher_ready(serial),
+    }
+
+    report = ReadinessReport(serial)
+    deadline = time.monotonic() + timeout
+
+    for phase in PHASES[: PHASES.index(until) + 1]:
+        start = time.monotonic()
+        delay = initial_delay
+        while not checks[phase]():
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                report.phases[phase] = time.monotonic() - start
+                report.failed_phase = phase
+                return report
+            tasks.sleep(min(delay, remaining))
+            delay = min(delay * 2, max_delay)
+        report.phases[phase] = time.monotonic() - start
+        if callback:
+            callback(f"[READY] {phase}: {report.phases[phase]:.1f}s")
+
+    return report
@@ -0,0 +1,141 @@
+"""
+Scroll - Rastreia o deslocamento real de barras rolaveis.
+
+Usa correlacao de fase (cv2.phaseCorrelate) na ROI da barra para medir quanto
+o conteudo andou entre dois frames. Com isso da para detectar o fim da lista
+na hora, esperar so ate a barra parar e guardar, em coordenadas "virtuais" da
+barra inteira, onde cada template ja foi visto.
+"""
+
+from typing import Dict, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from bot.frame import Frame
+
+
+class ScrollTracker:
+    """
+    Coordenadas virtuais de uma barra rolavel.
+
+    `offset` e quanto a barra ja andou desde o inicio do rastreamento (no eixo
+    da barra). Uma posicao na tela vira coordenada virtual somando o offset.
+
+    Args:
+        region: ROI da barra (x1, y1, x2, y2)
+        axis: "x" (barra horizontal) ou "y"
+        min_response: Confianca minima da correlacao; abaixo disso a tela mudou
+        still_px: Deslocamento (px) considerado "parado"
+    """
+
+    def __init__(
+        self,
+        region: Tuple[int, int, int, int],
+        axis: str = "x",
+        min_response: float = 0.05,
+        still_px: float = 1.5,
+    ):
+        self.region = tuple(region)
+        self.axis = 0 if axis == "x" else 1
+        self.min_response = min_response
+        self.still_px = still_px
+        self.offset = 0.0
+        self.at_start = False
+        self.at_end = False
+        self.seen: Dict[str, float] = {}
+        self._prev: Optional[np.ndarray] = None
+        x1, y1, x2, y2 = self.region
+        self._window = cv2.createHanningWindow((x2 - x1, y2 - y1), cv2.CV_32F)
+
+    def _roi(self, frame: Frame) -> Optional[np.ndarray]:
+        roi = frame.roi(self.region)
+        if roi is None or roi.size == 0:
+            return None
+        return np.float32(roi)
+
+    def reset(self, frame: Frame = None):
+        """Esquece posicoes e recomeca do frame informado."""
+        self.offset = 0.0
+        self.at_start = self.at_end = False
+        self.seen.clear()
+        self._prev = self._roi(frame) if frame is not None else None
+
+    def measure(self, frame: Frame) -> Optional[float]:
+        """
+        Deslocamento do conteudo desde o ultimo frame (sem atualizar o estado).
+
+        Returns:
+            Pixels que a barra avancou (positivo = conteudo foi para a esquerda/cima),
+            ou None se os frames nao sao comparaveis (outra tela)
+        """
+        cur = self._roi(frame)
+        if cur is None or self._prev is None or cur.shape != self._prev.shape:
+            return None
+        (dx, dy), response = cv2.phaseCorrelate(self._prev, cur, self._window)
+        if response < self.min_response:
+            return None
+        return -(dx if self.axis == 0 else dy)
+
+    def update(self, frame: Frame) -> Optional[float]:
+        """
+        Mede o deslocamento e atualiza o offset.
+
+        Returns:
+            Pixels avancados, ou None se a tela mudou (o rastreamento e reiniciado)
+        """
+        moved = self.measure(frame)
+        if moved is None:
+            self.reset(frame)
+            return None
+        self.offset += moved
+        self._prev = self._roi(frame)
+        return moved
+
+    def after_scroll(self, frame: Frame, requested: float) -> Optional[float]:
+        """
+        Atualiza apos um scroll de `requested` px e marca inicio/fim da lista.
+
+        Returns:
+            Pixels realmente avancados (None se a tela mudou)
+        """
+        moved = self.update(frame)
+        if moved is None:
+            return None
+        stuck = abs(moved) < self.still_px
+        if requested > 0:
+            self.at_end = stuck
+            if not stuck:
+                self.at_start = False
+        elif requested < 0:
+            self.at_start = stuck
+            if not stuck:
+                self.at_end = False
+        return moved
+
+    # ==================== COORDENADAS ====================
+
+    def to_virtual(self, pos: Tuple[int, int]) -> float:
+        """Coordenada virtual (no eixo da barra) de um ponto na tela."""
+        return pos[self.axis] + self.offset
+
+    def to_screen(self, virtual: float) -> float:
+        """Coordenada na tela de uma coordenada virtual."""
+        return virtual - self.offset
+
+    def remember(self, template: str, pos: Tuple[int, int]):
+        """Guarda onde um template foi visto."""
+        self.seen[template] = self.to_virtual(pos)
+
+    def distance_to(self, template: str) -> Optional[int]:
+        """
+        Scroll necessario para trazer um template ja visto ao centro da barra.
+
+        Returns:
+            Pixels (positivo = avancar) ou None se o template nunca foi visto
+        """
+        virtual = self.seen.get(template)
+        if virtual is None:
+            return None
+        center = (self.region[self.axis] + self.region[self.axis + 2]) / 2
+        return int(round(self.to_screen(virtual) - center))
@@ -33,6 +33,9 @@ class Settings:
     # Jogo
     GAME_PACKAGE = "com.supercell.clashofclans"
 
+    # OCR (pytesseract precisa do executavel do Tesseract)
+    TESSERACT_CMD = r"C:\Program Files\Tesseract-OCR\tesseract.exe"
+
     # Arquivos
     SCREENSHOT_FILE = "screen.png"
     TEMPLATE_DIR = "templates"
@@ -72,6 +75,18 @@ class Settings:
         cls._adb_path = Path(r"C:\android\platform-tools\adb.exe")
         return cls._adb_path
 
+    @classmethod
+    def get_ffmpeg_path(cls) -> Path:
+        """Retorna caminho do FFmpeg (usado pela captura por stream)."""
+        local = cls.PROJECT_ROOT / "resources" / "ffmpeg" / "ffmpeg.exe"
+        if local.exists():
+            return local
+
+        import shutil
+
+        ffmpeg = shutil.which("ffmpeg")
+        return Path(ffmpeg) if ffmpeg else Path("ffmpeg")
+
     @classmethod
     def get_template_path(cls, template: str) -> Path:
         """Retorna caminho completo do template."""
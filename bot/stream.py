@@ -0,0 +1,246 @@
+"""
+Stream - Captura continua via `screenrecord` (H.264) decodificado pelo FFmpeg.
+
+O video sai do device por `adb exec-out screenrecord --output-format=h264 -` e
+vai direto para o stdin do ffmpeg, que devolve frames crus em cinza. Bem mais
+rapido que `screencap -p` para loops de visao (busca de base, rolagem).
+"""
+
+import subprocess
+import sys
+import threading
+import time
+from typing import Optional, Tuple
+
+import numpy as np
+
+from bot.frame import Frame
+from bot.settings import Settings
+
+# Limite do screenrecord (Android); o stream e reiniciado ao atingir
+TIME_LIMIT = 180
+
+if sys.platform == "win32":
+    _subprocess_flags = {"creationflags": subprocess.CREATE_NO_WINDOW}
+else:
+    _subprocess_flags = {}
+
+
+class ScreenStream:
+    """
+    Stream de frames em cinza de um device.
+
+    O screenrecord so envia frames quando a tela muda; sem frames novos por
+    `max_gap` segundos, read() devolve o ultimo frame de novo. O timestamp do
+    repetido so avanca ate `agora - max_latency`: uma mudanca anterior a esse
+    instante ja teria chegado, entao um frame antigo nunca passa por posterior
+    a uma acao recente.
+
+    Args:
+        serial: Serial ADB (host:porta)
+        size: (largura, altura) da tela
+        bit_rate: Bit rate do H.264
+        latency: Atraso estimado device -> host (s), descontado do timestamp
+        max_gap: Espera maxima por um frame novo antes de repetir o ultimo
+        max_latency: Atraso maximo do encoder + decodificador (s)
+    """
+
+    def __init__(
+        self,
+        serial: str,
+        size: Tuple[int, int],
+        bit_rate: int = 8_000_000,
+        latency: float = 0.15,
+        max_gap: float = 0.25,
+        max_latency: float = 0.5,
+    ):
+        self.serial = serial
+        self.width, self.height = size
+        self.bit_rate = bit_rate
+        self.latency = latency
+        self.max_gap = max_gap
+        self.max_latency = max_latency
+        self._recorder: Optional[subprocess.Popen] = None
+        self._decoder: Optional[subprocess.Popen] = None
+        self._reader: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._cond = threading.Condition()
+        self._latest: Optional[np.ndarray] = None
+        self._latest_at = 0.0
+        self._seq = 0
+        self._read_seq = 0
+        self.frames = 0
+        self.restarts = 0
+        self.started_at = 0.0
+
+    @property
+    def running(self) -> bool:
+        return self._reader is not None and self._reader.is_alive()
+
+    @property
+    def fps(self) -> float:
+        """Frames decodificados por segundo desde o start()."""
+        elapsed = time.monotonic() - self.started_at
+        return self.frames / elapsed if self.started_at and elapsed > 0 else 0.0
+
+    def _recorder_cmd(self) -> list:
+        return [
+            str(Settings.get_adb_path()),
+            "-s",
+            self.serial,
+            "exec-out",
+            "screenrecord",
+            "--output-format=h264",
+            "--size",
+            f"{self.width}x{self.height}",
+            "--bit-rate",
+            str(self.bit_rate),
+            "--time-limit",
+            str(TIME_LIMIT),
+            "-",
+        ]
+
+    def _decoder_cmd(self) -> list:
+        return [
+            str(Settings.get_ffmpeg_path()),
+            "-loglevel",
+            "error",
+            # Sem buffer/probe: cada frame sai assim que decodificado
+            "-fflags",
+            "nobuffer",
+            "-flags",
+            "low_delay",
+            "-probesize",
+            "32",
+            "-analyzeduration",
+            "0",
+            "-f",
+            "h264",
+            "-i",
+            "pipe:0",
+            "-f",
+            "rawvideo",
+            "-pix_fmt",
+            "gray",
+            "pipe:1",
+        ]
+
+    def _spawn(self):
+        """Inicia screenrecord | ffmpeg."""
+        self._recorder = subprocess.Popen(
+            self._recorder_cmd(),
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            **_subprocess_flags,
+        )
+        try:
+            self._decoder = subprocess.Popen(
+                self._decoder_cmd(),
+                stdin=self._recorder.stdout,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                **_subprocess_flags,
+            )
+        except OSError:
+            self._kill()
+            raise
+        # O ffmpeg e o unico leitor do pipe do screenrecord
+        self._recorder.stdout.close()
+
+    def _kill(self):
+        for proc in (self._recorder, self._decoder):
+            if proc is not None and proc.poll() is None:
+                proc.kill()
+                proc.wait()
+        self._recorder = self._decoder = None
+
+    def start(self) -> "ScreenStream":
+        """
+        Inicia o stream.
+
+        Raises:
+            FileNotFoundError: Se o adb ou o ffmpeg nao foram encontrados
+        """
+        if not self.running:
+            self._stop.clear()
+            self._spawn()
+            self.started_at = time.monotonic()
+            self._reader = threading.Thread(
+                target=self._read_loop, name=f"stream-{self.serial}", daemon=True
+            )
+            self._reader.start()
+        return self
+
+    def stop(self, timeout: float = 5):
+        self._stop.set()
+        self._kill()
+        if self._reader is not None:
+            self._reader.join(timeout)
+            self._reader = None
+        with self._cond:
+            self._cond.notify_all()
+
+    def _read_frame(self, stdout, buf: bytearray) -> bool:
+        """Le exatamente um frame cru; False no fim do stream."""
+        view = memoryview(buf)
+        filled = 0
+        while filled < len(buf):
+            n = stdout.readinto(view[filled:])
+            if not n:
+                return False
+            filled += n
+        return True
+
+    def _read_loop(self):
+        frame_bytes = self.width * self.height
+        while not self._stop.is_set():
+            decoder = self._decoder
+            buf = bytearray(frame_bytes)
+            if decoder is not None and self._read_frame(decoder.stdout, buf):
+                img = np.frombuffer(buf, np.uint8).reshape(self.height, self.width)
+                with self._cond:
+                    self._latest = img
+                    self._latest_at = time.time()
+                    self._seq += 1
+                    self.frames += 1
+                    self._cond.notify_all()
+                continue
+
+            # Fim do stream (limite de tempo do screenrecord ou queda do ADB)
+            if self._stop.is_set():
+                break
+            self._kill()
+            self.restarts += 1
+            self._stop.wait(0.2 if self.restarts == 1 else 1.0)
+            if not self._stop.is_set():
+                try:
+                    self._spawn()
+                except OSError:
+                    self._stop.wait(1.0)
+
+    def read(self, timeout: float = 5) -> Optional[Frame]:
+        """
+        Proximo frame (posterior ao ultimo devolvido).
+
+        Args:
+            timeout: Espera maxima pelo primeiro frame do stream
+
+        Returns:
+            Frame em cinza ou None se o stream nao entregou nada
+        """
+        with self._cond:
+            fresh = self._cond.wait_for(
+                lambda: self._seq > self._read_seq or self._stop.is_set(), self.max_gap
+            )
+            if not fresh and self._latest is None:
+                self._cond.wait_for(
+                    lambda: self._latest is not None or self._stop.is_set(), timeout
+                )
+            if self._latest is None:
+                return None
+            timestamp = self._latest_at - self.latency
+            if self._seq == self._read_seq:
+                # Tela parada: o ultimo frame vale ate onde uma mudanca ja teria chegado
+                timestamp = max(timestamp, time.time() - self.max_latency)
+            self._read_seq = self._seq
+            return Frame(gray=self._latest, timestamp=timestamp)
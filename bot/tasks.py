@@ -0,0 +1,235 @@
+"""
+Tasks - Execucao de tarefas em segundo plano com cancelamento cooperativo.
+
+Cada chave (ex: serial do device) tem um worker e uma fila propria. O token
+da tarefa em execucao fica associado a thread do worker, entao Device e os
+fluxos de functions/ so precisam usar tasks.sleep() / tasks.check_cancelled().
+"""
+
+import queue
+import threading
+import time
+import traceback
+from typing import Callable, Dict, List, Optional
+
+_local = threading.local()
+
+
+class TaskCancelled(BaseException):
+    """
+    Levantada quando a tarefa atual foi cancelada.
+    Herda de BaseException (como asyncio.CancelledError) para atravessar os
+    `except Exception` dos fluxos.
+    """
+
+
+class CancelToken:
+    """Token de cancelamento cooperativo."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def check(self):
+        """Levanta TaskCancelled se o token foi cancelado."""
+        if self._event.is_set():
+            raise TaskCancelled()
+
+    def sleep(self, seconds: float):
+        """Dorme, mas acorda (e levanta TaskCancelled) assim que cancelado."""
+        if self._event.wait(max(seconds, 0)):
+            raise TaskCancelled()
+
+
+def current_task() -> Optional["Task"]:
+    """Tarefa em execucao na thread atual (ou None fora de um worker)."""
+    return getattr(_local, "task", None)
+
+
+def check_cancelled():
+    """Levanta TaskCancelled se a tarefa atual foi cancelada."""
+    task = current_task()
+    if task is not None:
+        task.token.check()
+
+
+def sleep(seconds: float):
+    """time.sleep() que respeita o cancelamento da tarefa atual."""
+    task = current_task()
+    if task is not None:
+        task.token.sleep(seconds)
+    else:
+        time.sleep(seconds)
+
+
+def report(message: str):
+    """Reporta progresso da tarefa atual."""
+    task = current_task()
+    if task is not None:
+        task.message = message
+        if task.runner is not None:
+            task.runner._notify(task)
+
+
+class Task:
+    """Uma tarefa enfileirada no TaskRunner."""
+
+    def __init__(self, func: Callable, name: str, key: str, then: Callable = None):
+        self.func = func
+        self.name = name
+        self.key = key
+        self.then = then
+        self.token = CancelToken()
+        self.status = "queued"
+        self.message = ""
+        self.result = None
+        self.error: Optional[BaseException] = None
+        self.traceback = ""
+        self.runner: Optional["TaskRunner"] = None
+        self._done = threading.Event()
+
+    def cancel(self):
+        self.token.cancel()
+
+    @property
+    def done(self) -> bool:
+        return self._done.is_set()
+
+    def wait(self, timeout: float = None) -> bool:
+        return self._done.wait(timeout)
+
+
+class TaskRunner:
+    """
+    Executa tarefas com um worker por chave.
+
+    Args:
+        on_update: Chamado (na thread do worker) a cada mudanca de estado/progresso
+    """
+
+    def __init__(self, on_update: Callable[[Task], None] = None):
+        self.on_update = on_update
+        self._queues: Dict[str, queue.Queue] = {}
+        self._pending: Dict[str, List[Task]] = {}
+        self._current: Dict[str, Task] = {}
+        self._lock = threading.Lock()
+
+    def submit(
+        self, func: Callable, name: str = None, key: str = "default", then: Callable = None
+    ) -> Task:
+        """
+        Enfileira uma tarefa.
+
+        Args:
+            func: Funcao sem argumentos a executar
+            name: Nome exibido no log (padrao: nome da funcao)
+            key: Fila/worker (ex: serial do device)
+            then: Tarefa a enfileirar na mesma chave se esta terminar com sucesso
+
+        Returns:
+            Task criada
+        """
+        task = Task(func, name or getattr(func, "__name__", "task"), key, then)
+        task.runner = self
+        with self._lock:
+            q = self._queues.get(key)
+            if q is None:
+                q = queue.Queue()
+                self._queues[key] = q
+                self._pending[key] = []
+                threading.Thread(
+                    target=self._worker, args=(key, q), name=f"tasks-{key}", daemon=True
+                ).start()
+            self._pending[key].append(task)
+            q.put(task)
+        self._notify(task)
+        return task
+
+    def cancel(self, key: str = None, clear_queue: bool = True):
+        """
+        Cancela a tarefa atual (e as enfileiradas) de uma chave, ou de todas.
+
+        Args:
+            key: Chave a cancelar. Se None, cancela todas
+            clear_queue: Se True, cancela tambem as tarefas ainda na fila
+        """
+        with self._lock:
+            keys = [key] if key is not None else list(self._queues)
+            for k in keys:
+                task = self._current.get(k)
+                if task is not None:
+                    task.cancel()
+                if clear_queue:
+                    for pending in self._pending.get(k, []):
+                        pending.cancel()
+
+    def current(self, key: str = None) -> Optional[Task]:
+        """Tarefa em execucao na chave (ou qualquer uma, se key for None)."""
+        with self._lock:
+            if key is not None:
+                return self._current.get(key)
+            return next(iter(self._current.values()), None)
+
+    def pending_count(self) -> int:
+        """Quantidade de tarefas ainda na fila (todas as chaves)."""
+        with self._lock:
+            return sum(len(tasks) for tasks in self._pending.values())
+
+    @property
+    def busy(self) -> bool:
+        with self._lock:
+            return bool(self._current)
+
+    def _notify(self, task: Task):
+        if self.on_update:
+            try:
+                self.on_update(task)
+            except Exception:
+                pass
+
+    def _worker(self, key: str, q: queue.Queue):
+        while True:
+            task = q.get()
+            # Sai da fila e vira a atual no mesmo bloco: um cancel() no meio
+            # sempre encontra a tarefa em _pending ou em _current
+            with self._lock:
+                self._pending[key].remove(task)
+                cancelled = task.token.cancelled
+                if not cancelled:
+                    self._current[key] = task
+
+            if cancelled:
+                task.status = "cancelled"
+                task._done.set()
+                self._notify(task)
+                continue
+
+            _local.task = task
+            task.status = "running"
+            self._notify(task)
+
+            try:
+                task.result = task.func()
+                task.status = "done"
+            except TaskCancelled:
+                task.status = "cancelled"
+            except Exception as e:
+                task.status = "failed"
+                task.error = e
+                task.traceback = traceback.format_exc()
+            finally:
+                _local.task = None
+                with self._lock:
+                    self._current.pop(key, None)
+                task._done.set()
+
+            self._notify(task)
+
+            if task.status == "done" and task.then is not None:
+                self.submit(task.then, key=key)
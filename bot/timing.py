@@ -0,0 +1,186 @@
+"""
+Timing - Perfis de tempo das transicoes da UI, aprendidos por device.
+
+Cada transicao nomeada (ex: "army.open") guarda os tempos reais ate a tela
+ficar pronta. Os atrasos fixos viram o p95 observado (com um piso), entao a
+mesma rotina fica rapida numa maquina rapida sem quebrar numa lenta.
+"""
+
+import json
+import math
+import os
+import re
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import cv2
+
+from bot.frame import Frame
+from bot.settings import Settings
+
+# Amostras mantidas por transicao
+WINDOW = 50
+# Amostras ate confiar no percentil (antes disso, mede sempre)
+MIN_SAMPLES = 5
+# Depois de aprendida, mede de novo 1 a cada N vezes para acompanhar a maquina
+MEASURE_EVERY = 10
+# Piso de seguranca dos atrasos (s)
+FLOOR = 0.1
+
+
+def frames_settled(a: Frame, b: Frame, tolerance: float = 2.0, level: int = 2) -> bool:
+    """
+    True se a tela nao mudou entre os dois frames.
+    Compara versoes reduzidas (piramide) para ignorar ruido e pequenas animacoes.
+    """
+    if a is None or b is None:
+        return False
+    img_a, img_b = a.pyramid(level), b.pyramid(level)
+    if img_a is None or img_b is None or img_a.shape != img_b.shape:
+        return False
+    return float(cv2.absdiff(img_a, img_b).mean()) <= tolerance
+
+
+def percentile(samples: List[float], q: float) -> Optional[float]:
+    """Percentil q (0-100) pelo metodo nearest-rank."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    index = max(math.ceil(q / 100 * len(ordered)) - 1, 0)
+    return ordered[min(index, len(ordered) - 1)]
+
+
+class TimingProfile:
+    """
+    Tempos observados por transicao, persistidos em config/timing/<device>.json.
+
+    Args:
+        path: Arquivo do perfil
+        floor: Piso dos atrasos (s)
+        save_interval: Intervalo minimo entre gravacoes automaticas (s)
+    """
+
+    def __init__(self, path: Path, floor: float = FLOOR, save_interval: float = 10.0):
+        self.path = Path(path)
+        self.floor = floor
+        self.save_interval = save_interval
+        self._samples: Dict[str, List[float]] = {}
+        self._calls: Dict[str, int] = {}
+        self._dirty = False
+        self._saved_at = 0.0
+        self._lock = threading.RLock()
+        self.load()
+
+    @classmethod
+    def for_device(cls, serial: str, **kwargs) -> "TimingProfile":
+        """Perfil do device (arquivo nomeado pelo serial)."""
+        name = re.sub(r"[^\w.-]", "_", serial)
+        return cls(Settings.get_config_path(f"timing/{name}.json"), **kwargs)
+
+    def load(self):
+        """Carrega as amostras gravadas (arquivo ausente/invalido = perfil vazio)."""
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        with self._lock:
+            for name, entry in data.get("transitions", {}).items():
+                samples = [float(s) for s in entry.get("samples", [])][-WINDOW:]
+                if samples:
+                    self._samples[name] = samples
+
+    def save(self) -> bool:
+        """
+        Grava o perfil (escrita atomica) com p50/p95 de cada transicao.
+
+        Returns:
+            True se havia alteracoes
+        """
+        with self._lock:
+            if not self._dirty:
+                return False
+            data = {"transitions": self.summary(include_samples=True)}
+            self._dirty = False
+            self._saved_at = time.monotonic()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(prefix=".timing.", dir=self.path.parent)
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(data, f, indent=2)
+            os.replace(tmp_path, self.path)
+        except BaseException:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return True
+
+    def record(self, name: str, seconds: float):
+        """Registra o tempo ate a tela ficar pronta numa transicao."""
+        with self._lock:
+            samples = self._samples.setdefault(name, [])
+            samples.append(round(max(seconds, 0.0), 3))
+            del samples[:-WINDOW]
+            self._dirty = True
+            due = time.monotonic() - self._saved_at >= self.save_interval
+        if due:
+            try:
+                self.save()
+            except OSError:
+                pass
+
+    def samples(self, name: str) -> List[float]:
+        with self._lock:
+            return list(self._samples.get(name, []))
+
+    def percentile(self, name: str, q: float = 95) -> Optional[float]:
+        """Percentil dos tempos observados (None sem amostras)."""
+        return percentile(self.samples(name), q)
+
+    def learned(self, name: str) -> bool:
+        """True se a transicao ja tem amostras suficientes."""
+        return len(self.samples(name)) >= MIN_SAMPLES
+
+    def should_measure(self, name: str) -> bool:
+        """
+        True se a proxima ocorrencia deve ser medida: sempre ate aprender,
+        depois 1 a cada MEASURE_EVERY.
+        """
+        with self._lock:
+            calls = self._calls.get(name, 0) + 1
+            self._calls[name] = calls
+        return not self.learned(name) or calls % MEASURE_EVERY == 0
+
+    def delay(self, name: str, default: float, floor: float = None, q: float = 95) -> float:
+        """
+        Atraso para a transicao: p95 observado com piso, ou `default` ate aprender.
+
+        Args:
+            name: Nome da transicao
+            default: Atraso fixo usado antes de haver amostras suficientes
+            floor: Piso (padrao: o do perfil)
+            q: Percentil usado
+        """
+        if not self.learned(name):
+            return default
+        return max(self.percentile(name, q), self.floor if floor is None else floor)
+
+    def summary(self, include_samples: bool = False) -> Dict[str, dict]:
+        """{transicao: {"n", "p50", "p95"[, "samples"]}}."""
+        with self._lock:
+            items = sorted((name, list(samples)) for name, samples in self._samples.items())
+        result = {}
+        for name, samples in items:
+            entry = {
+                "n": len(samples),
+                "p50": percentile(samples, 50),
+                "p95": percentile(samples, 95),
+            }
+            if include_samples:
+                entry["samples"] = samples
+            result[name] = entry
+        return result
@@ -0,0 +1,157 @@
+"""
+Vision - Reconhecimento de imagem.
+Funcoes puras compartilhadas por Device e AsyncDevice.
+"""
+
+import json
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from bot.settings import Settings
+
+
+@lru_cache(maxsize=None)
+def load_template(template: str):
+    """Carrega template em escala de cinza (cacheado por caminho)."""
+    return cv2.imread(str(Settings.get_template_path(template)), cv2.IMREAD_GRAYSCALE)
+
+
+def load_regions() -> dict:
+    """Carrega regioes dos templates."""
+    path = Settings.get_template_path("templates.json")
+    if path.exists():
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except Exception:
+            pass
+    return {}
+
+
+def template_region(template: str, regions: dict = None) -> Optional[Tuple[int, int, int, int]]:
+    """Retorna regiao de busca do template, se configurada em templates.json."""
+    regions = regions if regions is not None else load_regions()
+    meta = regions.get(template)
+    if meta and meta.get("use_region"):
+        return meta.get("region")
+    return None
+
+
+def best_match(
+    img, template: str, region: Tuple[int, int, int, int] = None
+) -> Optional[Tuple[int, int, float]]:
+    """
+    Melhor correspondencia do template, sem aplicar limiar.
+
+    Args:
+        img: Imagem (grayscale) onde buscar
+        template: Caminho do template (relativo a templates/)
+        region: Regiao para buscar (x1, y1, x2, y2)
+
+    Returns:
+        (x, y, score) do centro ou None se imagem/template invalidos
+    """
+    if img is None:
+        return None
+
+    tmp = load_template(template)
+    if tmp is None:
+        return None
+
+    search_img = img
+    offset_x, offset_y = 0, 0
+
+    if region:
+        x1, y1, x2, y2 = region
+        search_img = img[y1:y2, x1:x2]
+        offset_x, offset_y = x1, y1
+
+    res = cv2.matchTemplate(search_img, tmp, cv2.TM_CCOEFF_NORMED)
+    _, max_val, _, max_loc = cv2.minMaxLoc(res)
+
+    h, w = tmp.shape
+    x = max_loc[0] + w // 2 + offset_x
+    y = max_loc[1] + h // 2 + offset_y
+    return (x, y, float(max_val))
+
+
+def match_template(
+    img, template: str, threshold: float = 0.8, region: Tuple[int, int, int, int] = None
+) -> Optional[Tuple[int, int]]:
+    """
+    Procura template em uma imagem em escala de cinza.
+
+    Args:
+        img: Imagem (grayscale) onde buscar
+        template: Caminho do template (relativo a templates/)
+        threshold: Limiar de correspondencia
+        region: Regiao para buscar (x1, y1, x2, y2)
+
+    Returns:
+        (x, y) do centro ou None
+    """
+    match = best_match(img, template, region)
+    if match is None or match[2] < threshold:
+        return None
+    return match[0], match[1]
+
+
+def match_all(
+    img,
+    template: str,
+    threshold: float = 0.8,
+    region: Tuple[int, int, int, int] = None,
+    max_results: int = 50,
+) -> List[Tuple[int, int, float]]:
+    """
+    Procura todas as ocorrencias do template (com supressao de sobreposicoes).
+
+    Args:
+        img: Imagem (grayscale) onde buscar
+        template: Caminho do template (relativo a templates/)
+        threshold: Limiar de correspondencia
+        region: Regiao para buscar (x1, y1, x2, y2)
+        max_results: Maximo de ocorrencias retornadas
+
+    Returns:
+        Lista de (x, y, score) dos centros, do melhor para o pior
+    """
+    if img is None:
+        return []
+
+    tmp = load_template(template)
+    if tmp is None:
+        return []
+
+    search_img = img
+    offset_x, offset_y = 0, 0
+
+    if region:
+        x1, y1, x2, y2 = region
+        search_img = img[y1:y2, x1:x2]
+        offset_x, offset_y = x1, y1
+
+    h, w = tmp.shape
+    if search_img.shape[0] < h or search_img.shape[1] < w:
+        return []
+
+    res = cv2.matchTemplate(search_img, tmp, cv2.TM_CCOEFF_NORMED)
+    ys, xs = np.where(res >= threshold)
+    if len(xs) == 0:
+        return []
+
+    # Ordena por score e descarta picos dentro de outro ja aceito
+    order = np.argsort(res[ys, xs])[::-1]
+    results = []
+    for i in order:
+        x, y = int(xs[i]), int(ys[i])
+        if any(abs(x - rx) < w // 2 and abs(y - ry) < h // 2 for rx, ry, _ in results):
+            continue
+        results.append((x, y, float(res[y, x])))
+        if len(results) >= max_results:
+            break
+
+    return [(x + w // 2 + offset_x, y + h // 2 + offset_y, score) for x, y, score in results]
@@ -0,0 +1,199 @@
+"""
+VisionPool - Pool de processos para template matching.
+Os frames vao por memoria compartilhada; os workers ja tem os templates carregados.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor, wait
+from multiprocessing import resource_tracker, shared_memory
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from bot.settings import Settings
+
+# Segmentos anexados em cada worker (nome -> SharedMemory)
+_worker_segments: "OrderedDict[str, shared_memory.SharedMemory]" = OrderedDict()
+_WORKER_MAX_SEGMENTS = 32
+
+
+def list_templates() -> List[str]:
+    """Lista todos os templates (relativos a templates/)."""
+    root = Settings.get_template_path("")
+    if not root.exists():
+        return []
+    return sorted(p.relative_to(root).as_posix() for p in root.rglob("*.png"))
+
+
+def _init_worker(templates: Optional[List[str]]):
+    """Inicializa worker: uma thread do OpenCV por processo e templates em cache."""
+    import cv2
+
+    from bot.vision import load_template
+
+    # Paralelismo vem dos processos; evita disputa de threads internas do OpenCV
+    cv2.setNumThreads(1)
+    for template in templates if templates is not None else list_templates():
+        load_template(template)
+
+
+def _ping() -> int:
+    """Tarefa vazia usada para aquecer os workers."""
+    return os.getpid()
+
+
+def _attach(name: str) -> shared_memory.SharedMemory:
+    """Anexa (com cache) um segmento de memoria compartilhada."""
+    shm = _worker_segments.get(name)
+    if shm is None:
+        shm = shared_memory.SharedMemory(name=name)
+        _worker_segments[name] = shm
+        if len(_worker_segments) > _WORKER_MAX_SEGMENTS:
+            _, old = _worker_segments.popitem(last=False)
+            old.close()
+    else:
+        _worker_segments.move_to_end(name)
+    return shm
+
+
+def _match_shared(
+    name: str,
+    shape: Tuple[int, ...],
+    dtype: str,
+    template: str,
+    threshold: float,
+    region: Optional[Tuple[int, int, int, int]],
+) -> Optional[Tuple[int, int]]:
+    """Executa o matching no worker lendo o frame da memoria compartilhada."""
+    from bot.vision import match_template
+
+    shm = _attach(name)
+    img = np.ndarray(shape, dtype=dtype, buffer=shm.buf)
+    return match_template(img, template, threshold, region)
+
+
+class _FrameSlot:
+    """Buffer compartilhado reutilizado por um mesmo chamador (ex: um device)."""
+
+    def __init__(self, size: int):
+        self.shm = shared_memory.SharedMemory(create=True, size=size)
+        self.lock = threading.Lock()
+
+    def release(self):
+        self.shm.close()
+        self.shm.unlink()
+
+
+class VisionPool:
+    """
+    Pool opcional de workers de visao.
+
+    Exemplo:
+        pool = VisionPool(workers=4)
+        pool.start()
+        device = Device(vision_pool=pool)
+    """
+
+    def __init__(self, workers: int = None, templates: Iterable[str] = None):
+        self.workers = workers or os.cpu_count() or 1
+        self.templates = list(templates) if templates is not None else None
+        self._executor = None
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def start(self) -> "VisionPool":
+        """Cria os workers e espera todos ficarem prontos (templates carregados)."""
+        if self._executor is None:
+            if os.name == "posix":
+                # Workers precisam herdar o mesmo resource tracker do processo principal,
+                # senao cada um tenta "limpar" os segmentos ao encerrar
+                resource_tracker.ensure_running()
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.templates,),
+            )
+            # Uma tarefa por worker forca a criacao e o initializer de todos
+            wait([self._executor.submit(_ping) for _ in range(self.workers)])
+        return self
+
+    def shutdown(self):
+        """Encerra os workers e libera a memoria compartilhada."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        with self._lock:
+            for slot in self._slots.values():
+                slot.release()
+            self._slots.clear()
+
+    def _slot(self, key, nbytes: int) -> _FrameSlot:
+        """Retorna o buffer do chamador, recriando se o frame nao couber."""
+        with self._lock:
+            slot = self._slots.get(key)
+            if slot is not None and slot.shm.size >= nbytes:
+                return slot
+            if slot is not None:
+                with slot.lock:
+                    slot.release()
+            slot = _FrameSlot(nbytes)
+            self._slots[key] = slot
+            return slot
+
+    def submit(
+        self,
+        img,
+        template: str,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        key=None,
+    ) -> Future:
+        """
+        Envia um matching para o pool sem serializar o frame.
+
+        Args:
+            img: Imagem (grayscale) onde buscar
+            template: Caminho do template (relativo a templates/)
+            threshold: Limiar de correspondencia
+            region: Regiao para buscar (x1, y1, x2, y2)
+            key: Identificador do buffer (ex: serial do device). Padrao: thread atual
+
+        Returns:
+            Future com (x, y) do centro ou None
+        """
+        if self._executor is None:
+            self.start()
+
+        key = key if key is not None else threading.get_ident()
+        slot = self._slot(key, img.nbytes)
+        # O buffer fica travado ate o worker terminar de ler. Se ainda esta em uso
+        # (job anterior da mesma chave), usa um buffer so desta chamada em vez de
+        # bloquear: submit() roda tambem no event loop do AsyncDevice
+        if slot.lock.acquire(blocking=False):
+            release = slot.lock.release
+        else:
+            slot = _FrameSlot(img.nbytes)
+            release = slot.release
+        try:
+            np.ndarray(img.shape, dtype=img.dtype, buffer=slot.shm.buf)[:] = img
+            future = self._executor.submit(
+                _match_shared, slot.shm.name, img.shape, img.dtype.str, template, threshold, region
+            )
+        except Exception:
+            release()
+            raise
+        future.add_done_callback(lambda _: release())
+        return future
+
+    def match(
+        self,
+        img,
+        template: str,
+        threshold: float = 0.8,
+        region: Tuple[int, int, int, int] = None,
+        key=None,
+    ) -> Optional[Tuple[int, int]]:
+        """Versao bloqueante de submit()."""
+        return self.submit(img, template, threshold, region, key).result()
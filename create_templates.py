@@ -67,14 +67,13 @@ def main():
     d = AndroidDevice()
 
     print("[GRAB] Taking screenshot from emulator...")
-    screen = d.screenshot()
-
-    img = cv2.imread(screen)
-    clone = img.copy()
+    img = d.capture().bgr
 
     if img is None:
         raise RuntimeError("Failed to load screenshot")
 
+    clone = img.copy()
+
     h, w, _ = img.shape
 
     metadata = load_metadata()
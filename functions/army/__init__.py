@@ -1,11 +1,25 @@
 from functions.army.army import (
+    army_delta,
+    army_ready_in,
+    count_troops,
     create_army,
     delete_army,
+    inspect_army_menu,
     list_available_troops,
     load_army_config,
     open_army_menu,
+    read_army,
     save_army_config,
     train_army,
+    wait_army_ready,
+)
+from functions.army.army_async import (
+    create_army_async,
+    delete_army_async,
+    inspect_army_menu_async,
+    open_army_menu_async,
+    read_army_async,
+    train_army_async,
 )
 
 __all__ = [
@@ -14,6 +28,18 @@ __all__ = [
     "list_available_troops",
     "open_army_menu",
     "delete_army",
+    "inspect_army_menu",
     "create_army",
     "train_army",
+    "read_army",
+    "count_troops",
+    "army_delta",
+    "army_ready_in",
+    "wait_army_ready",
+    "open_army_menu_async",
+    "delete_army_async",
+    "inspect_army_menu_async",
+    "read_army_async",
+    "create_army_async",
+    "train_army_async",
 ]
@@ -3,13 +3,29 @@ Funcoes de gerenciamento do exercito.
 """
 
 import json
-import time
-from typing import Dict, List
+import os
+from typing import Dict, List, Optional, Tuple
 
+from bot import tasks
 from bot.device import Device
+from bot.frame import Frame
+from bot.ocr import parse_number, read_text, read_training_time
 from bot.settings import Settings
+from bot.vision import best_match, load_regions, match_all, template_region
 from functions.config import go_home
 
+# Linha de tropas do menu do exercito (tela 860x732)
+ARMY_TROOPS_REGION = (40, 255, 780, 345)
+# Rotulo "xN" acima/esquerda de cada icone, relativo ao centro do icone
+COUNT_LABEL_OFFSET = (-28, -36, 12, -14)
+
+# Categorias do menu do exercito, na ordem em que sao deletadas
+ARMY_CATEGORIES = ("castle", "machine", "spell", "troop")
+# Folga em volta das regioes do templates.json
+REGION_PADDING = 12
+# Tempo para o dialogo de confirmacao aparecer entre "deletar" e "ok"
+CONFIRM_DELAY_MS = 400
+
 
 def load_army_config() -> Dict:
     """Carrega configuracao do exercito."""
@@ -44,48 +60,196 @@ def open_army_menu(device: Device):
     if not device.image_exists("menu/army_open_true.png", threshold=0.85):
         go_home(device)
         device.tap_image("menu/bt_army.png", threshold=0.85)
-    time.sleep(0.5)
+        device.settle("army.open", 0.5, template="menu/army_open_true.png", threshold=0.85)
+
+
+def _padded_region(template: str) -> Optional[Tuple[int, int, int, int]]:
+    """Regiao do templates.json (chave = nome do arquivo) com folga."""
+    region = template_region(os.path.basename(template), load_regions())
+    if region is None:
+        return None
+    x1, y1, x2, y2 = region
+    pad = REGION_PADDING
+    return (max(x1 - pad, 0), max(y1 - pad, 0), x2 + pad, y2 + pad)
+
+
+def inspect_army_menu(
+    device, frame: Frame = None, threshold: float = 0.85
+) -> Dict[str, Optional[Tuple[int, int]]]:
+    """
+    Classifica cada categoria do menu do exercito a partir de um unico frame.
 
+    Compara o botao de deletar (delete_*) com o marcador de vazio (empty_*) na
+    mesma regiao: a categoria esta cheia se o botao vence o marcador.
 
-def delete_army(device, delete_castle: bool = True):
+    Args:
+        device: Instancia de Device
+        frame: Frame ja capturado. Se None, captura um novo
+        threshold: Limiar de correspondencia
+
+    Returns:
+        {categoria: (x, y) do botao de deletar, ou None se vazia}
+    """
+    if frame is None:
+        frame = device.capture()
+    img = frame.gray
+
+    state = {}
+    for category in ARMY_CATEGORIES:
+        delete_tpl = f"delete_army/delete_{category}.png"
+        empty_tpl = f"delete_army/empty_{category}.png"
+        delete = best_match(img, delete_tpl, _padded_region(delete_tpl))
+        empty = best_match(img, empty_tpl, _padded_region(empty_tpl))
+
+        full = delete is not None and delete[2] >= threshold
+        if full and empty is not None and empty[2] > delete[2]:
+            full = False
+        state[category] = (delete[0], delete[1]) if full else None
+    return state
+
+
+def _confirm_position() -> Optional[Tuple[int, int]]:
+    """Centro do botao "ok" do dialogo de confirmacao (posicao fixa)."""
+    region = template_region("bt_ok.png", load_regions())
+    if region is None:
+        return None
+    x1, y1, x2, y2 = region
+    return ((x1 + x2) // 2, (y1 + y2) // 2)
+
+
+def delete_army(device, delete_castle: bool = True) -> bool:
     """
     Deleta exercito atual.
 
+    Le o menu uma vez, envia todos os toques (deletar + ok) de uma vez so para
+    as categorias cheias e confirma com uma nova captura. O que sobrar cai no
+    caminho antigo, categoria por categoria.
+
     Args:
         device: Instancia de Device
         delete_castle: Se True, deleta tropas do castelo tambem
+
+    Returns:
+        True se todas as categorias pedidas ficaram vazias
     """
     open_army_menu(device)
-    time.sleep(0.5)
 
-    if delete_castle:
-        if device.tap_image("delete_army/delete_castle.png", retries=1):
-            time.sleep(0.3)
+    categories = [c for c in ARMY_CATEGORIES if delete_castle or c != "castle"]
+    state = inspect_army_menu(device)
+    full = [c for c in categories if state[c] is not None]
+    if not full:
+        return True
+
+    ok = _confirm_position()
+    if ok is not None:
+        points = []
+        for category in full:
+            points += [state[category], ok]
+        device.tap_batch(points, interval_ms=CONFIRM_DELAY_MS)
+        device.settle("army.delete", 0.5)
+
+        state = inspect_army_menu(device)
+        full = [c for c in categories if state[c] is not None]
+        if not full:
+            return True
+
+    for category in full:
+        if device.tap_image(f"delete_army/delete_{category}.png", retries=1):
+            device.settle("army.delete_one", 0.3)
             device.tap_image("menu/bt_ok.png", retries=1)
+    return all(v is None for c, v in inspect_army_menu(device).items() if c in categories)
+
 
-    if device.tap_image("delete_army/delete_machine.png", retries=1):
-        time.sleep(0.3)
-        device.tap_image("menu/bt_ok.png", retries=1)
+def read_troop_count(frame: Frame, x: int, y: int) -> Optional[int]:
+    """Le o rotulo "xN" de um icone de tropa no menu do exercito."""
+    dx1, dy1, dx2, dy2 = COUNT_LABEL_OFFSET
+    width, height = frame.size
+    region = (max(x + dx1, 0), max(y + dy1, 0), min(x + dx2, width), min(y + dy2, height))
+    return parse_number(read_text(frame, region))
 
-    if device.tap_image("delete_army/delete_spell.png", retries=1):
-        time.sleep(0.3)
-        device.tap_image("menu/bt_ok.png", retries=1)
 
-    if device.tap_image("delete_army/delete_troop.png", retries=1):
-        time.sleep(0.3)
-        device.tap_image("menu/bt_ok.png", retries=1)
+def read_army(
+    device, names: List[str], frame: Frame = None, threshold: float = 0.8
+) -> Optional[Dict[str, int]]:
+    """
+    Le as tropas prontas/em treino no menu do exercito a partir de um unico frame.
+
+    Args:
+        device: Instancia de Device
+        names: Tropas a procurar (nomes dos templates em troops/)
+        frame: Frame ja capturado. Se None, captura um novo
+        threshold: Limiar de correspondencia dos icones
+
+    Returns:
+        {nome: quantidade} ou None se o menu do exercito nao esta aberto
+        ou se algum rotulo de quantidade nao pode ser lido
+    """
+    if frame is None:
+        frame = device.capture()
+    if not device.image_exists("menu/army_open_true.png", threshold=0.85, frame=frame):
+        return None
+    if device.image_exists("delete_army/empty_troop.png", threshold=0.85, frame=frame):
+        return {}
+    return count_troops(frame, names, threshold)
+
+
+def count_troops(
+    frame: Frame, names: List[str], threshold: float = 0.8
+) -> Optional[Dict[str, int]]:
+    """
+    Soma os rotulos "xN" de cada tropa na linha de tropas do menu do exercito.
+
+    Returns:
+        {nome: quantidade} ou None se algum rotulo nao pode ser lido
+    """
+    counts = {}
+    for name in names:
+        hits = match_all(frame.gray, f"troops/{name}.png", threshold, ARMY_TROOPS_REGION, 4)
+        values = [read_troop_count(frame, x, y) for x, y, _ in hits]
+        if None in values:
+            # Sem leitura confiavel o delta treinaria quase o exercito inteiro
+            return None
+        total = sum(values)
+        if total:
+            counts[name] = total
+    return counts
+
+
+def army_delta(current: Dict[str, int], troops: List[Dict]) -> List[Dict]:
+    """
+    Unidades que faltam para completar a composicao configurada.
+
+    Args:
+        current: {nome: quantidade} lido por read_army
+        troops: Lista de {"name", "quantity"} do army.json
+
+    Returns:
+        Lista de {"name", "quantity"} so com o que falta
+    """
+    missing = []
+    for troop in troops:
+        name = troop.get("name")
+        if not name:
+            continue
+        need = troop.get("quantity", 1) - current.get(name, 0)
+        if need > 0:
+            missing.append({"name": name, "quantity": need})
+    return missing
 
 
-def create_army(device):
+def create_army(device, troops: List[Dict] = None) -> bool:
     """
     Cria exercito baseado na configuracao.
 
     Args:
         device: Instancia de Device
-        open_menu: Se True, abre menu do exercito primeiro
+        troops: Lista de {"name", "quantity"}. Se None, usa o army.json
+
+    Returns:
+        True se todas as unidades foram treinadas
     """
-    config = load_army_config()
-    troops = config.get("troops", [])
+    if troops is None:
+        troops = load_army_config().get("troops", [])
 
     if not troops:
         return False
@@ -93,9 +257,10 @@ def create_army(device):
     open_army_menu(device)
 
     device.tap_image("menu/open_troops_create.png", threshold=0.8)
-    time.sleep(1)
+    device.settle("army.train_tab", 1)
 
     scroll_pos = (750, 617)
+    complete = True
 
     for troop in troops:
         name = troop.get("name")
@@ -116,17 +281,66 @@ def create_army(device):
                 sleep=2
             )
             if not found:
+                complete = False
                 break
-            time.sleep(0.1)
+            tasks.sleep(0.1)
 
-    return True
+    return complete
 
 
-def train_army(device):
-    """Treina exercito: deleta atual e cria novo."""
+def train_army(device, mode: str = "delta"):
+    """
+    Treina exercito.
+
+    Args:
+        device: Instancia de Device
+        mode: "delta" treina so o que falta (le o menu do exercito em um frame);
+            "rebuild" deleta o exercito atual e cria tudo de novo
+    """
+    if mode == "delta":
+        troops = load_army_config().get("troops", [])
+        open_army_menu(device)
+        current = read_army(device, [t["name"] for t in troops if t.get("name")])
+        if current is not None:
+            missing = army_delta(current, troops)
+            # Se faltou espaco/tropa (ex: unidades fora da configuracao), refaz tudo
+            if not missing or create_army(device, missing):
+                device.tap_image("menu/bt_close.png", threshold=0.8)
+                return
+
     delete_army(device, delete_castle=False)
-    time.sleep(1)
+    device.settle("army.after_delete", 1)
     create_army(device)
     device.tap_image("menu/bt_close.png", threshold=0.8)
 
 
+def army_ready_in(device) -> Optional[int]:
+    """
+    Le o timer de treino no menu do exercito.
+
+    Returns:
+        Segundos ate o exercito ficar pronto, ou None se nao foi possivel ler
+        (sem timer visivel ou OCR indisponivel)
+    """
+    open_army_menu(device)
+    return read_training_time(device.capture())
+
+
+def wait_army_ready(device, margin: float = 2, max_wait: float = 3600) -> bool:
+    """
+    Espera o exercito ficar pronto usando o tempo lido na tela, em vez de polling.
+
+    Args:
+        device: Instancia de Device
+        margin: Segundos extras alem do timer lido
+        max_wait: Espera maxima (em segundos)
+
+    Returns:
+        True se esperou pelo timer, False se o timer nao pode ser lido
+    """
+    remaining = army_ready_in(device)
+    device.tap_image("menu/bt_close.png", threshold=0.8, retries=1)
+    if remaining is None:
+        return False
+    tasks.sleep(min(remaining + margin, max_wait))
+    return True
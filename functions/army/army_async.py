@@ -0,0 +1,170 @@
+"""
+Versao async das funcoes de gerenciamento do exercito.
+
+A leitura do menu (inspect_army_menu, count_troops, army_delta) e a mesma da
+versao sincrona; so a captura e os toques sao async.
+"""
+
+import asyncio
+from typing import Dict, List, Optional
+
+from functions.army.army import (
+    ARMY_CATEGORIES,
+    CONFIRM_DELAY_MS,
+    _confirm_position,
+    army_delta,
+    count_troops,
+    inspect_army_menu,
+    load_army_config,
+)
+from functions.config.config_async import go_home_async
+
+
+async def open_army_menu_async(device):
+    """Abre menu do exercito."""
+    if not await device.image_exists("menu/army_open_true.png", threshold=0.85):
+        await go_home_async(device)
+        await device.tap_image("menu/bt_army.png", threshold=0.85)
+    await asyncio.sleep(0.5)
+
+
+async def inspect_army_menu_async(device):
+    """Versao async de inspect_army_menu (captura + classificacao no executor)."""
+    frame = await device.capture()
+    return await device.offload(inspect_army_menu, None, frame)
+
+
+async def delete_army_async(device, delete_castle: bool = True) -> bool:
+    """
+    Deleta exercito atual.
+
+    Mesmo fluxo de delete_army: le o menu uma vez, envia deletar + ok das
+    categorias cheias em um unico script e confirma com uma nova captura.
+
+    Args:
+        device: Instancia de AsyncDevice
+        delete_castle: Se True, deleta tropas do castelo tambem
+
+    Returns:
+        True se todas as categorias pedidas ficaram vazias
+    """
+    await open_army_menu_async(device)
+
+    categories = [c for c in ARMY_CATEGORIES if delete_castle or c != "castle"]
+    state = await inspect_army_menu_async(device)
+    full = [c for c in categories if state[c] is not None]
+    if not full:
+        return True
+
+    ok = _confirm_position()
+    if ok is not None:
+        points = []
+        for category in full:
+            points += [state[category], ok]
+        await device.tap_batch(points, interval_ms=CONFIRM_DELAY_MS)
+        await asyncio.sleep(0.5)
+
+        state = await inspect_army_menu_async(device)
+        full = [c for c in categories if state[c] is not None]
+        if not full:
+            return True
+
+    for category in full:
+        if await device.tap_image(f"delete_army/delete_{category}.png", retries=1):
+            await asyncio.sleep(0.3)
+            await device.tap_image("menu/bt_ok.png", retries=1)
+    state = await inspect_army_menu_async(device)
+    return all(v is None for c, v in state.items() if c in categories)
+
+
+async def read_army_async(
+    device, names: List[str], threshold: float = 0.8
+) -> Optional[Dict[str, int]]:
+    """
+    Versao async de read_army (um unico frame).
+
+    Returns:
+        {nome: quantidade} ou None se o menu do exercito nao esta aberto
+        ou se algum rotulo de quantidade nao pode ser lido
+    """
+    frame = await device.capture()
+    if not await device.image_exists("menu/army_open_true.png", threshold=0.85, frame=frame):
+        return None
+    if await device.image_exists("delete_army/empty_troop.png", threshold=0.85, frame=frame):
+        return {}
+    return await device.offload(count_troops, frame, names, threshold)
+
+
+async def create_army_async(device, troops: List[Dict] = None) -> bool:
+    """
+    Cria exercito baseado na configuracao.
+
+    Args:
+        device: Instancia de AsyncDevice
+        troops: Lista de {"name", "quantity"}. Se None, usa o army.json
+
+    Returns:
+        True se todas as unidades foram treinadas
+    """
+    if troops is None:
+        troops = load_army_config().get("troops", [])
+
+    if not troops:
+        return False
+
+    await open_army_menu_async(device)
+
+    await device.tap_image("menu/open_troops_create.png", threshold=0.8)
+    await asyncio.sleep(1)
+
+    scroll_pos = (750, 617)
+    complete = True
+
+    for troop in troops:
+        name = troop.get("name")
+        quantity = troop.get("quantity", 1)
+
+        if not name:
+            continue
+
+        for _ in range(quantity):
+            found = await device.find_and_tap_with_scroll(
+                template=f"troops/{name}.png",
+                scroll_pixels=150,
+                scroll_pos=scroll_pos,
+                max_scrolls=5,
+                threshold=0.75,
+                sleep=2,
+            )
+            if not found:
+                complete = False
+                break
+            await asyncio.sleep(0.1)
+
+    return complete
+
+
+async def train_army_async(device, mode: str = "delta"):
+    """
+    Treina exercito.
+
+    Args:
+        device: Instancia de AsyncDevice
+        mode: "delta" treina so o que falta (le o menu do exercito em um frame);
+            "rebuild" deleta o exercito atual e cria tudo de novo
+    """
+    if mode == "delta":
+        troops = load_army_config().get("troops", [])
+        await open_army_menu_async(device)
+        current = await read_army_async(device, [t["name"] for t in troops if t.get("name")])
+        if current is not None:
+            missing = army_delta(current, troops)
+            # Se faltou espaco/tropa (ex: unidades fora da configuracao), refaz tudo
+            if not missing or await create_army_async(device, missing):
+                await device.tap_image("menu/bt_close.png", threshold=0.8)
+                return
+
+    await delete_army_async(device, delete_castle=False)
+    await asyncio.sleep(1)
+    await create_army_async(device)
+    await device.tap_image("menu/bt_close.png", threshold=0.8)
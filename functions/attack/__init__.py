@@ -0,0 +1,27 @@
+from functions.attack.attack import (
+    attack,
+    deploy_points,
+    find_deploy_area,
+    find_slot,
+    plan_attack,
+    slot_position,
+)
+from functions.attack.search import (
+    evaluate_loot,
+    read_loot,
+    screen_settled,
+    search_base,
+)
+
+__all__ = [
+    "find_deploy_area",
+    "deploy_points",
+    "slot_position",
+    "find_slot",
+    "plan_attack",
+    "attack",
+    "screen_settled",
+    "read_loot",
+    "evaluate_loot",
+    "search_base",
+]
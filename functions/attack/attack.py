@@ -0,0 +1,197 @@
+"""
+Funcoes de ataque: area de deploy e lancamento das tropas.
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+import cv2
+import numpy as np
+
+from bot.frame import Frame
+from bot.vision import best_match
+from functions.army import load_army_config
+
+# Regioes para tela 860x732
+FIELD_REGION = (0, 80, 860, 600)
+ATTACK_BAR_REGION = (0, 610, 860, 732)
+# Slots da barra de ataque (uma linha, layout do config_atk_layout)
+SLOT_X0 = 60
+SLOT_WIDTH = 72
+SLOT_Y = 675
+
+# Grama em HSV (OpenCV: H 0-180)
+GRASS_LOW = (30, 60, 60)
+GRASS_HIGH = (90, 255, 255)
+
+Point = Tuple[int, int]
+
+
+def _default_area() -> np.ndarray:
+    """Losango padrao no centro do campo, usado quando a deteccao falha."""
+    x1, y1, x2, y2 = FIELD_REGION
+    cx, cy = (x1 + x2) // 2, (y1 + y2) // 2
+    w, h = (x2 - x1) * 35 // 100, (y2 - y1) * 40 // 100
+    return np.array([(cx, cy - h), (cx + w, cy), (cx, cy + h), (cx - w, cy)], np.int32)
+
+
+def find_deploy_area(frame: Frame, min_area: int = 5000) -> np.ndarray:
+    """
+    Estima o contorno da base no frame de reconhecimento.
+
+    Tudo que nao e grama no campo e tratado como base; o maior bloco vira um
+    poligono convexo. As tropas devem ser soltas do lado de fora dele.
+
+    Args:
+        frame: Frame da tela de ataque
+        min_area: Area minima (px) para aceitar a deteccao
+
+    Returns:
+        Poligono convexo (N, 2) em coordenadas de tela
+    """
+    bgr = frame.bgr
+    if bgr is None:
+        return _default_area()
+
+    x1, y1, x2, y2 = FIELD_REGION
+    hsv = cv2.cvtColor(bgr[y1:y2, x1:x2], cv2.COLOR_BGR2HSV)
+    base = cv2.bitwise_not(cv2.inRange(hsv, GRASS_LOW, GRASS_HIGH))
+
+    kernel = cv2.getStructuringElement(cv2.MORPH_ELLIPSE, (9, 9))
+    base = cv2.morphologyEx(base, cv2.MORPH_OPEN, kernel)
+    base = cv2.morphologyEx(base, cv2.MORPH_CLOSE, kernel, iterations=3)
+
+    contours, _ = cv2.findContours(base, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return _default_area()
+    largest = max(contours, key=cv2.contourArea)
+    if cv2.contourArea(largest) < min_area:
+        return _default_area()
+
+    hull = cv2.convexHull(largest).reshape(-1, 2)
+    return (hull + (x1, y1)).astype(np.int32)
+
+
+def _side_of(angle: float) -> str:
+    """Lado do losango (top/right/bottom/left) de uma direcao a partir do centro."""
+    if -135 <= angle < -45:
+        return "top"
+    if -45 <= angle < 45:
+        return "right"
+    if 45 <= angle < 135:
+        return "bottom"
+    return "left"
+
+
+def deploy_points(
+    area: np.ndarray, count: int, margin: int = 25, side: str = None
+) -> List[Point]:
+    """
+    Pontos igualmente espacados ao longo da borda da area, empurrados para fora.
+
+    Args:
+        area: Poligono da base (find_deploy_area)
+        count: Quantidade de pontos
+        margin: Distancia (px) para fora da borda
+        side: Restringe a um lado ("top", "right", "bottom", "left"). None = todos
+
+    Returns:
+        Lista de (x, y) dentro do campo
+    """
+    if count <= 0 or len(area) < 3:
+        return []
+
+    poly = np.asarray(area, np.float64)
+    cx, cy = poly.mean(axis=0)
+
+    # Perimetro amostrado densamente, filtrado pelo lado pedido
+    samples = []
+    for (ax, ay), (bx, by) in zip(poly, np.roll(poly, -1, axis=0)):
+        steps = max(1, int(math.hypot(bx - ax, by - ay) // 4))
+        for i in range(steps):
+            t = i / steps
+            x, y = ax + (bx - ax) * t, ay + (by - ay) * t
+            if side is None or _side_of(math.degrees(math.atan2(y - cy, x - cx))) == side:
+                samples.append((x, y))
+    if not samples:
+        return []
+
+    fx1, fy1, fx2, fy2 = FIELD_REGION
+    points = []
+    for k in range(count):
+        x, y = samples[int((k + 0.5) * len(samples) / count)]
+        dx, dy = x - cx, y - cy
+        norm = math.hypot(dx, dy) or 1.0
+        px = min(max(x + dx / norm * margin, fx1 + 5), fx2 - 5)
+        py = min(max(y + dy / norm * margin, fy1 + 5), fy2 - 5)
+        points.append((int(round(px)), int(round(py))))
+    return points
+
+
+def slot_position(index: int) -> Point:
+    """Centro do slot `index` da barra de ataque."""
+    return (SLOT_X0 + index * SLOT_WIDTH, SLOT_Y)
+
+
+def find_slot(frame: Frame, name: str, threshold: float = 0.75) -> Optional[Point]:
+    """Slot da barra de ataque com a tropa (template troops/<name>.png)."""
+    match = best_match(frame.gray, f"troops/{name}.png", ATTACK_BAR_REGION)
+    if match is None or match[2] < threshold:
+        return None
+    return (match[0], match[1])
+
+
+def plan_attack(
+    frame: Frame, troops: List[Dict], side: str = None, margin: int = 25
+) -> List[Tuple[Point, List[Point]]]:
+    """
+    Monta as ondas de deploy (uma por tropa configurada).
+
+    Args:
+        frame: Frame de reconhecimento
+        troops: Lista de {"name", "quantity"} (army.json)
+        side: Lado da base para atacar. None = em volta da base toda
+        margin: Distancia (px) para fora da borda da base
+
+    Returns:
+        Lista de (posicao do slot, pontos de deploy)
+    """
+    area = find_deploy_area(frame)
+    waves = []
+    for index, troop in enumerate(t for t in troops if t.get("name")):
+        slot = find_slot(frame, troop["name"]) or slot_position(index)
+        points = deploy_points(area, troop.get("quantity", 1), margin, side)
+        if points:
+            waves.append((slot, points))
+    return waves
+
+
+def attack(device, side: str = None, frame: Frame = None) -> Dict[str, float]:
+    """
+    Lanca o exercito configurado na base em reconhecimento.
+
+    Todas as ondas vao em um unico script minitouch com varios dedos.
+
+    Args:
+        device: Instancia de Device
+        side: Lado da base para atacar. None = em volta da base toda
+        frame: Frame ja capturado. Se None, captura um novo
+
+    Returns:
+        {"units", "seconds", "units_per_second"}
+    """
+    if frame is None:
+        frame = device.capture()
+
+    troops = load_army_config().get("troops", [])
+    waves = plan_attack(frame, troops, side)
+    units = sum(len(points) for _, points in waves)
+    if not units:
+        return {"units": 0, "seconds": 0.0, "units_per_second": 0.0}
+
+    seconds = device.deploy(waves)
+    return {
+        "units": units,
+        "seconds": seconds,
+        "units_per_second": units / seconds if seconds > 0 else 0.0,
+    }
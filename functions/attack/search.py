@@ -0,0 +1,178 @@
+"""
+Busca de base para atacar: pula bases ate achar saque suficiente.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+import cv2
+
+from bot import tasks
+from bot.frame import Frame
+from bot.ocr import DIGITS_CONFIG, parse_number, read_text
+from bot.vision import load_template
+
+# Saque disponivel no canto superior esquerdo (tela 860x732)
+LOOT_ROIS = {
+    "gold": (48, 90, 170, 110),
+    "elixir": (48, 120, 170, 140),
+    "dark": (48, 150, 150, 170),
+}
+LOOT_PANEL = (40, 85, 180, 175)
+# Botao "Proxima" (canto inferior direito, acima da barra de tropas)
+NEXT_TEMPLATE = "attack/bt_next.png"
+NEXT_POSITION = (780, 545)
+
+
+def screen_settled(prev: Frame, frame: Frame, region=LOOT_PANEL, tolerance: float = 3.0) -> bool:
+    """
+    True se a regiao nao mudou entre os dois frames (fim da animacao das nuvens).
+
+    Args:
+        prev: Frame anterior
+        frame: Frame atual
+        region: Regiao comparada (x1, y1, x2, y2)
+        tolerance: Diferenca media maxima (0-255)
+    """
+    if prev is None or frame is None:
+        return False
+    a, b = prev.roi(region), frame.roi(region)
+    if a is None or b is None or a.shape != b.shape:
+        return False
+    return float(cv2.absdiff(a, b).mean()) <= tolerance
+
+
+def read_loot(frame: Frame, resources=None) -> Dict[str, Optional[int]]:
+    """Le o saque disponivel da base em reconhecimento."""
+    return {
+        name: parse_number(read_text(frame, LOOT_ROIS[name], DIGITS_CONFIG))
+        for name in resources or LOOT_ROIS
+    }
+
+
+def evaluate_loot(
+    frame: Frame, minimum: Dict[str, int], mode: str = "all"
+) -> Tuple[Optional[bool], Dict[str, Optional[int]]]:
+    """
+    Decide se a base serve, lendo um recurso por vez e parando assim que possivel.
+
+    Args:
+        frame: Frame da base
+        minimum: Saque minimo por recurso (ex: {"gold": 300000})
+        mode: "all" = todos os minimos; "any" = basta um
+
+    Returns:
+        (decisao, saque lido). Decisao None se nada foi lido (tela ainda carregando)
+    """
+    loot = {}
+    for name, value in minimum.items():
+        amount = parse_number(read_text(frame, LOOT_ROIS[name], DIGITS_CONFIG))
+        loot[name] = amount
+        if amount is None:
+            if not any(v is not None for v in loot.values()):
+                return None, loot
+            amount = 0
+        if mode == "all" and amount < value:
+            return False, loot
+        if mode == "any" and amount >= value:
+            return True, loot
+    return mode == "all", loot
+
+
+def _next_base(device, frame: Frame):
+    """Toca em "Proxima"; usa a posicao fixa se nao houver template."""
+    pos = None
+    if load_template(NEXT_TEMPLATE) is not None:
+        pos = device.find_template(NEXT_TEMPLATE, frame=frame)
+    device.tap(*(pos or NEXT_POSITION))
+
+
+def search_base(
+    device,
+    minimum: Dict[str, int],
+    mode: str = "all",
+    max_bases: int = 200,
+    base_timeout: float = 10,
+) -> dict:
+    """
+    Pula bases ate achar uma com o saque minimo.
+
+    Comeca na tela de reconhecimento. O pedido do proximo frame ja esta em
+    andamento enquanto o atual e avaliado; com a captura continua ligada ele vem
+    do buffer (device.latest_frame), sem um screencap por frame. Frames pedidos
+    antes do toque em "Proxima" sao descartados.
+
+    Args:
+        device: Instancia de Device
+        minimum: Saque minimo por recurso (ex: {"gold": 300000, "elixir": 300000})
+        mode: "all" = todos os minimos; "any" = basta um
+        max_bases: Maximo de bases avaliadas
+        base_timeout: Tempo maximo (s) esperando uma base carregar antes de tocar de novo
+
+    Returns:
+        {"found", "loot", "bases", "seconds", "bases_per_minute", "frame"}
+    """
+    start = time.monotonic()
+    bases = 0
+    loot: Dict[str, Optional[int]] = {}
+    found = False
+    frame = None
+
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="search-capture") as pool:
+        # time.time(): mesma base dos timestamps dos frames (min_timestamp)
+        shown_at = time.time()
+        pending = (time.time(), pool.submit(device.latest_frame, shown_at))
+        prev = last_base = None
+
+        while bases < max_bases:
+            tasks.check_cancelled()
+            started, future = pending
+            frame = future.result()
+            # Pede um frame mais novo que o atual (o buffer pode repetir o ultimo)
+            after = max(shown_at, frame.timestamp)
+            pending = (time.time(), pool.submit(device.latest_frame, after))
+
+            if started < shown_at:
+                continue  # pedido antes do toque em "Proxima"
+
+            if time.time() - shown_at > base_timeout:
+                # Base nao carregou ou o toque nao registrou: toca de novo
+                _next_base(device, frame)
+                shown_at = time.time()
+                prev = None
+                continue
+
+            if not screen_settled(prev, frame):
+                prev = frame
+                continue
+
+            if screen_settled(last_base, frame):
+                continue  # ainda e a base anterior
+
+            decision, loot = evaluate_loot(frame, minimum, mode)
+            if decision is None:
+                prev = frame
+                continue
+
+            bases += 1
+            last_base = frame
+            if decision:
+                found = True
+                break
+            _next_base(device, frame)
+            shown_at = time.time()
+            prev = None
+
+        # Descarta a captura em andamento
+        pending[1].result()
+
+    seconds = time.monotonic() - start
+    return {
+        "found": found,
+        "loot": loot,
+        "bases": bases,
+        "seconds": seconds,
+        "bases_per_minute": bases * 60 / seconds if seconds > 0 else 0.0,
+        "frame": frame,
+    }
@@ -0,0 +1,9 @@
+from functions.collect.collect import (
+    collect_resources,
+    find_collectors,
+)
+
+__all__ = [
+    "find_collectors",
+    "collect_resources",
+]
@@ -0,0 +1,60 @@
+"""
+Funcoes de coleta de recursos da vila.
+"""
+
+from typing import List, Tuple
+
+from bot import tasks
+
+COLLECT_TEMPLATES = [
+    "collect/collect_gold.png",
+    "collect/collect_elixir.png",
+    "collect/collect_dark.png",
+]
+
+
+def find_collectors(device, frame=None, threshold: float = 0.8) -> List[Tuple[int, int]]:
+    """
+    Encontra todos os baloes de coleta em um unico frame.
+
+    Args:
+        device: Instancia de Device
+        frame: Frame ja capturado. Se None, captura um novo
+        threshold: Limiar de correspondencia
+
+    Returns:
+        Lista de (x, y) dos baloes encontrados
+    """
+    if frame is None:
+        frame = device.capture()
+
+    points = []
+    for template in COLLECT_TEMPLATES:
+        points.extend(device.find_all(template, threshold=threshold, frame=frame))
+    return points
+
+
+def collect_resources(device, threshold: float = 0.8, settle: float = 0.5) -> int:
+    """
+    Coleta ouro, elixir e elixir negro da vila (ja centralizada/com zoom).
+
+    Toca todos os baloes com um unico script minitouch e confere com uma
+    unica captura no final.
+
+    Args:
+        device: Instancia de Device
+        threshold: Limiar de correspondencia
+        settle: Espera antes da captura de verificacao (em segundos)
+
+    Returns:
+        Quantidade de baloes coletados
+    """
+    points = find_collectors(device, threshold=threshold)
+    if not points:
+        return 0
+
+    device.tap_batch(points)
+    tasks.sleep(settle)
+
+    remaining = find_collectors(device, threshold=threshold)
+    return max(len(points) - len(remaining), 0)
@@ -3,9 +3,15 @@ from functions.config.config import (
     init_game,
     setup_emulator,
 )
+from functions.config.config_async import (
+    go_home_async,
+    init_game_async,
+)
 
 __all__ = [
     "go_home",
     "init_game",
     "setup_emulator",
+    "go_home_async",
+    "init_game_async",
 ]
@@ -2,13 +2,12 @@
 Funcoes de configuracao do emulador e jogo.
 """
 
-import time
-
+from bot import tasks
 from bot.settings import Settings
 from functions.vila import check_village_loaded
 
 
-def init_game(device, move_right: int = 100, move_down: int = 50):
+def init_game(device, move_right: int = 100, move_down: int = 50, open_app: bool = True):
     """
     Inicializa o jogo: abre app, zoom out, centraliza.
 
@@ -16,18 +15,18 @@ def init_game(device, move_right: int = 100, move_down: int = 50):
         device: Instancia de Device
         move_right: Pixels para mover para direita
         move_down: Pixels para mover para baixo
+        open_app: Se False, assume que o jogo ja esta aberto na vila
     """
-    device.open_app(Settings.GAME_PACKAGE)
-    for _attempt in range(10):
-        if device.image_exists("menu/bt_army.png", threshold=0.85):
-            break
-        time.sleep(5)
-
-    # Zoom out
-    device.zoom_out(steps=15, duration_ms=500)
-    time.sleep(0.5)
-    device.zoom_out(steps=15, duration_ms=500)
-    time.sleep(0.3)
+    if open_app:
+        device.open_app(Settings.GAME_PACKAGE)
+        for _attempt in range(10):
+            if device.image_exists("menu/bt_army.png", threshold=0.85):
+                break
+            tasks.sleep(5)
+
+    # Zoom out (dois pinches em uma unica execucao)
+    device.zoom_out(steps=15, duration_ms=500, repeat=2)
+    device.settle("zoom_out", 0.3)
 
     # Centraliza (so move para direita)
     device.center_view(move_right=move_right, move_down=move_down)
@@ -35,19 +34,48 @@ def init_game(device, move_right: int = 100, move_down: int = 50):
     return True
 
 
-def setup_emulator(callback=None):
+def probe_emulator(device) -> dict:
+    """
+    Verifica o estado atual do emulador sem alterar nada.
+
+    Args:
+        device: Instancia de Device
+
+    Returns:
+        Dict com "adb", "boot", "screen", "density", "game" e "village" (bool)
+    """
+    state = dict.fromkeys(("adb", "boot", "screen", "density", "game", "village"), False)
+    state["adb"] = device.is_online()
+    if not state["adb"]:
+        return state
+
+    state["boot"] = device.getprop("sys.boot_completed") == "1"
+    if not state["boot"]:
+        return state
+
+    width, height = int(Settings.TARGET_WIDTH), int(Settings.TARGET_HEIGHT)
+    device._screen_size = None
+    state["screen"] = device._get_screen_size() == (width, height)
+    state["density"] = device.get_density() == int(Settings.TARGET_DPI)
+    state["game"] = device.foreground_package() == Settings.GAME_PACKAGE
+    if state["game"]:
+        state["village"] = device.image_exists("menu/bt_army.png", threshold=0.85)
+    return state
+
+
+def setup_emulator(callback=None, boot_timeout: float = 180):
     """
-    Configura emulador completo:
-    1. Mata BlueStacks
-    2. Configura resolucao
-    3. Inicia BlueStacks
-    4. Conecta ADB
-    5. Define resolucao via ADB
-    6. Abre jogo
-    7. Verifica se vila carregou
+    Configura emulador completo, pulando as etapas que ja estao feitas:
+    1. Ajusta bluestacks.conf (mata/reinicia BlueStacks so se precisar mudar)
+    2. Conecta ADB e espera sys.boot_completed
+    3. Define resolucao/densidade via ADB (se diferentes)
+    4. Abre jogo (se nao estiver na vila)
+    5. Verifica se vila carregou
+    6. Idioma e layout de ataque (cada etapa confere a tela e so muda se preciso)
 
     Args:
         callback: Funcao para reportar progresso (opcional)
+        boot_timeout: Tempo maximo de espera pelo boot do Android
 
     Returns:
         (success, device): Tupla com resultado e instancia do Device
@@ -60,46 +88,67 @@ def setup_emulator(callback=None):
     def log(msg):
         if callback:
             callback(msg)
+        tasks.report(msg)
 
     try:
-        # 1. Mata BlueStacks
-        log("[SETUP] Encerrando BlueStacks...")
-        BlueStacks.kill()
-        time.sleep(2)
-
-        # 2. Configura resolucao
-        log("[SETUP] Configurando resolucao 860x732...")
-        BlueStacks.configure()
+        # 1. bluestacks.conf
+        if BlueStacks.configure(dry_run=True):
+            # O conf e regravado pelo emulador ao fechar: encerra antes de editar
+            log("[SETUP] Encerrando BlueStacks...")
+            BlueStacks.kill()
+            tasks.sleep(2)
+
+            log("[SETUP] Configurando resolucao 860x732...")
+            BlueStacks.configure()
+
+            log("[SETUP] Iniciando BlueStacks...")
+            report = BlueStacks.start(timeout=boot_timeout, callback=log)
+        elif not BlueStacks.validate_adb():
+            log("[SETUP] bluestacks.conf ja configurado. Iniciando BlueStacks...")
+            report = BlueStacks.start(timeout=boot_timeout, callback=log)
+        else:
+            report = None
+            log("[SETUP] bluestacks.conf ja configurado, mantendo BlueStacks aberto.")
 
-        # 3. Inicia BlueStacks
-        log("[SETUP] Iniciando BlueStacks (aguarde ~15s)...")
-        BlueStacks.start()
+        if report is not None:
+            log(f"[SETUP] {report}")
+            if not report.ready:
+                return (False, device)
 
-        # 4. Valida e conecta ADB
+        # 2. ADB + boot
         log("[SETUP] Conectando ADB...")
-        BlueStacks.validate_adb()
-        time.sleep(2)
-
-        # 5. Reconecta device
-        log("[SETUP] Reconectando dispositivo...")
         device = Device()
+        if not device.wait_boot_completed(timeout=boot_timeout):
+            log("[SETUP] ERRO: Android nao terminou o boot a tempo.")
+            return (False, device)
 
-        # 6. Define resolucao via ADB
-        log("[SETUP] Aplicando resolucao 860x732 via ADB...")
-        device.set_screen_size(860, 732)
-        device.set_density(160)
-        time.sleep(1)
-
-        # 7. Abre o jogo
-
-        log("[SETUP] Abrindo Clash of Clans...")
-        init_game(device)
+        state = probe_emulator(device)
+        log(f"[SETUP] Estado: {', '.join(k for k, v in state.items() if v) or 'nada pronto'}")
+
+        # 3. Resolucao/densidade via ADB
+        if not state["screen"] or not state["density"]:
+            log("[SETUP] Aplicando resolucao 860x732 via ADB...")
+            if not state["screen"]:
+                device.set_screen_size(int(Settings.TARGET_WIDTH), int(Settings.TARGET_HEIGHT))
+            if not state["density"]:
+                device.set_density(int(Settings.TARGET_DPI))
+            tasks.sleep(1)
+
+        # 4. Jogo
+        if state["village"]:
+            log("[SETUP] Jogo ja aberto na vila.")
+            init_game(device, open_app=False)
+        else:
+            log("[SETUP] Abrindo Clash of Clans...")
+            init_game(device)
 
-        # 9. Verifica se vila carregou
+        # 5. Verifica se vila carregou
         log("[SETUP] Verificando se vila carregou...")
         if check_village_loaded(device):
-            config_language(device)
-            config_atk_layout(device)
+            # 6. Idioma e layout de ataque
+            for step, func in (("language", config_language), ("atk_layout", config_atk_layout)):
+                log(f"[SETUP] Configurando {step}...")
+                func(device)
             log("[SETUP] Vila detectada! Configuracao concluida com sucesso.")
             return (True, device)
         else:
@@ -111,14 +160,15 @@ def setup_emulator(callback=None):
         return (False, device)
 
 
-def go_home(device, max_presses: int = 10, delay: float = 1):
+def go_home(device, max_presses: int = 10, delay: float = None):
     """
     Retorna para a pagina home do jogo pressionando ESC consecutivamente.
     
     Args:
         device: Instancia de Device
         max_presses: Numero maximo de vezes para pressionar ESC
-        delay: Delay entre cada pressionamento (em segundos)
+        delay: Delay extra entre pressionamentos (em segundos). Padrao: nenhum,
+            o settle do BACK ja espera o tempo aprendido
     
     Returns:
         True se executou com sucesso
@@ -129,46 +179,63 @@ def go_home(device, max_presses: int = 10, delay: float = 1):
         return True
     for i in range(max_presses):
         device.keyevent(KEYCODE_BACK)
-        time.sleep(0.5)
-        if device.image_exists("menu/bt_army.png", threshold=0.85):
+        # Um frame por iteracao, compartilhado pelas duas verificacoes
+        frame = device.settle("back", 0.5) or device.capture()
+        if device.image_exists("menu/bt_army.png", threshold=0.85, frame=frame):
             return True
-        if device.image_exists("menu/bt_cancel.png", threshold=0.85):
-            device.tap_image("menu/bt_cancel.png", threshold=0.85)
+        cancel = device.find_template("menu/bt_cancel.png", threshold=0.85, frame=frame)
+        if cancel:
+            device.tap(*cancel)
             return True
-        time.sleep(delay)
+        if delay:
+            tasks.sleep(delay)
     return False
 
 
-def config_atk_layout(device):
+# Posicao final do controle de tamanho da barra de tropas (tela 860x732)
+BAR_SIZE_TARGET = (115, 472)
+
+
+def config_atk_layout(device, tolerance: int = 15):
     """
     Configura layout de ataque para padrao.
+    Se o controle de tamanho da barra ja esta na posicao final, nao arrasta nada.
 
     Args:
         device: Instancia de Device
+        tolerance: Distancia maxima (px) do controle ate a posicao final
     """
     go_home(device)
     device.tap_image("menu/bt_config.png", threshold=0.85)
-    time.sleep(1)
+    device.settle("config.open", 1)
     repet = 3
     device.tap_image("menu/more_settings.png", threshold=0.85)
     for _ in range(repet):
         if device.image_exists("menu/ajust_bar_size.png", threshold=0.85):
             device.tap_image("menu/ajust_bar_size.png", threshold=0.85)
-            time.sleep(1)
+            device.settle("config.bar_size", 1)
+            slider = device.find_template("menu/bt_bar_size.png", threshold=0.85)
+            target_x, target_y = BAR_SIZE_TARGET
+            if (
+                slider
+                and abs(slider[0] - target_x) <= tolerance
+                and abs(slider[1] - target_y) <= tolerance
+            ):
+                go_home(device)
+                return True
             device.drag_from_image(
                 template="menu/bt_bar_size.png",
-                target_x=115,
-                target_y=472,
+                target_x=target_x,
+                target_y=target_y,
                 threshold=0.85,
                 hold_ms=300
             )
-            time.sleep(1)
+            device.settle("config.bar_drag", 1)
             # device.tap_image("menu/bt_bar_size_no_two_rows.png", threshold=0.85)
-            time.sleep(1)
             go_home(device)
             return True
         device.scroll_vertical(50)
-        time.sleep(1)
+        device.settle("config.scroll", 1)
     return False
 
 
@@ -182,12 +249,12 @@ def config_language(device):
 
     go_home(device)
     device.tap_image("menu/bt_config.png", threshold=0.85)
-    time.sleep(1)
+    device.settle("config.open", 1)
     if device.image_exists("menu/english_ok.png", threshold=0.85):
         go_home(device)
         return True
     device.tap_image("menu/bt_language.png", threshold=0.85)
-    time.sleep(1)
+    device.settle("config.language", 1)
     if not device.image_exists("menu/bt_english.png", threshold=0.85):
         repet = 3
         for _ in range(repet):
@@ -198,11 +265,11 @@ def config_language(device):
                 threshold=0.85,
                 hold_ms=300
             )
-            time.sleep(0.5)
+            device.settle("config.language_drag", 0.5)
             if device.image_exists("menu/bt_english.png", threshold=0.85):
                 break
     device.tap_image("menu/bt_english.png", threshold=0.85)
-    time.sleep(1)
+    device.settle("config.english", 1)
     device.tap_image("menu/bt_ok_all.png", threshold=0.85)
     go_home(device)
     return True
\ No newline at end of file
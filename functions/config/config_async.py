@@ -0,0 +1,55 @@
+"""
+Versao async das funcoes de configuracao do jogo.
+"""
+
+import asyncio
+
+from bot.settings import Settings
+
+
+async def init_game_async(device, move_right: int = 100, move_down: int = 50):
+    """
+    Inicializa o jogo: abre app, zoom out, centraliza.
+
+    Args:
+        device: Instancia de AsyncDevice
+        move_right: Pixels para mover para direita
+        move_down: Pixels para mover para baixo
+    """
+    await device.open_app(Settings.GAME_PACKAGE)
+    await device.wait_for("menu/bt_army.png", timeout=50, interval=5, threshold=0.85)
+
+    await device.zoom_out(steps=15, duration_ms=500)
+    await asyncio.sleep(0.5)
+    await device.zoom_out(steps=15, duration_ms=500)
+    await asyncio.sleep(0.3)
+
+    await device.center_view(move_right=move_right, move_down=move_down)
+
+    return True
+
+
+async def go_home_async(device, max_presses: int = 10, delay: float = 1):
+    """
+    Retorna para a pagina home do jogo pressionando ESC consecutivamente.
+
+    Args:
+        device: Instancia de AsyncDevice
+        max_presses: Numero maximo de vezes para pressionar ESC
+        delay: Delay entre cada pressionamento (em segundos)
+
+    Returns:
+        True se executou com sucesso
+    """
+    KEYCODE_BACK = 4
+    if await device.image_exists("menu/bt_army.png", threshold=0.85):
+        return True
+    for _ in range(max_presses):
+        await device.keyevent(KEYCODE_BACK)
+        await asyncio.sleep(0.5)
+        if await device.image_exists("menu/bt_army.png", threshold=0.85):
+            return True
+        if await device.tap_image("menu/bt_cancel.png", threshold=0.85, retries=1, delay=0):
+            return True
+        await asyncio.sleep(delay)
+    return False
@@ -1,8 +1,18 @@
 from functions.donate.donate import (
     close_chat,
     donate_castle,
+    donate_window_open,
+    find_requests,
     open_chat,
+    plan_donation,
     request_castle,
+    requested_troops,
+)
+from functions.donate.donate_async import (
+    close_chat_async,
+    donate_castle_async,
+    open_chat_async,
+    request_castle_async,
 )
 
 __all__ = [
@@ -10,4 +20,12 @@ __all__ = [
     "close_chat",
     "donate_castle",
     "request_castle",
+    "find_requests",
+    "requested_troops",
+    "plan_donation",
+    "donate_window_open",
+    "open_chat_async",
+    "close_chat_async",
+    "donate_castle_async",
+    "request_castle_async",
 ]
@@ -2,23 +2,44 @@
 Funcoes de doacao e solicitacao de tropas.
 """
 
-import time
+from typing import List, Optional, Tuple
 
-from functions.army import open_army_menu
+from bot.frame import Frame
+from bot.scroll import ScrollTracker
+from bot.vision import best_match, match_all
+from functions.army import list_available_troops, load_army_config, open_army_menu
 from functions.config import go_home
 
+# Botoes genericos da janela de doacao (quando a tropa pedida nao e reconhecida)
+GENERIC_DONATE_TEMPLATES = [
+    "donate/select_super_troop_donate.png",
+    "donate/select_spell_donate.png",
+    "donate/select_troop_donate.png",
+]
+
+# Regioes para tela 860x732
+CHAT_REGION = (0, 60, 340, 732)
+DONATE_WINDOW_REGION = (320, 60, 860, 732)
+# Linha do pedido: faixa acima do botao "Doar", ate a borda esquerda do chat
+REQUEST_ROW_HEIGHT = 80
+
+KEYCODE_BACK = 4
+
 
 def open_chat(device):
     """Abre chat."""
-    if device.image_exists("menu/bt_chat.png", threshold=0.85):
-        device.tap_image("menu/bt_chat.png", threshold=0.85)
+    frame = device.capture()
+    pos = device.find_template("menu/bt_chat.png", threshold=0.85, frame=frame)
+    if pos:
+        device.tap(*pos)
         return True
-    if device.image_exists("menu/bt_close_chat.png", threshold=0.85):
+    if device.image_exists("menu/bt_close_chat.png", threshold=0.85, frame=frame):
         return True
 
     if go_home(device):
-        if device.image_exists("menu/bt_chat.png", threshold=0.85):
-            device.tap_image("menu/bt_chat.png", threshold=0.85)
+        pos = device.find_template("menu/bt_chat.png", threshold=0.85)
+        if pos:
+            device.tap(*pos)
             return True
 
     return False
@@ -29,36 +50,163 @@ def close_chat(device):
     device.tap_image("menu/bt_close_chat.png", threshold=0.85)
 
 
-def donate_castle(device) -> int:
+def find_requests(frame: Frame, threshold: float = 0.85) -> List[Tuple[int, int]]:
+    """Botoes "Doar" visiveis no chat, de cima para baixo."""
+    hits = match_all(frame.gray, "donate/donate_castle.png", threshold, CHAT_REGION)
+    return sorted(((x, y) for x, y, _ in hits), key=lambda pos: pos[1])
+
+
+def requested_troops(
+    frame: Frame, button: Tuple[int, int], names: List[str], threshold: float = 0.75
+) -> List[str]:
+    """
+    Tropas cujos icones aparecem na linha do pedido (acima do botao "Doar").
+
+    Args:
+        frame: Frame do chat aberto
+        button: Posicao do botao "Doar" do pedido
+        names: Tropas conhecidas (templates em troops/)
+        threshold: Limiar de correspondencia
+
+    Returns:
+        Nomes das tropas pedidas, do melhor match para o pior
+    """
+    x, y = button
+    region = (CHAT_REGION[0], max(y - REQUEST_ROW_HEIGHT, 0), x, y)
+    scored = []
+    for name in names:
+        match = best_match(frame.gray, f"troops/{name}.png", region)
+        if match is not None and match[2] >= threshold:
+            scored.append((match[2], name))
+    return [name for _, name in sorted(scored, reverse=True)]
+
+
+def plan_donation(
+    frame: Frame,
+    wanted: List[str],
+    units: int = 5,
+    threshold: float = 0.8,
+) -> List[Tuple[int, int]]:
+    """
+    Monta a lista de toques para um pedido a partir de um frame da janela de doacao.
+
+    Args:
+        frame: Frame com a janela de doacao aberta
+        wanted: Tropas pedidas (ou preferidas), em ordem
+        units: Toques por tropa (toques alem da capacidade sao ignorados pelo jogo)
+        threshold: Limiar de correspondencia
+
+    Returns:
+        Lista de (x, y) a tocar, em ordem
+    """
+    img = frame.gray
+    for name in wanted:
+        match = best_match(img, f"troops/{name}.png", DONATE_WINDOW_REGION)
+        if match is not None and match[2] >= threshold:
+            return [(match[0], match[1])] * units
+
+    # Sem tropa reconhecida: usa os botoes genericos (super tropa, feitico, tropa)
+    for template in GENERIC_DONATE_TEMPLATES:
+        match = best_match(img, template, DONATE_WINDOW_REGION)
+        if match is not None and match[2] >= threshold:
+            return [(match[0], match[1])] * units
+    return []
+
+
+def donate_window_open(frame: Frame, threshold: float = 0.8) -> bool:
+    """Se a janela de doacao ainda aparece no frame (algum botao generico visivel)."""
+    for template in GENERIC_DONATE_TEMPLATES:
+        match = best_match(frame.gray, template, DONATE_WINDOW_REGION)
+        if match is not None and match[2] >= threshold:
+            return True
+    return False
+
+
+def donate_castle(device, units_per_request: int = 5, max_requests: int = 10) -> int:
     """
-    Doa tropas para o castelo do cla.
+    Doa tropas para os pedidos visiveis no chat do cla.
+
+    Cada pedido e lido em um frame (tropas pedidas na linha do pedido) e a
+    janela de doacao em outro; todos os toques do pedido vao em um unico gesto.
+    Os pedidos sao detectados de novo a cada doacao e os ja atendidos sao
+    identificados pela posicao corrigida pelo deslocamento do chat (correlacao
+    de fase), entao mensagens novas nao causam doacao repetida.
+
+    Args:
+        device: Instancia de Device
+        units_per_request: Toques por pedido
+        max_requests: Maximo de pedidos atendidos por chamada
 
     Returns:
-        Quantidade de doacoes realizadas
+        Quantidade de doacoes (toques) realizadas
     """
     open_chat(device)
-    device.tap_image("donate/donate_castle.png", threshold=0.85)
-    time.sleep(2)
+    device.settle("chat.open", 0.5)
+
+    config = load_army_config()
+    preferred = [t["name"] for t in config.get("troops", []) if t.get("name")]
+    names = list_available_troops()
 
     donation_count = 0
-    while True:
-        if device.tap_image("donate/select_super_troop_donate.png", threshold=0.85, retries=1):
-            donation_count += 1
-        elif device.tap_image("donate/select_spell_donate.png", threshold=0.85, retries=1):
-            donation_count += 1
-        elif device.tap_image("donate/select_troop_donate.png", threshold=0.85, retries=1):
-            donation_count += 1
-        else:
+    handled: List[float] = []
+    tracker = ScrollTracker(CHAT_REGION, axis="y")
+    for index in range(max_requests):
+        frame = device.capture()
+        if index == 0:
+            tracker.reset(frame)
+        elif tracker.update(frame) is None:
+            # Chat mudou demais para reconhecer os pedidos ja atendidos
             break
-        time.sleep(0.5)
+        button = _next_request(find_requests(frame), handled, tracker.offset)
+        if button is None:
+            break
+
+        # Tropas do exercito configurado so quando o pedido nao diz o que quer
+        wanted = requested_troops(frame, button, names) or preferred
+        device.tap(*button)
+        device.settle("donate.window", 0.5)
+
+        taps = plan_donation(device.capture(), wanted, units_per_request)
+        if taps:
+            device.tap_batch(taps, interval_ms=80)
+            donation_count += len(taps)
+        # Cada pedido e atendido uma vez por chamada (mesmo se ainda couber mais)
+        handled.append(button[1] + tracker.offset)
+
+        # O jogo fecha a janela quando o pedido enche; BACK so se ela continua
+        # aberta (sem a janela, BACK poderia fechar o chat)
+        if donate_window_open(device.capture()):
+            device.keyevent(KEYCODE_BACK)
+            device.settle("donate.close", 0.3)
 
     return donation_count
 
 
+def _next_request(
+    buttons: List[Tuple[int, int]],
+    handled: List[float],
+    offset: float = 0.0,
+    tolerance: int = 10,
+) -> Optional[Tuple[int, int]]:
+    """
+    Primeiro pedido (de cima para baixo) ainda nao atendido.
+
+    Args:
+        buttons: Botoes de doar visiveis
+        handled: y dos pedidos atendidos, em coordenada virtual (y + offset)
+        offset: Deslocamento atual do chat desde o primeiro frame
+        tolerance: Distancia maxima (px) para considerar o mesmo pedido
+    """
+    for button in buttons:
+        if all(abs(button[1] + offset - y) > tolerance for y in handled):
+            return button
+    return None
+
+
 def request_castle(device):
     """Solicita tropas do castelo."""
     open_army_menu(device)
     device.tap_image("donate/request_castle.png", threshold=0.85)
-    time.sleep(2)
+    device.settle("castle.request", 2, template="donate/send_troops.png", threshold=0.85)
     device.tap_image("donate/send_troops.png", threshold=0.85)
-    time.sleep(1)
+    device.settle("castle.send", 1)
@@ -0,0 +1,108 @@
+"""
+Versao async das funcoes de doacao e solicitacao de tropas.
+
+Deteccao dos pedidos e planejamento dos toques sao os mesmos da versao
+sincrona (find_requests, requested_troops, plan_donation), rodando no executor.
+"""
+
+import asyncio
+from typing import List
+
+from bot.scroll import ScrollTracker
+from functions.army.army import list_available_troops, load_army_config
+from functions.army.army_async import open_army_menu_async
+from functions.config.config_async import go_home_async
+from functions.donate.donate import (
+    CHAT_REGION,
+    KEYCODE_BACK,
+    _next_request,
+    donate_window_open,
+    find_requests,
+    plan_donation,
+    requested_troops,
+)
+
+
+async def open_chat_async(device):
+    """Abre chat."""
+    if await device.tap_image("menu/bt_chat.png", threshold=0.85, retries=1, delay=0):
+        return True
+    if await device.image_exists("menu/bt_close_chat.png", threshold=0.85):
+        return True
+
+    if await go_home_async(device):
+        if await device.tap_image("menu/bt_chat.png", threshold=0.85, retries=1, delay=0):
+            return True
+
+    return False
+
+
+async def close_chat_async(device):
+    """Fecha chat."""
+    await device.tap_image("menu/bt_close_chat.png", threshold=0.85)
+
+
+async def donate_castle_async(
+    device, units_per_request: int = 5, max_requests: int = 10
+) -> int:
+    """
+    Doa tropas para os pedidos visiveis no chat do cla.
+
+    Mesmo fluxo de donate_castle: um frame por pedido, todos os toques do
+    pedido em um unico script e pedidos ja atendidos seguidos pelo
+    deslocamento do chat.
+
+    Args:
+        device: Instancia de AsyncDevice
+        units_per_request: Toques por pedido
+        max_requests: Maximo de pedidos atendidos por chamada
+
+    Returns:
+        Quantidade de doacoes (toques) realizadas
+    """
+    await open_chat_async(device)
+    await asyncio.sleep(0.5)
+
+    config = load_army_config()
+    preferred = [t["name"] for t in config.get("troops", []) if t.get("name")]
+    names = list_available_troops()
+
+    donation_count = 0
+    handled: List[float] = []
+    tracker = ScrollTracker(CHAT_REGION, axis="y")
+    for index in range(max_requests):
+        frame = await device.capture()
+        if index == 0:
+            tracker.reset(frame)
+        elif tracker.update(frame) is None:
+            break
+        buttons = await device.offload(find_requests, frame)
+        button = _next_request(buttons, handled, tracker.offset)
+        if button is None:
+            break
+
+        wanted = await device.offload(requested_troops, frame, button, names) or preferred
+        await device.tap(*button)
+        await asyncio.sleep(0.5)
+
+        window = await device.capture()
+        taps = await device.offload(plan_donation, window, wanted, units_per_request)
+        if taps:
+            await device.tap_batch(taps, interval_ms=80)
+            donation_count += len(taps)
+        handled.append(button[1] + tracker.offset)
+
+        if await device.offload(donate_window_open, await device.capture()):
+            await device.keyevent(KEYCODE_BACK)
+            await asyncio.sleep(0.3)
+
+    return donation_count
+
+
+async def request_castle_async(device):
+    """Solicita tropas do castelo."""
+    await open_army_menu_async(device)
+    await device.tap_image("donate/request_castle.png", threshold=0.85)
+    await asyncio.sleep(2)
+    await device.tap_image("donate/send_troops.png", threshold=0.85)
+    await asyncio.sleep(1)
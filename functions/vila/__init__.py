@@ -1,7 +1,11 @@
 from functions.vila.vila import (
     check_village_loaded,
 )
+from functions.vila.vila_async import (
+    check_village_loaded_async,
+)
 
 __all__ = [
     "check_village_loaded",
+    "check_village_loaded_async",
 ]
@@ -2,7 +2,7 @@
 Funcoes relacionadas a vila.
 """
 
-import time
+from bot import tasks
 
 
 def check_village_loaded(device, retries: int = 5) -> bool:
@@ -21,7 +21,7 @@ def check_village_loaded(device, retries: int = 5) -> bool:
         pos = device.find_template("menu/bt_army.png", threshold=0.7)
         if pos:
             return True
-        time.sleep(2)
+        tasks.sleep(2)
 
     # Tenta encontrar botao de ataque como alternativa
     pos = device.find_template("menu/bt_atk.png", threshold=0.7)
@@ -0,0 +1,24 @@
+"""
+Versao async das funcoes relacionadas a vila.
+"""
+
+import asyncio
+
+
+async def check_village_loaded_async(device, retries: int = 5) -> bool:
+    """
+    Verifica se a vila carregou procurando elementos do menu.
+
+    Args:
+        device: Instancia de AsyncDevice
+        retries: Numero de tentativas
+
+    Returns:
+        True se vila carregou, False caso contrario
+    """
+    for _ in range(retries):
+        if await device.find_template("menu/bt_army.png", threshold=0.7):
+            return True
+        await asyncio.sleep(2)
+
+    return await device.find_template("menu/bt_atk.png", threshold=0.7) is not None
@@ -0,0 +1,94 @@
+from functions.army import army_delta
+
+
+def test_army_delta_only_returns_missing_units():
+    troops = [
+        {"name": "gg", "quantity": 2},
+        {"name": "corredor", "quantity": 4},
+        {"name": "mago", "quantity": 3},
+        {"quantity": 1},
+    ]
+    current = {"gg": 2, "corredor": 1, "dragao": 5}
+
+    assert army_delta(current, troops) == [
+        {"name": "corredor", "quantity": 3},
+        {"name": "mago", "quantity": 3},
+    ]
+    assert army_delta({"gg": 3, "corredor": 4, "mago": 3}, troops) == []
+
+
+
+def test_inspect_army_menu_classifies_from_one_frame():
+    import numpy as np
+
+    from bot.frame import Frame
+    from bot.vision import load_regions, load_template
+    from functions.army import inspect_army_menu
+
+    img = np.full((732, 860), 40, np.uint8)
+    regions = load_regions()
+    for name in ("delete_troop", "empty_spell", "empty_machine", "delete_castle"):
+        tmp = load_template(f"delete_army/{name}.png")
+        x1, y1 = regions[f"{name}.png"]["region"][:2]
+        img[y1 : y1 + tmp.shape[0], x1 : x1 + tmp.shape[1]] = tmp
+
+    state = inspect_army_menu(None, Frame(gray=img))
+
+    assert state["troop"] is not None and state["castle"] is not None
+    assert state["spell"] is None and state["machine"] is None
+
+
+def test_read_army_gives_up_when_counts_are_unreadable(monkeypatch):
+    import numpy as np
+
+    from bot.frame import Frame
+    from bot.vision import load_template
+    from functions.army import army, read_army
+
+    img = np.full((732, 860), 40, np.uint8)
+    tmp = load_template("troops/corredor.png")
+    img[270 : 270 + tmp.shape[0], 100 : 100 + tmp.shape[1]] = tmp
+
+    class FakeDevice:
+        def image_exists(self, template, threshold=0.8, region=None, frame=None):
+            return template == "menu/army_open_true.png"
+
+    monkeypatch.setattr(army, "read_text", lambda frame, region: None)
+    assert read_army(FakeDevice(), ["corredor"], Frame(gray=img)) is None
+
+    monkeypatch.setattr(army, "read_text", lambda frame, region: "x3")
+    assert read_army(FakeDevice(), ["corredor"], Frame(gray=img)) == {"corredor": 3}
+
+
+def test_delete_army_async_batches_full_categories(monkeypatch):
+    import asyncio
+
+    from functions.army import army_async
+
+    states = [
+        {"castle": (100, 200), "machine": None, "spell": (300, 200), "troop": (400, 200)},
+        {"castle": (100, 200), "machine": None, "spell": None, "troop": None},
+    ]
+
+    class FakeDevice:
+        batches = []
+
+        async def capture(self):
+            return None
+
+        async def offload(self, func, *args):
+            return states.pop(0)
+
+        async def tap_batch(self, points, interval_ms=50):
+            self.batches.append(points)
+
+    async def no_wait(_):
+        return None
+
+    monkeypatch.setattr(army_async, "open_army_menu_async", no_wait)
+    monkeypatch.setattr(army_async.asyncio, "sleep", no_wait)
+    monkeypatch.setattr(army_async, "_confirm_position", lambda: (430, 470))
+
+    device = FakeDevice()
+    assert asyncio.run(army_async.delete_army_async(device, delete_castle=False))
+    assert device.batches == [[(300, 200), (430, 470), (400, 200), (430, 470)]]
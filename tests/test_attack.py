@@ -0,0 +1,38 @@
+import cv2
+import numpy as np
+
+from bot.frame import Frame
+from bot.minitouch import deploy_script
+from functions.attack import deploy_points, find_deploy_area
+
+
+def scouting_frame():
+    bgr = np.zeros((732, 860, 3), np.uint8)
+    bgr[:] = (40, 160, 60)  # grama
+    base = np.array([(430, 150), (650, 340), (430, 530), (210, 340)], np.int32)
+    cv2.fillConvexPoly(bgr, base, (120, 120, 140))
+    return Frame(bgr=bgr), base
+
+
+def test_deploy_points_surround_detected_base():
+    frame, base = scouting_frame()
+    area = find_deploy_area(frame)
+    assert abs(cv2.contourArea(area) - cv2.contourArea(base)) / cv2.contourArea(base) < 0.1
+
+    points = deploy_points(area, 12, margin=20)
+    assert len(points) == 12
+    for x, y in points:
+        assert cv2.pointPolygonTest(base, (x, y), True) < -10
+
+    top = deploy_points(area, 4, side="top")
+    assert all(y < 340 for _, y in top)
+
+
+def test_deploy_script_uses_multiple_contacts():
+    waves = [((60, 675), [(10, 10), (20, 20), (30, 30)])]
+    lines = deploy_script(waves, (100, 100), (100, 100), contacts=2).split("\n")
+
+    assert "d 1 20 20 50" in lines
+    assert "d 0 30 30 50" in lines
+    # slot + 2 rajadas
+    assert lines.count("u 0") == 3 and lines.count("u 1") == 1
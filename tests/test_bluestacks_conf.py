@@ -0,0 +1,46 @@
+import pytest
+
+from bot.bluestacks import BlueStacks, BlueStacksConf
+from bot.settings import Settings
+
+CONF = (
+    'bst.feature.rooting="0"\r\n'
+    'bst.instance.Pie64.adb_port="5555"\r\n'
+    'bst.instance.Pie64.dpi="240"\r\n'
+    'bst.instance.Pie64_1.adb_port="5556"\r\n'
+    'bst.instance.Pie64_1.fb_width="1600"\r\n'
+    'bst.instance.Pie64_1.dpi="240"\r\n'
+)
+
+
+@pytest.fixture
+def conf_path(tmp_path, monkeypatch):
+    path = tmp_path / "bluestacks.conf"
+    path.write_bytes(CONF.encode())
+    monkeypatch.setattr(Settings, "BLUESTACKS_CONF", str(path))
+    monkeypatch.setattr(Settings, "BLUESTACK_PORT", 5556)
+    return path
+
+
+def test_instances_and_port_lookup(conf_path):
+    conf = BlueStacksConf.load()
+    assert set(conf.instances()) == {"Pie64", "Pie64_1"}
+    assert conf.instances()["Pie64_1"]["fb_width"] == "1600"
+    assert conf.find_instance(5556) == "Pie64_1"
+    assert conf.find_instance(9999) == "Pie64"
+
+
+def test_configure_targets_port_instance_and_is_idempotent(conf_path):
+    assert BlueStacks.configure(dry_run=True)
+    assert conf_path.read_bytes() == CONF.encode()
+
+    assert BlueStacks.configure()
+    data = conf_path.read_bytes().decode()
+    assert 'bst.instance.Pie64_1.fb_width="860"\r\n' in data
+    assert 'bst.instance.Pie64_1.show_sidebar="0"\r\n' in data
+    assert 'bst.instance.Pie64.dpi="240"\r\n' in data
+    assert "\n" not in data.replace("\r\n", "")
+
+    mtime = conf_path.stat().st_mtime_ns
+    assert not BlueStacks.configure()
+    assert conf_path.stat().st_mtime_ns == mtime
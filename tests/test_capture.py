@@ -0,0 +1,50 @@
+import time
+
+import numpy as np
+
+from bot.capture import CaptureThread
+from bot.frame import Frame
+
+
+class FakeScreen:
+    def __init__(self, delay=0.01):
+        self.delay = delay
+        self.count = 0
+
+    def capture(self):
+        started = time.time()
+        time.sleep(self.delay)
+        self.count += 1
+        return Frame(gray=np.zeros((4, 4), np.uint8), timestamp=started)
+
+
+def test_latest_frame_waits_for_frame_after_action():
+    screen = FakeScreen()
+    thread = CaptureThread(screen.capture, size=3).start()
+    try:
+        action = time.time()
+        frame = thread.latest_frame(action, timeout=1)
+        assert frame is not None and frame.timestamp > action
+        assert len(thread.frames()) <= 3
+    finally:
+        thread.stop()
+
+
+def test_capture_throttles_without_readers():
+    screen = FakeScreen(delay=0)
+    thread = CaptureThread(screen.capture, idle_after=0.05, max_interval=0.2).start()
+    try:
+        time.sleep(0.3)
+        before = screen.count
+        time.sleep(0.4)
+        # Sem throttle seriam milhares de capturas; ociosa, so algumas
+        assert screen.count - before < 20
+        assert thread.interval > 0
+
+        # Depois de ociosa, o leitor recebe um frame capturado apos o pedido
+        requested = time.time()
+        frame = thread.latest_frame(timeout=5)
+        assert frame is not None and frame.timestamp >= requested
+    finally:
+        thread.stop()
+    assert not thread.running
@@ -0,0 +1,8 @@
+from bot.device import Device
+
+
+def test_parse_wm_prefers_override():
+    assert Device._parse_wm("Physical size: 1600x900\n") == "1600x900"
+    assert Device._parse_wm("Physical size: 1600x900\nOverride size: 860x732\n") == "860x732"
+    assert Device._parse_wm("Physical density: 240\nOverride density: 160\n") == "160"
+    assert Device._parse_wm("error: no devices/emulators found") is None
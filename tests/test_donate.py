@@ -0,0 +1,41 @@
+import numpy as np
+
+from bot.frame import Frame
+from bot.vision import load_template
+from functions.donate import donate_window_open, plan_donation
+
+
+def paste(img, template, x, y):
+    tmp = load_template(template)
+    img[y : y + tmp.shape[0], x : x + tmp.shape[1]] = tmp
+    return x + tmp.shape[1] // 2, y + tmp.shape[0] // 2
+
+
+def test_plan_prefers_requested_troop_over_generic_button():
+    img = np.full((732, 860), 30, np.uint8)
+    generic = paste(img, "donate/select_troop_donate.png", 400, 400)
+    gg = paste(img, "troops/gg.png", 600, 300)
+    frame = Frame(gray=img)
+
+    assert plan_donation(frame, ["dragao", "gg"], units=3) == [gg] * 3
+    taps = plan_donation(frame, ["dragao"], units=2)
+    assert len(taps) == 2 and taps[0] == taps[1]
+    assert abs(taps[0][0] - generic[0]) <= 5 and abs(taps[0][1] - generic[1]) <= 5
+    assert plan_donation(Frame(gray=np.full((732, 860), 30, np.uint8)), ["gg"]) == []
+
+
+def test_next_request_follows_chat_scroll():
+    from functions.donate.donate import _next_request
+
+    # Pedido atendido em y=400; uma mensagem nova subiu o chat 60 px
+    handled = [400.0]
+    buttons = [(300, 340), (300, 520)]
+    assert _next_request(buttons, handled, offset=60) == (300, 520)
+    assert _next_request(buttons, handled) == (300, 340)
+
+
+def test_donate_window_open_only_with_window_buttons():
+    img = np.full((732, 860), 30, np.uint8)
+    assert not donate_window_open(Frame(gray=img.copy()))
+    paste(img, "donate/select_spell_donate.png", 500, 300)
+    assert donate_window_open(Frame(gray=img))
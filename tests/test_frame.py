@@ -0,0 +1,32 @@
+"""Testes do Frame."""
+
+import cv2
+import numpy as np
+
+from bot.frame import Frame
+
+
+def _png(img) -> bytes:
+    ok, buf = cv2.imencode(".png", img)
+    assert ok
+    return buf.tobytes()
+
+
+def test_frame_decodes_gray_once_and_caches_views():
+    bgr = np.zeros((64, 80, 3), dtype=np.uint8)
+    bgr[10:20, 10:20] = (255, 255, 255)
+    frame = Frame(raw=_png(bgr))
+
+    assert frame.gray is frame.gray
+    assert frame.size == (80, 64)
+    assert frame.pyramid(1).shape == (32, 40)
+    assert frame.pyramid(1) is frame.pyramid(1)
+    assert frame.roi((10, 10, 20, 20)) is frame.roi((10, 10, 20, 20))
+    assert int(frame.roi((10, 10, 20, 20)).min()) == 255
+
+
+def test_frame_hash_depends_on_content():
+    a = Frame(raw=_png(np.zeros((8, 8, 3), dtype=np.uint8)))
+    b = Frame(raw=_png(np.full((8, 8, 3), 255, dtype=np.uint8)))
+    assert a.hash != b.hash
+    assert not Frame(raw=b"").valid
@@ -0,0 +1,65 @@
+"""Testes da biblioteca de gestos."""
+
+import hashlib
+import subprocess
+from pathlib import Path
+
+from bot import gestures
+from bot.gestures import REMOTE_DIR, GestureLibrary
+
+
+class FakeDevice:
+    """Simula o device: guarda os md5 dos arquivos enviados."""
+
+    serial = "127.0.0.1:5556"
+
+    def __init__(self):
+        self.remote = {}
+        self.commands = []
+
+    def _run(self, cmd):
+        self.commands.append(cmd)
+        stdout = ""
+        if cmd[0] == "push":
+            for local in cmd[1:-1]:
+                path = Path(local)
+                self.remote[path.name] = hashlib.md5(path.read_bytes()).hexdigest()
+        elif cmd[0] == "shell" and "md5sum" in cmd[1]:
+            stdout = "".join(f"{md5}  {name}\n" for name, md5 in self.remote.items())
+        return subprocess.CompletedProcess(cmd, 0, stdout, "")
+
+
+def _pushes(device):
+    return [c for c in device.commands if c[0] == "push"]
+
+
+def test_shipped_scripts_are_available():
+    library = GestureLibrary(FakeDevice())
+    assert "Normal0" in library.names
+    assert "Small2.BlueStacks5" in library.names
+
+
+def test_sync_pushes_once_per_session(monkeypatch, tmp_path):
+    monkeypatch.setattr(gestures.Settings, "get_config_path", lambda name: tmp_path / name)
+    device = FakeDevice()
+    library = GestureLibrary(device)
+    library.register("zoom_test", "r\nc")
+    assert (tmp_path / "gestures" / "127.0.0.1_5556" / "zoom_test.minitouch").exists()
+
+    library.play("zoom_test")
+    library.play("zoom_test")
+    # Pinches distribuidos nao vao junto enquanto ninguem os executa
+    assert len(_pushes(device)) == 1
+    assert sorted(Path(p).name for p in _pushes(device)[0][1:-1]) == [
+        "toybox",
+        "zoom_test.minitouch",
+    ]
+
+    library.play("Normal0")
+    assert _pushes(device)[-1][1:-1] == [str(library._files["Normal0.minitouch"])]
+    assert device.commands[-1][-1] == f"{REMOTE_DIR}/Normal0.minitouch"
+
+    # Script alterado: so ele e reenviado
+    library.register("zoom_test", "r\nw 10\nc")
+    library.play("zoom_test")
+    assert _pushes(device)[-1][1:-1] == [str(library._files["zoom_test.minitouch"])]
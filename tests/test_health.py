@@ -0,0 +1,104 @@
+import subprocess
+import time
+
+import pytest
+
+from bot import health
+from bot.health import DeviceDisconnected, HealthMonitor
+
+
+class FakeDevice:
+    serial = "127.0.0.1:5556"
+
+    def __init__(self):
+        self.taps = []
+
+    def tap(self, x, y):
+        self.taps.append((x, y))
+
+
+def result(returncode=0, stderr=""):
+    return subprocess.CompletedProcess([], returncode, "", stderr)
+
+
+def test_transport_errors_trigger_background_reconnect(monkeypatch):
+    attempts = []
+    monkeypatch.setattr(
+        health, "adb_connect", lambda serial: attempts.append(serial) or len(attempts) >= 3
+    )
+    monitor = HealthMonitor(FakeDevice())
+
+    assert monitor.observe(result(0))
+    assert monitor.observe(result(1, "ls: /sdcard/x: No such file or directory"))
+    assert monitor.online
+
+    assert not monitor.observe(result(1, "error: device offline"))
+    monitor.wait_online(timeout=5)
+    assert monitor.online
+    assert monitor.disconnects >= 1
+    assert len(attempts) >= 3
+
+
+def test_empty_captures_mark_device_offline(monkeypatch):
+    monkeypatch.setattr(health, "adb_connect", lambda serial: time.sleep(5) or True)
+    monitor = HealthMonitor(FakeDevice(), capture_failures=2)
+
+    assert monitor.observe_capture(b"\x89PNG....")
+    assert not monitor.observe_capture(b"")
+    assert monitor.online
+    assert not monitor.observe_capture(b"")
+    assert not monitor.online
+
+    with pytest.raises(DeviceDisconnected):
+        monitor.wait_online(timeout=0.2)
+
+
+def test_reconnect_gives_up_and_can_restart(monkeypatch):
+    def broken(serial):
+        raise OSError("adb not found")
+
+    monkeypatch.setattr(health, "adb_connect", broken)
+    monitor = HealthMonitor(FakeDevice(), offline_timeout=0.3)
+    monitor.mark_lost("device offline")
+
+    with pytest.raises(DeviceDisconnected):
+        monitor.wait_online(timeout=1)
+    deadline = time.monotonic() + 2
+    while monitor._reconnecting and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not monitor._reconnecting and not monitor.online
+
+    monkeypatch.setattr(health, "adb_connect", lambda serial: True)
+    monitor.mark_lost("device offline")
+    monitor.wait_online(timeout=2)
+    assert monitor.online
+
+
+def test_commands_restart_reconnect_after_giving_up(monkeypatch):
+    from bot import device as device_module
+    from bot.device import Device
+
+    online = {"adb": False}
+    monkeypatch.setattr(health, "adb_connect", lambda serial: online["adb"])
+
+    def run(cmd, **kwargs):
+        if online["adb"]:
+            return result(0)
+        return result(1, "error: device offline")
+
+    monkeypatch.setattr(device_module.subprocess, "run", run)
+    device = Device.__new__(Device)
+    device.serial = FakeDevice.serial
+    device.health = HealthMonitor(device, offline_timeout=0.3)
+
+    with pytest.raises(DeviceDisconnected):
+        device._run(["shell", "true"])
+    deadline = time.monotonic() + 2
+    while device.health._reconnecting and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not device.health.online
+
+    # adb voltou: o proximo comando dispara uma nova reconexao sozinho
+    online["adb"] = True
+    assert device._run(["shell", "true"]).returncode == 0
+    assert device.health.online
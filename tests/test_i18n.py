@@ -0,0 +1,40 @@
+import json
+
+import pytest
+
+from bot.i18n import I18n
+from bot.settings import Settings
+
+
+@pytest.fixture
+def locales(tmp_path, monkeypatch):
+    (tmp_path / "locales").mkdir()
+    files = {
+        "en-US": {"gui": {"ok": "OK", "hello": "Hello {name}", "only_en": "English"}},
+        "pt-BR": {"gui": {"ok": "Certo", "hello": "Ola {name}"}},
+    }
+    for lang, data in files.items():
+        (tmp_path / "locales" / f"{lang}.json").write_text(json.dumps(data), encoding="utf-8")
+
+    monkeypatch.setattr(Settings, "PROJECT_ROOT", tmp_path)
+    monkeypatch.setattr(Settings, "LOCALES_DIR", "locales")
+    monkeypatch.setattr(I18n, "_current_language", "pt-BR")
+    I18n.reload()
+    yield
+    I18n.reload()
+
+
+def test_flat_lookup_with_fallback(locales):
+    assert I18n.t("gui.ok") == "Certo"
+    assert I18n.t("gui.only_en") == "English"
+    assert I18n.t("gui.hello", name="Ana") == "Ola Ana"
+    assert I18n.t("gui.missing") == "gui.missing"
+
+
+def test_languages_load_lazily(locales):
+    assert I18n.get_available_languages() == ["en-US", "pt-BR"]
+    assert I18n._translations == {}
+
+    I18n.set_language("en-US")
+    assert I18n.t("gui.ok") == "OK"
+    assert set(I18n._translations) == {"en-US"}
@@ -23,3 +23,18 @@ def test_import_i18n():
     from bot.i18n import t
 
     assert callable(t)
+
+
+def test_import_async_device():
+    from bot.async_device import AsyncDevice, run_on_devices
+
+    assert AsyncDevice is not None
+    assert callable(run_on_devices)
+
+
+def test_import_async_functions():
+    from functions.army import train_army_async
+    from functions.donate import donate_castle_async
+
+    assert callable(train_army_async)
+    assert callable(donate_castle_async)
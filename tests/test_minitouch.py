@@ -0,0 +1,43 @@
+"""Testes dos geradores de script do minitouch."""
+
+from bot.minitouch import parse_touch_info, swipe_script, to_touch
+
+
+def test_to_touch_scales_to_touch_range():
+    assert to_touch(430, 366, (860, 732), (32767, 32767)) == (16383, 16383)
+
+
+def test_parse_touch_info():
+    output = "v 1\n^ 10 32767 32767 255\n$ 1234\n"
+    assert parse_touch_info(output) == (32767, 32767)
+    assert parse_touch_info("") == (32767, 32767)
+
+
+def test_swipe_script_releases_contact():
+    script = swipe_script(0, 0, 860, 732, (860, 732), (1000, 1000), hold_ms=50)
+    lines = script.split("\n")
+    assert lines[0] == "r"
+    assert "d 0 0 0 50" in lines
+    assert "m 0 1000 1000 50" in lines
+    assert lines[-2:] == ["u 0", "c"]
+
+
+def test_taps_script_taps_every_point():
+    from bot.minitouch import taps_script
+
+    script = taps_script([(10, 10), (20, 20)], (100, 100), (100, 100))
+    lines = script.split("\n")
+    assert lines.count("u 0") == 2
+    assert "d 0 10 10 50" in lines
+    assert "d 0 20 20 50" in lines
+
+
+def test_drag_script_moves_at_constant_velocity_and_holds():
+    from bot.minitouch import drag_script
+
+    script = drag_script(100, 50, 220, 50, (1000, 1000), (1000, 1000), velocity=600, hold_ms=150)
+    lines = script.split("\n")
+    moves = [int(line.split()[2]) for line in lines if line.startswith("m ")]
+    assert len(moves) == 20
+    assert {b - a for a, b in zip([100] + moves, moves)} == {6}
+    assert lines[-3:] == ["w 150", "u 0", "c"]
@@ -0,0 +1,28 @@
+"""Testes do parser de OCR."""
+
+from bot.ocr import parse_duration, parse_number
+
+
+def test_parse_duration():
+    assert parse_duration("1h 23m") == 4980
+    assert parse_duration("12m5s") == 725
+    assert parse_duration("45s") == 45
+    assert parse_duration("") is None
+    assert parse_duration("abc") is None
+
+
+def test_parse_number_ignores_separators():
+    assert parse_number("1 234 567") == 1234567
+    assert parse_number(None) is None
+
+
+def test_overlap_suppression_uses_extent_of_replacing_hit():
+    from bot.ocr import _suppress_overlaps
+
+    hits = [
+        (0, 0.85, "1", 10),  # fraco, substituido pelo "7" sobreposto
+        (3, 0.95, "7", 20),
+        (10, 0.90, "1", 10),  # ainda dentro do "7": nao e um novo digito
+        (24, 0.92, "2", 20),
+    ]
+    assert _suppress_overlaps(hits) == "72"
@@ -0,0 +1,28 @@
+import socket
+
+from bot import readiness
+
+
+def test_phases_are_timed_until_requested_phase():
+    with socket.socket() as server:
+        server.bind(("127.0.0.1", 0))
+        server.listen()
+        port = server.getsockname()[1]
+        report = readiness.wait_ready("127.0.0.1", port, timeout=2, until="tcp")
+
+    assert report.ready
+    assert list(report.phases) == ["tcp"]
+
+
+def test_backoff_stops_at_timeout(monkeypatch):
+    calls = []
+    monkeypatch.setattr(readiness, "port_open", lambda host, port: True)
+    monkeypatch.setattr(readiness, "adb_connect", lambda serial: calls.append(serial) or False)
+
+    report = readiness.wait_ready("127.0.0.1", 5556, timeout=0.5, until="boot", initial_delay=0.05)
+
+    assert not report.ready
+    assert report.failed_phase == "adb"
+    assert list(report.phases) == ["tcp", "adb"]
+    # 0.05 + 0.1 + 0.2 + resto: poucas tentativas, nao um loop apertado
+    assert 3 <= len(calls) <= 6
@@ -0,0 +1,49 @@
+import numpy as np
+
+from bot.frame import Frame
+from bot.scroll import ScrollTracker
+
+REGION = (0, 0, 256, 64)
+
+
+def bar(offset):
+    rng = np.random.default_rng(0)
+    strip = np.repeat(rng.integers(0, 255, (64, 128), dtype=np.uint8), 8, axis=1)
+    return Frame(gray=np.ascontiguousarray(strip[:, offset : offset + 256]))
+
+
+def test_tracks_real_displacement_and_end_of_list():
+    tracker = ScrollTracker(REGION)
+    tracker.reset(bar(0))
+
+    moved = tracker.after_scroll(bar(40), requested=50)
+    assert abs(moved - 40) < 1
+    assert not tracker.at_end
+
+    tracker.remember("troops/gg.png", (200, 30))
+    assert abs(tracker.to_virtual((200, 30)) - 240) < 1
+
+    moved = tracker.after_scroll(bar(40), requested=50)
+    assert abs(moved) < 1 and tracker.at_end
+
+    tracker.after_scroll(bar(10), requested=-30)
+    assert abs(tracker.offset - 10) < 1
+    # gg estava na coordenada virtual 240 -> tela 230; centro da barra e 128
+    assert abs(tracker.distance_to("troops/gg.png") - 102) <= 1
+    assert tracker.distance_to("troops/peka.png") is None
+
+
+def test_failed_calibration_is_cached():
+    from bot.device import Device
+
+    device = Device.__new__(Device)
+    device._screen_size = (256, 64)
+    device._scroll_calibration = {}
+    drags = []
+    device._scroll = lambda pixels, start_pos, axis, exact: drags.append(pixels)
+    device.latest_frame = lambda min_timestamp=None: bar(0)  # barra parada
+
+    assert device.calibrate_scroll(REGION, (128, 32)) is None
+    assert device.scroll_calibrated("x")
+    assert device._finger_pixels(100, "x") == 100
+    assert len(drags) == 2
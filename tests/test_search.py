@@ -0,0 +1,54 @@
+import numpy as np
+
+from bot.frame import Frame
+from functions.attack import search
+from functions.attack.search import evaluate_loot, search_base
+
+
+def loot_frame(value):
+    gray = np.zeros((732, 860), np.uint8)
+    gray[90:170, 48:170] = value
+    return Frame(gray=gray)
+
+
+class FakeDevice:
+    def __init__(self, frames):
+        self.frames = list(frames)
+        self.taps = []
+
+    def latest_frame(self, min_timestamp=None):
+        return self.frames.pop(0) if len(self.frames) > 1 else self.frames[0]
+
+    def tap(self, x, y):
+        self.taps.append((x, y))
+
+
+def test_evaluate_loot_exits_on_first_failing_resource(monkeypatch):
+    reads = []
+
+    def fake_read(frame, region, config):
+        reads.append(region)
+        return {search.LOOT_ROIS["gold"]: "120 000", search.LOOT_ROIS["elixir"]: "900000"}[region]
+
+    monkeypatch.setattr(search, "read_text", fake_read)
+    decision, loot = evaluate_loot(None, {"gold": 200000, "elixir": 200000})
+
+    assert decision is False
+    assert loot == {"gold": 120000}
+    assert reads == [search.LOOT_ROIS["gold"]]
+
+
+def test_search_base_skips_until_loot_is_enough(monkeypatch):
+    values = {40: "1000", 200: "500000"}
+    monkeypatch.setattr(search, "read_text", lambda frame, region, config: values.get(
+        int(frame.gray[100, 60])))
+
+    # base ruim (estavel), nuvens, base boa (estavel)
+    frames = [loot_frame(40), loot_frame(40), loot_frame(120), loot_frame(200), loot_frame(200)]
+    device = FakeDevice(frames)
+    result = search_base(device, {"gold": 200000})
+
+    assert result["found"]
+    assert result["bases"] == 2
+    assert result["loot"] == {"gold": 500000}
+    assert device.taps == [search.NEXT_POSITION]
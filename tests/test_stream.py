@@ -0,0 +1,63 @@
+import io
+import time
+
+from bot.stream import ScreenStream
+
+
+class FakeDecoder:
+    def __init__(self, data):
+        self.stdout = io.BufferedReader(io.BytesIO(data))
+
+    def poll(self):
+        return 0
+
+
+def fake_stream(segments):
+    stream = ScreenStream("fake", (4, 2), max_gap=0.05)
+    segments = list(segments)
+
+    def spawn():
+        # Cada "execucao" do screenrecord entrega um segmento e termina
+        stream._decoder = FakeDecoder(segments.pop(0) if segments else b"")
+
+    stream._spawn = spawn
+    stream._kill = lambda: None
+    return stream
+
+
+def test_stream_decodes_frames_and_restarts_at_end():
+    stream = fake_stream([bytes([1] * 8) + bytes([2] * 8), bytes([3] * 8)]).start()
+    try:
+        values = []
+        deadline = time.monotonic() + 2
+        while len(values) < 2 and time.monotonic() < deadline:
+            values.append(int(stream.read(timeout=1).gray[0, 0]))
+        # Depois do reinicio chega o frame do segundo segmento
+        while values[-1] != 3 and time.monotonic() < deadline:
+            values.append(int(stream.read(timeout=1).gray[0, 0]))
+
+        assert values[-1] == 3
+        assert stream.restarts >= 1
+        assert stream.read(timeout=1).gray.shape == (2, 4)
+    finally:
+        stream.stop()
+    assert not stream.running
+
+
+def test_stream_repeats_last_frame_when_screen_is_still():
+    stream = fake_stream([bytes([7] * 8)]).start()
+    stream.max_latency = 0.2
+    try:
+        first = stream.read(timeout=1)
+        action = time.time()
+        again = stream.read(timeout=1)
+        assert again.gray is first.gray
+        # Logo apos a acao, o frame repetido ainda nao conta como posterior a ela
+        assert again.timestamp < action
+
+        time.sleep(0.3)
+        later = stream.read(timeout=1)
+        assert later.gray is first.gray
+        assert later.timestamp > action
+    finally:
+        stream.stop()
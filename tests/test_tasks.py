@@ -0,0 +1,43 @@
+import threading
+import time
+
+from bot import tasks
+from bot.tasks import TaskRunner
+
+
+def test_cancel_interrupts_sleep():
+    started = threading.Event()
+
+    def job():
+        started.set()
+        tasks.sleep(30)
+
+    runner = TaskRunner()
+    task = runner.submit(job, key="dev")
+    assert started.wait(2)
+
+    t0 = time.monotonic()
+    runner.cancel("dev")
+    assert task.wait(2)
+    assert task.status == "cancelled"
+    assert time.monotonic() - t0 < 1
+
+
+def test_cancel_skips_queued_and_runs_then():
+    runner = TaskRunner()
+    order = []
+
+    first = runner.submit(lambda: order.append("a"), key="dev", then=lambda: order.append("b"))
+    assert first.wait(2)
+    for _ in range(100):
+        if order == ["a", "b"]:
+            break
+        time.sleep(0.01)
+    assert order == ["a", "b"]
+
+    blocker = runner.submit(lambda: tasks.sleep(30), key="dev")
+    queued = runner.submit(lambda: order.append("c"), key="dev")
+    runner.cancel("dev")
+    assert queued.wait(2) and blocker.wait(2)
+    assert queued.status == "cancelled"
+    assert order == ["a", "b"]
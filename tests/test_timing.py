@@ -0,0 +1,74 @@
+import numpy as np
+
+from bot import timing
+from bot.frame import Frame
+from bot.timing import TimingProfile, frames_settled
+
+
+def test_delay_uses_p95_with_floor_after_learning(tmp_path):
+    profile = TimingProfile(tmp_path / "device.json", floor=0.2)
+    assert profile.delay("army.open", 0.5) == 0.5
+
+    for seconds in [0.05] * 19 + [0.15]:
+        profile.record("army.open", seconds)
+    assert profile.percentile("army.open", 50) == 0.05
+    assert profile.delay("army.open", 0.5) == 0.2  # p95 abaixo do piso
+
+    for seconds in [0.9] * 20:
+        profile.record("army.open", seconds)
+    assert profile.delay("army.open", 0.5) == 0.9
+
+
+def test_profile_persists_samples_and_percentiles(tmp_path):
+    path = tmp_path / "timing" / "127.0.0.1_5556.json"
+    profile = TimingProfile(path)
+    for seconds in (0.3, 0.4, 0.5, 0.6, 0.7):
+        profile.record("chat.open", seconds)
+    assert profile.save()
+
+    loaded = TimingProfile(path)
+    assert loaded.samples("chat.open") == [0.3, 0.4, 0.5, 0.6, 0.7]
+    assert loaded.summary()["chat.open"]["p95"] == 0.7
+
+
+def test_measures_until_learned_then_samples_periodically(tmp_path):
+    profile = TimingProfile(tmp_path / "device.json")
+    measured = 0
+    for _ in range(timing.MIN_SAMPLES + 2 * timing.MEASURE_EVERY):
+        if profile.should_measure("back"):
+            measured += 1
+            profile.record("back", 0.4)
+    assert measured == timing.MIN_SAMPLES + 2
+
+
+def test_frames_settled_ignores_noise():
+    base = np.full((64, 64), 100, np.uint8)
+    noisy = base.copy()
+    noisy[::8, ::8] = 110
+    moved = base.copy()
+    moved[:32] = 200
+
+    assert frames_settled(Frame(gray=base), Frame(gray=noisy))
+    assert not frames_settled(Frame(gray=base), Frame(gray=moved))
+
+
+def test_settle_without_change_records_default_instead_of_timing_out(tmp_path):
+    import time
+
+    from bot.device import Device
+
+    still = Frame(gray=np.full((64, 64), 100, np.uint8), timestamp=time.time() - 1)
+    device = Device.__new__(Device)
+    device._timing = TimingProfile(tmp_path / "device.json")
+    device._last_action = time.time()
+    device.last_frame = still
+
+    def latest_frame(min_timestamp=None):
+        return Frame(gray=still.gray, timestamp=time.time())
+
+    device.latest_frame = latest_frame
+
+    start = time.monotonic()
+    device.settle("config.scroll", 0.2, timeout=5)
+    assert time.monotonic() - start < 1
+    assert len(device.timing.samples("config.scroll")) == 1
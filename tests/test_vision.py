@@ -0,0 +1,21 @@
+"""Testes do matching de templates."""
+
+import numpy as np
+
+from bot.vision import load_template, match_all, match_template
+
+TEMPLATE = "collect/collect_gold.png"
+
+
+def test_match_all_finds_every_occurrence():
+    tmp = load_template(TEMPLATE)
+    h, w = tmp.shape
+    frame = np.zeros((400, 600), dtype=np.uint8)
+    for x, y in [(50, 60), (300, 200), (500, 20)]:
+        frame[y : y + h, x : x + w] = tmp
+
+    found = sorted((x, y) for x, y, _ in match_all(frame, TEMPLATE, threshold=0.9))
+    assert found == sorted(
+        (x + w // 2, y + h // 2) for x, y in [(50, 60), (300, 200), (500, 20)]
+    )
+    assert match_template(frame, TEMPLATE, threshold=0.9) in found
@@ -0,0 +1,41 @@
+"""Testes do pool de visao."""
+
+import numpy as np
+
+from bot.vision import load_template
+from bot.vision_pool import VisionPool
+
+TEMPLATE = "menu/bt_army.png"
+
+
+def test_pool_matches_frame_from_shared_memory():
+    tmp = load_template(TEMPLATE)
+    h, w = tmp.shape
+    frame = np.zeros((732, 860), dtype=np.uint8)
+    frame[100 : 100 + h, 200 : 200 + w] = tmp
+
+    pool = VisionPool(workers=1, templates=[TEMPLATE]).start()
+    try:
+        assert pool.match(frame, TEMPLATE, key="test") == (200 + w // 2, 100 + h // 2)
+        assert pool.match(np.zeros_like(frame), TEMPLATE, key="test") is None
+    finally:
+        pool.shutdown()
+
+
+def test_submit_does_not_block_while_key_is_busy():
+    tmp = load_template(TEMPLATE)
+    h, w = tmp.shape
+    frame = np.zeros((732, 860), dtype=np.uint8)
+    frame[100 : 100 + h, 200 : 200 + w] = tmp
+
+    pool = VisionPool(workers=1, templates=[TEMPLATE]).start()
+    try:
+        slot = pool._slot("busy", frame.nbytes)
+        slot.lock.acquire()  # job anterior ainda lendo o buffer
+        try:
+            future = pool.submit(frame, TEMPLATE, key="busy")
+            assert future.result(timeout=10) == (200 + w // 2, 100 + h // 2)
+        finally:
+            slot.lock.release()
+    finally:
+        pool.shutdown()
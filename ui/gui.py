@@ -2,51 +2,150 @@
 GUI simplificada do Bot COC.
 """
 
+import base64
+import importlib
 import json
 import logging
 import threading
+import time
 import tkinter as tk
-import traceback
 from tkinter import messagebox, scrolledtext, ttk
 
-from bot.bluestacks import BlueStacks
-from bot.device import Device
 from bot.i18n import get_available_languages, get_language, set_language, t
 from bot.settings import Settings
-from functions.army import create_army, delete_army, train_army
-from functions.config import go_home, init_game, setup_emulator
-from functions.donate import donate_castle, request_castle
+from bot.tasks import TaskRunner
+from ui.log_sink import TextHandler, TextSink
+
+# Modulos pesados (OpenCV/NumPy, ADB, fluxos) carregados depois que a janela aparece
+WARM_UP_MODULES = [
+    "cv2",
+    "bot.device",
+    "bot.bluestacks",
+    "functions.config",
+    "functions.army",
+    "functions.donate",
+    "functions.collect",
+]
+
+
+class PreviewPanel:
+    """
+    Preview da tela do device com as ultimas caixas de matching.
+
+    Reaproveita os frames que o bot ja capturou (nao gera capturas extras).
+    A reducao/desenho roda em uma thread; o Tk so troca a imagem, no maximo
+    `max_fps` vezes por segundo e apenas quando o painel esta visivel.
+    """
+
+    def __init__(self, parent, max_fps: float = 4, width: int = 430):
+        self.parent = parent
+        self.interval_ms = int(1000 / max_fps)
+        self.width = width
+        self.device = None
 
+        self.label = ttk.Label(parent, text="No frames yet", anchor=tk.CENTER)
+        self.label.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.info_var = tk.StringVar(value="")
+        ttk.Label(parent, textvariable=self.info_var, font=("Consolas", 9)).pack(
+            fill=tk.X, padx=5, pady=2
+        )
 
-class TextHandler(logging.Handler):
-    """Handler que envia logs para um widget Text do tkinter."""
+        self._photo = None
+        self._pending = None
+        self._rendered = None
+        self._visible = False
+        self._wakeup = threading.Event()
+        self._lock = threading.Lock()
 
-    def __init__(self, text_widget):
-        super().__init__()
-        self.text_widget = text_widget
+        threading.Thread(target=self._render_loop, daemon=True).start()
+        self.parent.after(self.interval_ms, self._poll)
 
-    def emit(self, record):
-        msg = self.format(record)
-        self.text_widget.after(0, self._append, msg, record.levelno)
+    def attach(self, device):
+        """Passa a observar os frames de um device."""
+        if self.device is device:
+            return
+        if self.device is not None:
+            self.device.remove_frame_listener(self._on_frame)
+        self.device = device
+        if device is not None:
+            device.add_frame_listener(self._on_frame)
+
+    def _on_frame(self, frame):
+        # Chamado na thread do bot: so guarda a referencia
+        with self._lock:
+            self._pending = frame
+        self._wakeup.set()
+
+    def _render_loop(self):
+        while True:
+            self._wakeup.wait()
+            # Limita a taxa de renderizacao e da tempo do matching do frame terminar
+            time.sleep(self.interval_ms / 1000)
+            self._wakeup.clear()
+            if not self._visible:
+                continue
+            with self._lock:
+                frame, self._pending = self._pending, None
+            if frame is None:
+                continue
+            try:
+                rendered = self._render(frame)
+            except Exception:
+                continue
+            with self._lock:
+                self._rendered = rendered
+
+    def _render(self, frame):
+        import cv2
+
+        img = frame.bgr
+        if img is None:
+            # Frames do stream H.264 so tem cinza
+            gray = frame.gray
+            if gray is None:
+                return None
+            img = cv2.cvtColor(gray, cv2.COLOR_GRAY2BGR)
+        scale = self.width / img.shape[1]
+        small = cv2.resize(img, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+
+        matches = [m for m in list(self.device.last_matches) if m["timestamp"] == frame.timestamp]
+        for match in matches:
+            x1, y1, x2, y2 = (int(v * scale) for v in match["box"])
+            color = (0, 200, 0) if match["found"] else (0, 0, 220)
+            cv2.rectangle(small, (x1, y1), (x2, y2), color, 1)
+            cv2.putText(
+                small,
+                f"{match['score']:.2f}",
+                (x1, max(y1 - 2, 8)),
+                cv2.FONT_HERSHEY_SIMPLEX,
+                0.3,
+                color,
+                1,
+            )
 
-    def _append(self, msg, level):
-        self.text_widget.configure(state="normal")
-        self.text_widget.insert(tk.END, msg + "\n")
+        ok, png = cv2.imencode(".png", small)
+        if not ok:
+            return None
+        info = " | ".join(
+            f"{m['template']} {m['score']:.2f}{'' if m['found'] else ' x'}" for m in matches[-3:]
+        )
+        return base64.b64encode(png.tobytes()).decode("ascii"), info
 
-        # Colorir por nivel
-        if level >= logging.ERROR:
-            self._colorize_last_line("red")
-        elif level >= logging.WARNING:
-            self._colorize_last_line("orange")
-        elif level >= logging.DEBUG:
-            self._colorize_last_line("gray")
+    def _poll(self):
+        # Roda no loop do Tk
+        self._visible = bool(self.label.winfo_ismapped())
+        if self._visible and self._pending is not None:
+            self._wakeup.set()
 
-        self.text_widget.see(tk.END)
-        self.text_widget.configure(state="disabled")
+        with self._lock:
+            rendered, self._rendered = self._rendered, None
+        if rendered:
+            data, info = rendered
+            self._photo = tk.PhotoImage(data=data)
+            self.label.configure(image=self._photo, text="")
+            self.info_var.set(info)
 
-    def _colorize_last_line(self, color):
-        self.text_widget.tag_add(color, "end-2l", "end-1l")
-        self.text_widget.tag_config(color, foreground=color)
+        self.parent.after(self.interval_ms, self._poll)
 
 
 class BotGUI:
@@ -56,16 +155,23 @@ class BotGUI:
         self.root.geometry("800x700")
 
         self.device = None
-        self.is_running = False
+        self.preview = None
+        self.tasks = TaskRunner(on_update=self._on_task_update)
+        self.task_status_var = None
         self.ui_widgets = {}
         self.log_text = None
+        self.log_sink = None
         self.debug_text = None
+        self.debug_sink = None
         self.logger = None
 
         self.setup_ui()
         self.setup_logging()
         self.load_army_config()
 
+        # Aquece os imports em segundo plano quando o loop do Tk ja estiver rodando
+        self.root.after(100, self._start_warm_up)
+
     def setup_ui(self):
         # Menu de idiomas
         menubar = tk.Menu(self.root)
@@ -104,6 +210,11 @@ class BotGUI:
         self.notebook.add(debug_frame, text="Debug")
         self.setup_debug_tab(debug_frame)
 
+        # Aba: Preview
+        preview_frame = ttk.Frame(self.notebook)
+        self.notebook.add(preview_frame, text="Preview")
+        self.preview = PreviewPanel(preview_frame)
+
     def change_language(self):
         set_language(self.language_var.get())
         self.update_ui_language()
@@ -114,6 +225,7 @@ class BotGUI:
         self.notebook.tab(1, text=t("gui.tabs.army"))
         self.notebook.tab(2, text=t("gui.tabs.log"))
         self.notebook.tab(3, text="Debug")
+        self.notebook.tab(4, text="Preview")
 
         for key, info in self.ui_widgets.items():
             widget = info.get("widget")
@@ -180,11 +292,25 @@ class BotGUI:
             ("train_army", self.train_army),
             ("donate_castle", self.donate_castle),
             ("request_castle", self.request_castle),
+            ("collect_resources", self.collect_resources),
         ]:
             btn = ttk.Button(bot_frame, text=t(f"gui.buttons.{name}"), command=cmd)
             btn.pack(side=tk.LEFT, padx=2)
             self.ui_widgets[name] = {"type": "button", "widget": btn}
 
+        # Tarefas
+        task_frame = ttk.LabelFrame(parent, text=t("gui.labels.tasks"), padding=10)
+        task_frame.pack(fill=tk.X, padx=5, pady=5)
+        self.ui_widgets["tasks"] = {"type": "labelframe", "widget": task_frame}
+
+        btn = ttk.Button(task_frame, text=t("gui.buttons.cancel_task"), command=self.cancel_task)
+        btn.pack(side=tk.LEFT, padx=2)
+        self.ui_widgets["cancel_task"] = {"type": "button", "widget": btn}
+
+        self.task_status_var = tk.StringVar(value="Idle")
+        ttk.Label(task_frame, textvariable=self.task_status_var).pack(side=tk.LEFT, padx=10)
+        self.root.after(250, self._poll_task_status)
+
     def setup_army_tab(self, parent):
         # Tropas disponiveis
         troops_frame = ttk.LabelFrame(parent, text="Available Troops", padding=10)
@@ -254,6 +380,7 @@ class BotGUI:
     def setup_log_tab(self, parent):
         self.log_text = scrolledtext.ScrolledText(parent, wrap=tk.WORD, height=30)
         self.log_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        self.log_sink = TextSink(self.log_text, max_lines=1000)
 
         ttk.Button(parent, text=t("gui.buttons.clear_log"), command=self.clear_log).pack(pady=5)
 
@@ -284,6 +411,7 @@ class BotGUI:
         )
         self.debug_text.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
         self.debug_text.configure(state="disabled")
+        self.debug_sink = TextSink(self.debug_text, max_lines=5000, readonly=True)
 
     def setup_logging(self):
         """Configura o sistema de logging."""
@@ -294,8 +422,8 @@ class BotGUI:
         self.logger.handlers.clear()
 
         # Handler para debug_text
-        if self.debug_text:
-            handler = TextHandler(self.debug_text)
+        if self.debug_sink:
+            handler = TextHandler(self.debug_sink)
             handler.setLevel(logging.DEBUG)
             formatter = logging.Formatter(
                 "%(asctime)s [%(levelname)s] %(name)s: %(message)s", datefmt="%H:%M:%S"
@@ -312,10 +440,8 @@ class BotGUI:
             handler.setLevel(level)
 
     def clear_debug(self):
-        if self.debug_text:
-            self.debug_text.configure(state="normal")
-            self.debug_text.delete(1.0, tk.END)
-            self.debug_text.configure(state="disabled")
+        if self.debug_sink:
+            self.debug_sink.clear()
 
     def copy_debug(self):
         if self.debug_text:
@@ -330,36 +456,80 @@ class BotGUI:
             log_func(message)
 
     def log(self, message):
-        if self.log_text:
-            self.log_text.insert(tk.END, f"{message}\n")
-            self.log_text.see(tk.END)
+        # Thread-safe: pode ser chamado das threads de trabalho
+        if self.log_sink:
+            self.log_sink.write(str(message))
 
     def clear_log(self):
-        if self.log_text:
-            self.log_text.delete(1.0, tk.END)
-
-    def run_in_thread(self, func):
-        if self.is_running:
-            messagebox.showwarning("Warning", "Another operation is running!")
-            return
-
-        self.is_running = True
-        func_name = func.__name__
-
-        def wrapper():
-            self.debug(f"Starting: {func_name}", "INFO")
+        if self.log_sink:
+            self.log_sink.clear()
+
+    def task_key(self) -> str:
+        """Fila de tarefas do device atual (uma por serial)."""
+        if self.device:
+            return self.device.serial
+        return f"{Settings.BLUESTACK_HOST}:{Settings.BLUESTACK_PORT}"
+
+    def run_in_thread(self, func, then=None):
+        """Enfileira a operacao na fila do device; nao bloqueia a interface."""
+        busy = self.tasks.busy or self.tasks.pending_count() > 0
+        task = self.tasks.submit(func, name=func.__name__, key=self.task_key(), then=then)
+        if busy:
+            self.log(f"[TASK] Queued: {task.name}")
+        return task
+
+    def cancel_task(self):
+        """Cancela a tarefa atual e as enfileiradas."""
+        if self.tasks.busy or self.tasks.pending_count():
+            self.log("[TASK] Cancelling...")
+            self.tasks.cancel()
+
+    def _on_task_update(self, task):
+        """Chamado nas threads de trabalho; so usa os sinks thread-safe."""
+        if task.status == "running":
+            if task.message:
+                self.debug(f"{task.name}: {task.message}")
+            else:
+                self.debug(f"Starting: {task.name}", "INFO")
+        elif task.status == "done":
+            self.debug(f"Completed: {task.name}", "INFO")
+        elif task.status == "cancelled":
+            self.log(f"[TASK] Cancelled: {task.name}")
+        elif task.status == "failed":
+            self.log(f"ERROR: {task.error}")
+            # Log completo com traceback
+            self.debug(f"Exception in {task.name}:\n{task.traceback}", "ERROR")
+
+    def _poll_task_status(self):
+        task = self.tasks.current()
+        pending = self.tasks.pending_count()
+        if task is None:
+            status = "Idle"
+        else:
+            status = f"{task.name}: {task.message}" if task.message else task.name
+        if pending:
+            status += f" (+{pending} queued)"
+        self.task_status_var.set(status)
+        self.root.after(250, self._poll_task_status)
+
+    def _start_warm_up(self):
+        threading.Thread(target=self._warm_up, name="warm-up", daemon=True).start()
+
+    def _warm_up(self):
+        """Importa os modulos pesados fora da thread do Tk."""
+        start = time.perf_counter()
+        for module in WARM_UP_MODULES:
             try:
-                func()
-                self.debug(f"Completed: {func_name}", "INFO")
+                importlib.import_module(module)
             except Exception as e:
-                self.log(f"ERROR: {e}")
-                # Log completo com traceback
-                tb = traceback.format_exc()
-                self.debug(f"Exception in {func_name}:\n{tb}", "ERROR")
-            finally:
-                self.is_running = False
+                self.debug(f"Warm-up failed for {module}: {e}", "WARNING")
+        self.debug(f"Warm-up done in {time.perf_counter() - start:.2f}s")
 
-        threading.Thread(target=wrapper, daemon=True).start()
+    def set_device(self, device):
+        """Define o device atual e conecta o preview a ele."""
+        self.device = device
+        if self.preview:
+            self.preview.attach(device)
 
     def check_device(self) -> bool:
         if not self.device:
@@ -374,19 +544,22 @@ class BotGUI:
 
     def _setup_emulator(self):
         """Configura emulador completo e abre o jogo."""
+        from functions.config import setup_emulator
+
         success, device = setup_emulator(callback=self.log)
 
+        self.set_device(device)
         if success:
-            self.device = device
             messagebox.showinfo("Sucesso", "Emulador configurado e jogo aberto!")
         else:
-            self.device = device
             messagebox.showwarning("Aviso", "Configuracao concluida, mas vila nao detectada.")
 
     def kill_bluestacks(self):
         self.run_in_thread(self._kill_bluestacks)
 
     def _kill_bluestacks(self):
+        from bot.bluestacks import BlueStacks
+
         self.log("[BS] Killing BlueStacks...")
         BlueStacks.kill()
         self.log("[BS] Done")
@@ -395,6 +568,8 @@ class BotGUI:
         self.run_in_thread(self._configure_bluestacks)
 
     def _configure_bluestacks(self):
+        from bot.bluestacks import BlueStacks
+
         self.log("[BS] Configuring...")
         BlueStacks.configure()
         self.log("[BS] Done")
@@ -403,14 +578,18 @@ class BotGUI:
         self.run_in_thread(self._start_bluestacks)
 
     def _start_bluestacks(self):
+        from bot.bluestacks import BlueStacks
+
         self.log("[BS] Starting...")
-        BlueStacks.start()
-        self.log("[BS] Done")
+        report = BlueStacks.start(callback=self.log)
+        self.log(f"[BS] {report}" if report else "[BS] BlueStacks executable not found")
 
     def validate_adb(self):
         self.run_in_thread(self._validate_adb)
 
     def _validate_adb(self):
+        from bot.bluestacks import BlueStacks
+
         self.log("[ADB] Validating...")
         result = BlueStacks.validate_adb()
         self.log(f"[ADB] {result}")
@@ -421,8 +600,10 @@ class BotGUI:
         self.run_in_thread(self._connect_device)
 
     def _connect_device(self):
+        from bot.device import Device
+
         self.log("[DEVICE] Connecting...")
-        self.device = Device()
+        self.set_device(Device())
         self.log(f"[DEVICE] Connected to {self.device.serial}")
 
     def take_screenshot(self):
@@ -443,6 +624,8 @@ class BotGUI:
         self.run_in_thread(self._init_game)
 
     def _init_game(self):
+        from functions.config import init_game
+
         self.log("[GAME] Initializing...")
         init_game(self.device)
         self.log("[GAME] Done")
@@ -463,6 +646,8 @@ class BotGUI:
         self.run_in_thread(self._go_home)
 
     def _go_home(self):
+        from functions.config import go_home
+
         self.log("[GAME] Returning to home...")
         go_home(self.device)
         self.log("[GAME] Done")
@@ -475,6 +660,8 @@ class BotGUI:
         self.run_in_thread(self._delete_army)
 
     def _delete_army(self):
+        from functions.army import delete_army
+
         self.log("[BOT] Deleting army...")
         delete_army(self.device)
         self.log("[BOT] Done")
@@ -485,6 +672,8 @@ class BotGUI:
         self.run_in_thread(self._create_army)
 
     def _create_army(self):
+        from functions.army import create_army
+
         self.log("[BOT] Creating army...")
         create_army(self.device)
         self.log("[BOT] Done")
@@ -495,6 +684,8 @@ class BotGUI:
         self.run_in_thread(self._train_army)
 
     def _train_army(self):
+        from functions.army import train_army
+
         self.log("[BOT] Training army...")
         train_army(self.device)
         self.log("[BOT] Done")
@@ -505,6 +696,8 @@ class BotGUI:
         self.run_in_thread(self._donate_castle)
 
     def _donate_castle(self):
+        from functions.donate import donate_castle
+
         self.log("[BOT] Donating...")
         count = donate_castle(self.device)
         self.log(f"[BOT] Donated {count} times")
@@ -515,10 +708,24 @@ class BotGUI:
         self.run_in_thread(self._request_castle)
 
     def _request_castle(self):
+        from functions.donate import request_castle
+
         self.log("[BOT] Requesting troops...")
         request_castle(self.device)
         self.log("[BOT] Done")
 
+    def collect_resources(self):
+        if not self.check_device():
+            return
+        self.run_in_thread(self._collect_resources)
+
+    def _collect_resources(self):
+        from functions.collect import collect_resources
+
+        self.log("[BOT] Collecting resources...")
+        count = collect_resources(self.device)
+        self.log(f"[BOT] Collected {count} collectors")
+
     # ==================== ARMY CONFIG ====================
 
     def refresh_troops_list(self):
@@ -0,0 +1,111 @@
+"""
+Log sink - Fila de logs drenada em lotes para widgets Text do tkinter.
+"""
+
+import logging
+import queue
+import tkinter as tk
+
+# Cor por nivel de log (tags configuradas uma unica vez por widget)
+LEVEL_TAGS = [
+    (logging.ERROR, "red"),
+    (logging.WARNING, "orange"),
+    (logging.DEBUG, "gray"),
+]
+
+
+def level_tag(level: int):
+    """Retorna a tag de cor para um nivel de log."""
+    for min_level, tag in LEVEL_TAGS:
+        if level >= min_level:
+            return tag
+    return None
+
+
+class TextSink:
+    """
+    Fila thread-safe de linhas para um widget Text.
+
+    Qualquer thread pode chamar write(); o loop do Tk drena a fila a cada
+    `interval_ms` com um unico insert e mantem so as ultimas `max_lines` linhas.
+    """
+
+    def __init__(
+        self,
+        widget: tk.Text,
+        max_lines: int = 2000,
+        interval_ms: int = 100,
+        batch_size: int = 1000,
+        readonly: bool = False,
+    ):
+        self.widget = widget
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.batch_size = batch_size
+        self.readonly = readonly
+        self._queue = queue.SimpleQueue()
+        self._lines = 0
+
+        for _, tag in LEVEL_TAGS:
+            widget.tag_config(tag, foreground=tag)
+
+        widget.after(interval_ms, self._drain)
+
+    def write(self, message: str, tag: str = None):
+        """Enfileira uma mensagem (thread-safe)."""
+        self._queue.put((message, tag))
+
+    def clear(self):
+        """Limpa o widget (chamar no loop do Tk)."""
+        self._set_state("normal")
+        self.widget.delete("1.0", tk.END)
+        self._set_state("disabled")
+        self._lines = 0
+
+    def _set_state(self, state: str):
+        if self.readonly:
+            self.widget.configure(state=state)
+
+    def _drain(self):
+        args = []
+        lines = 0
+        try:
+            for _ in range(self.batch_size):
+                message, tag = self._queue.get_nowait()
+                args.append(message + "\n")
+                args.append((tag,) if tag else ())
+                lines += message.count("\n") + 1
+        except queue.Empty:
+            pass
+
+        if args:
+            self._set_state("normal")
+            # Um unico insert com pares (texto, tags) para o lote inteiro
+            self.widget.insert(tk.END, *args)
+            self._lines += lines
+
+            excess = self._lines - self.max_lines
+            if excess > 0:
+                self.widget.delete("1.0", f"{excess + 1}.0")
+                self._lines -= excess
+
+            self.widget.see(tk.END)
+            self._set_state("disabled")
+
+        # Se sobrou fila, drena de novo logo em seguida
+        delay = 1 if not self._queue.empty() else self.interval_ms
+        self.widget.after(delay, self._drain)
+
+
+class TextHandler(logging.Handler):
+    """Handler que envia logs para um TextSink."""
+
+    def __init__(self, sink: TextSink):
+        super().__init__()
+        self.sink = sink
+
+    def emit(self, record):
+        try:
+            self.sink.write(self.format(record), level_tag(record.levelno))
+        except Exception:
+            self.handleError(record)